@@ -0,0 +1,11 @@
+"""
+Latency benchmarks for the hot API endpoints against a synthetic campus in SQLite.
+
+Run from the backend directory:
+
+    python -m benchmarks.run --scale 1k
+    python -m benchmarks.run --scale 10k --requests 200 --output bench-10k.json
+
+The database is seeded once per scale (benchmarks/data/campus_<students>.db) and reused
+on later runs unless --reseed is given.
+"""
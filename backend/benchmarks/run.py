@@ -0,0 +1,190 @@
+"""
+Seeds (or reuses) a synthetic campus in SQLite, then drives the hot endpoints through
+the app in-process and prints a JSON report of latency percentiles, queries per
+request and peak RSS.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+# (name, role that calls it, method, path); "student" requests rotate over sampled students
+ENDPOINTS = [
+    ("tasks.my_tasks", "student", "GET", "/api/tasks/my-tasks"),
+    ("analytics.performance_students", "admin", "GET", "/api/analytics/performance/students"),
+    ("dashboard.student", "student", "GET", "/api/dashboard/student"),
+    ("dashboard.faculty", "faculty", "GET", "/api/dashboard/faculty"),
+    ("dashboard.admin", "admin", "GET", "/api/dashboard/admin"),
+    ("admin.dashboard_stats", "admin", "GET", "/api/admin/dashboard-stats"),
+    ("notifications.list", "student", "GET", "/api/notifications"),
+]
+
+
+def _configure_database(db_path):
+    """Points database.py at the SQLite file; must run before anything imports `database`."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+async def asgi_request(app, method, path, headers):
+    """Minimal in-process ASGI client: returns (status, headers dict, body bytes)."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "server": ("bench", 80), "client": ("127.0.0.1", 0),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    response = {"status": None, "headers": {}, "body": []}
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode().lower(): v.decode() for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return response["status"], response["headers"], b"".join(response["body"])
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[index], 2)
+
+
+async def bench_endpoint(app, method, path, tokens, requests, warmup):
+    latencies, queries, errors = [], [], 0
+    for i in range(warmup + requests):
+        headers = {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}
+        start = time.perf_counter()
+        status, response_headers, _ = await asgi_request(app, method, path, headers)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if i < warmup:
+            continue
+        latencies.append(elapsed_ms)
+        if "x-query-count" in response_headers:
+            queries.append(int(response_headers["x-query-count"]))
+        if status >= 400:
+            errors += 1
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else None,
+        "queries_per_request": round(statistics.fmean(queries), 1) if queries else None,
+        "max_queries": max(queries) if queries else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hot API endpoints against a synthetic campus")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--students", type=int, help="Overrides --scale with an exact student count")
+    parser.add_argument("--tasks-per-student", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=50, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests per endpoint")
+    parser.add_argument("--sample-users", type=int, default=20, help="Students the student endpoints rotate over")
+    parser.add_argument("--endpoint", action="append", help="Only run these endpoint names (repeatable)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="SQLite file (default: benchmarks/data/campus_<students>.db)")
+    parser.add_argument("--reseed", action="store_true", help="Rebuild the database even if it exists")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    students = args.students or SCALES[args.scale]
+    db_path = args.db or os.path.join(BENCH_DIR, "data", f"campus_{students}.db")
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    if args.reseed and os.path.exists(db_path):
+        os.remove(db_path)
+    needs_seed = not os.path.exists(db_path)
+    _configure_database(db_path)
+
+    import migrations
+    from database import engine
+
+    seed_seconds = None
+    if needs_seed:
+        from benchmarks.seed import seed_campus
+        migrations.upgrade(engine)
+        start = time.perf_counter()
+        seed_campus(engine, students, args.tasks_per_student, args.seed)
+        seed_seconds = round(time.perf_counter() - start, 1)
+
+    boot_start = time.perf_counter()
+    from main import app
+    boot_ms = round((time.perf_counter() - boot_start) * 1000, 1)
+
+    from sqlalchemy import select
+    from models.user import User
+    from utils.security import create_access_token
+
+    with engine.connect() as conn:
+        users = {role: [row.id for row in conn.execute(select(User.id, User.email).where(User.role == role).order_by(User.id))]
+                 for role in ("admin", "faculty", "student")}
+        emails = dict(conn.execute(select(User.id, User.email)).all())
+    rng = random.Random(args.seed)
+    sampled = {
+        "admin": users["admin"][:1],
+        "faculty": users["faculty"][:1],
+        "student": rng.sample(users["student"], min(args.sample_users, len(users["student"]))),
+    }
+    tokens = {
+        role: [create_access_token({"sub": str(uid), "email": emails[uid], "role": role}) for uid in ids]
+        for role, ids in sampled.items()
+    }
+
+    endpoints = [e for e in ENDPOINTS if not args.endpoint or e[0] in args.endpoint]
+    results = {}
+    for name, role, method, path in endpoints:
+        results[name] = {"path": path, **asyncio.run(
+            bench_endpoint(app, method, path, tokens[role], args.requests, args.warmup)
+        )}
+
+    report = {
+        "students": students,
+        "tasks_per_student": args.tasks_per_student,
+        "database": db_path,
+        "seed_seconds": seed_seconds,
+        "app_boot_ms": boot_ms,
+        "endpoints": results,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
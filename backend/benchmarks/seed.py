@@ -0,0 +1,134 @@
+"""Synthetic campus generator: users, projects, groups, tasks, submissions, todos, notifications."""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from models.user import User
+from models.project import Project
+from models.project_faculty import ProjectFaculty
+from models.group import ProjectGroup, GroupMember
+from models.task import Task
+from models.task_submission import TaskSubmission
+from models.todo import Todo
+from models.notification import Notification
+from utils.security import hash_password
+
+BATCH_SIZE = 5000
+
+# Share of the campus per student
+STUDENTS_PER_FACULTY = 50
+STUDENTS_PER_PROJECT = 100
+GROUP_SIZE = 5
+GROUP_TASKS_PER_GROUP = 2
+TODOS_PER_STUDENT = 3
+NOTIFICATIONS_PER_STUDENT = 5
+
+TASK_STATUSES = ["published", "in_progress", "submitted", "graded", "closed"]
+
+
+def _insert(conn, model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(insert(model), rows[start:start + BATCH_SIZE])
+
+
+def seed_campus(engine, students: int, tasks_per_student: int = 5, seed: int = 42):
+    """
+    Fills an empty schema with `students` students and a proportional campus. Ids are
+    assigned explicitly so the run is deterministic for a given `seed`. Returns the
+    ids the benchmark logs in as: {"admin", "faculty", "students"}.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    password = hash_password("benchmark")
+
+    faculty_count = max(1, students // STUDENTS_PER_FACULTY)
+    project_count = max(1, students // STUDENTS_PER_PROJECT)
+
+    admin_id = 1
+    faculty_ids = list(range(2, 2 + faculty_count))
+    student_ids = list(range(2 + faculty_count, 2 + faculty_count + students))
+
+    users = [{"id": admin_id, "name": "Bench Admin", "email": "admin@bench.local", "password": password,
+              "role": "admin", "status": "active", "roll_no": "ADM0001", "created_at": now}]
+    users += [{"id": fid, "name": f"Faculty {fid}", "email": f"faculty{fid}@bench.local", "password": password,
+               "role": "faculty", "status": "active", "roll_no": f"FAC{fid:07d}", "created_at": now}
+              for fid in faculty_ids]
+    users += [{"id": sid, "name": f"Student {sid}", "email": f"student{sid}@bench.local", "password": password,
+               "role": "student", "status": "active", "roll_no": f"STU{sid:07d}", "batch": "2025",
+               "current_semester": rng.randint(1, 8), "created_by_faculty_id": rng.choice(faculty_ids),
+               "created_at": now}
+              for sid in student_ids]
+
+    projects, project_faculty = [], []
+    for pid in range(1, project_count + 1):
+        lead = faculty_ids[(pid - 1) % faculty_count]
+        projects.append({"id": pid, "title": f"Project {pid}", "description": "Synthetic project",
+                         "semester": "1", "lead_faculty_id": lead, "status": "Published", "allow_tasks": True,
+                         "is_deleted": False, "created_by": lead, "created_at": now})
+        project_faculty.append({"project_id": pid, "faculty_id": lead, "assigned_at": now})
+
+    def project_of(student_index):
+        return student_index * project_count // students + 1
+
+    groups, members = [], []
+    for gid, start in enumerate(range(0, students, GROUP_SIZE), start=1):
+        groups.append({"id": gid, "project_id": project_of(start), "name": f"Group {gid}", "status": "Finalized",
+                       "is_locked": 1})
+        for offset, sid in enumerate(student_ids[start:start + GROUP_SIZE]):
+            members.append({"group_id": gid, "student_id": sid, "is_leader": 1 if offset == 0 else 0})
+
+    tasks, submissions = [], []
+
+    def add_task(project_id, student_id=None, group_id=None):
+        task_id = len(tasks) + 1
+        deadline = now + timedelta(days=rng.randint(-60, 30), hours=rng.randint(0, 23))
+        status = rng.choice(TASK_STATUSES)
+        project_lead = projects[project_id - 1]["lead_faculty_id"]
+        tasks.append({"id": task_id, "task_code": f"BENCH_{task_id:08d}", "title": f"Task {task_id}",
+                      "description": "Synthetic task", "priority": rng.choice(["low", "medium", "high"]),
+                      "deadline": deadline, "max_marks": 100,
+                      "task_type": "group" if group_id else "individual", "project_id": project_id,
+                      "faculty_id": project_lead, "student_id": student_id, "group_id": group_id,
+                      "status": status, "created_at": now - timedelta(days=90), "published_at": now - timedelta(days=89)})
+        return task_id, deadline, status
+
+    for index, sid in enumerate(student_ids):
+        for _ in range(tasks_per_student):
+            task_id, deadline, status = add_task(project_of(index), student_id=sid)
+            if status in ("submitted", "graded", "closed") or rng.random() < 0.3:
+                submitted_at = deadline + timedelta(hours=rng.randint(-72, 24))
+                graded = status == "graded" or rng.random() < 0.5
+                submissions.append({
+                    "task_id": task_id, "student_id": sid, "submission_text": "Synthetic submission",
+                    "submitted_at": submitted_at, "status": "graded" if graded else "submitted",
+                    "is_late": submitted_at > deadline,
+                    "marks_obtained": rng.randint(35, 100) if graded else None,
+                    "feedback": "Good work" if graded and rng.random() < 0.5 else None,
+                })
+
+    for group in groups:
+        for _ in range(GROUP_TASKS_PER_GROUP):
+            add_task(group["project_id"], group_id=group["id"])
+
+    todos = [{"title": f"Todo {n}", "description": "Synthetic todo", "student_id": sid,
+              "due_date": now + timedelta(days=rng.randint(-10, 20)),
+              "status": rng.choice(["pending", "completed"]), "created_at": now}
+             for sid in student_ids for n in range(TODOS_PER_STUDENT)]
+    notifications = [{"user_id": sid, "title": "Update", "message": f"Synthetic notification {n}",
+                      "type": rng.choice(["task", "performance", "system"]), "is_read": rng.random() < 0.5,
+                      "created_at": now - timedelta(hours=n)}
+                     for sid in student_ids for n in range(NOTIFICATIONS_PER_STUDENT)]
+
+    with engine.begin() as conn:
+        _insert(conn, User, users)
+        _insert(conn, Project, projects)
+        _insert(conn, ProjectFaculty, project_faculty)
+        _insert(conn, ProjectGroup, groups)
+        _insert(conn, GroupMember, members)
+        _insert(conn, Task, tasks)
+        _insert(conn, TaskSubmission, submissions)
+        _insert(conn, Todo, todos)
+        _insert(conn, Notification, notifications)
+
+    return {"admin": admin_id, "faculty": faculty_ids, "students": student_ids}
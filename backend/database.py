@@ -1,9 +1,16 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from utils.pool_metrics import TimedQueuePool, TimedAsyncQueuePool, track_hold_time
+from utils import query_stats, slow_queries
+from starlette.concurrency import run_in_threadpool
+from fastapi import Request
 import urllib.parse
+import importlib
+import os
 
-SERVER = "DESKTOP-LJJB1MB\SQLEXPRESS"
-DATABASE = "ATM_DB"
+SERVER = os.getenv("DB_SERVER", "DESKTOP-LJJB1MB\\SQLEXPRESS")
+DATABASE = os.getenv("DB_NAME", "ATM_DB")
 
 params = urllib.parse.quote_plus(
     "DRIVER={ODBC Driver 17 for SQL Server};"
@@ -13,15 +20,106 @@ params = urllib.parse.quote_plus(
     "Connect Timeout=30;"
 )
 
-DATABASE_URL = f"mssql+pyodbc:///?odbc_connect={params}"
+# DATABASE_URL / ASYNC_DATABASE_URL override the SQL Server defaults, e.g. for a local SQLite
+# database ("sqlite:///atm.db" / "sqlite+aiosqlite:///atm.db") as used by benchmarks/
+DATABASE_URL = os.getenv("DATABASE_URL", f"mssql+pyodbc:///?odbc_connect={params}")
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", f"mssql+aioodbc:///?odbc_connect={params}")
 
-engine = create_engine(DATABASE_URL)
+# Connection pool sizing, per engine and per worker process. Sync routes run in Starlette's
+# threadpool (~40 threads), so size + overflow below that means requests queue on the pool.
+POOL_SETTINGS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+}
+
+engine = create_engine(DATABASE_URL, poolclass=TimedQueuePool, **POOL_SETTINGS)
+track_hold_time(engine)
+query_stats.instrument(engine)
+slow_queries.instrument(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for `async def` routes: queries await the driver instead of blocking the event loop.
+# Objects stay readable after commit because lazy refreshes are not possible outside `run_sync`.
+async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=TimedAsyncQueuePool, **POOL_SETTINGS)
+track_hold_time(async_engine.sync_engine)
+query_stats.instrument(async_engine.sync_engine)
+slow_queries.instrument(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
-def get_db():
+
+
+def load_models():
+    """Imports every module under models/ so all mappers and tables are registered."""
+    models_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+    for filename in sorted(os.listdir(models_dir)):
+        if filename.endswith(".py"):
+            importlib.import_module(f"models.{filename[:-3]}")
+
+def get_db(request: Request):
+    """
+    Request-scoped Session. No connection is checked out until the first query, so
+    handlers that fail auth or validation first never touch the pool.
+    """
     db = SessionLocal()
+    request.state.db_sessions = getattr(request.state, "db_sessions", []) + [db]
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        request.state.db_sessions = getattr(request.state, "db_sessions", []) + [db]
+        yield db
+
+
+class DbSessionMiddleware:
+    """
+    Tracks per-request query stats (X-Query-Count, X-DB-Time-Ms and X-Query-Max-Repeat
+    headers, N+1 warnings, see utils/query_stats.py) and hands the request's connections
+    back to the pool as soon as the response body is built, instead of after it has been
+    sent. The sessions stay usable: a streaming body that queries again simply checks
+    out a new connection.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = query_stats.start_request(scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                await _release_connections(scope.get("state", {}).get("db_sessions", ()))
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), *stats.headers()],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats.end_request(token)
+            route = scope.get("route")
+            stats.report(scope["method"], getattr(route, "path", scope["path"]))
+
+
+async def _release_connections(sessions):
+    # Ending the transaction returns the connection; close() would discard the same
+    # uncommitted state anyway, but would also detach objects a streaming body may need.
+    for db in sessions:
+        if not db.in_transaction():
+            continue
+        if isinstance(db, AsyncSession):
+            await db.rollback()
+        else:
+            await run_in_threadpool(db.rollback)
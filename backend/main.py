@@ -1,56 +1,67 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from database import engine, Base, SessionLocal
+from database import engine, SessionLocal, DbSessionMiddleware
 import os
 
+from utils.lazy_routers import ImportTimer, RouterRegistry, LazyRouterMiddleware, cached_openapi
+
+# LAZY_ROUTERS=1 defers each router module's import until the first request under its prefix
+LAZY_ROUTERS = os.getenv("LAZY_ROUTERS", "0").lower() in ("1", "true", "yes")
+boot_timer = ImportTimer()
+
 # -------- Import Models --------
-from models.user import User
-from models.project import Project
-from models.project_faculty import ProjectFaculty
-from models.task_submission import TaskSubmission
-from models.student_performance import StudentPerformance
-from models.academic_planner import AcademicPlanner
-from models.todo import Todo
-from models.group import ProjectGroup, GroupMember, ContributionLog
-from models.audit_log import AuditLog
-from models.notification import Notification
-from models.student_recommendation import StudentRecommendation
-# from models.academic import Department, Course (Legacy removed)
-from models.academic_saas import (
-    Organization, DepartmentV1, Program, CourseV1, AcademicYear, SemesterV1, Section,
-    Role, Permission, RolePermission, StructureVersion, Batch
-)
-from models.settings import SystemSettings
-from models.task_comment import TaskComment
+# Every model must be registered so foreign keys between tables resolve
+models_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+for filename in sorted(os.listdir(models_dir)):
+    if filename.endswith(".py"):
+        boot_timer.import_module(f"models.{filename[:-3]}")
+
+# -------- Routers (module, mount prefix, URL prefix served) --------
+ROUTERS = [
+    ("routers.auth", "/api/auth", "/api/auth"),
+    ("routers.test", "/api/test", "/api/test"),
+    ("routers.admin", "/api/admin", "/api/admin"),
+    ("routers.project", "/api/projects", "/api/projects"),
+    ("routers.task", "/api/tasks", "/api/tasks"),
+    ("routers.performance", "/api/performance", "/api/performance"),
+    ("routers.recognition", "/api/recognition", "/api/recognition"),
+    ("routers.planner", "/api/planner", "/api/planner"),
+    ("routers.todo", "/api/todo", "/api/todo"),
+    ("routers.dashboard", "/api/dashboard", "/api/dashboard"),
+    ("routers.group", "/api/groups", "/api/groups"),
+    ("routers.notification", "/api/notifications", "/api/notifications"),
+    ("routers.news", "/api/news", "/api/news"),
+    ("routers.events", "/api/events", "/api/events"),
+    ("routers.faculty", "/api/faculty", "/api/faculty"),
+    ("routers.audit", "/api/admin", "/api/admin"),
+    ("routers.academic", "/api/academic", "/api/academic"),
+    ("routers.academic_structure_v1", "/api/v1/academic-structure", "/api/v1/academic-structure"),
+    ("routers.academic_structure_v1", "/api/v1/academic_structure", "/api/v1/academic_structure"),
+    ("routers.admin_v1", "/api/v1/admin", "/api/v1/admin"),
+    ("routers.user", "/api/users", "/api/users"),
+    ("routers.public", "/api/public", "/api/public"),
+    ("routers.analytics", "/api", "/api/analytics"),
+]
+
+# -------- Background Scheduler --------
+# Deadline reminders and overdue flips; SCHEDULER_ENABLED=0 leaves them to 'python manage.py run-scheduler'
+@asynccontextmanager
+async def lifespan(app):
+    from services.scheduler import scheduler, SCHEDULER_ENABLED
+    if SCHEDULER_ENABLED:
+        scheduler.start()
+    try:
+        yield
+    finally:
+        scheduler.stop()
 
-# -------- Import Routers --------
-from routers.auth import router as auth_router
-from routers.test import router as test_router
-from routers.admin import router as admin_router
-from routers.project import router as project_router
-from routers.task import router as task_router
-from routers.performance import router as performance_router
-from routers.recognition import router as recognition_router
-from routers.planner import router as planner_router
-from routers.todo import router as todo_router
-from routers.dashboard import router as dashboard_router
-from routers.group import router as group_router
-from routers.notification import router as notification_router
-from routers.news import router as news_router
-from routers.events import router as events_router
-from routers.faculty import router as faculty_router
-from routers.audit import router as audit_router
-from routers.academic import router as academic_router
-from routers.academic_structure_v1 import router as academic_structure_v1_router
-from routers.admin_v1 import router as admin_v1_router
-from routers.user import router as user_router
-from routers.public import router as public_router
-from routers.analytics import router as analytics_router
 # -------- Create App --------
 app = FastAPI(
     title="Academic Task Management System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # -------- CORS --------
@@ -60,53 +71,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Query-Count", "X-DB-Time-Ms", "X-Query-Max-Repeat"],
 )
+app.add_middleware(DbSessionMiddleware)
 
-# -------- Create Tables --------
-Base.metadata.create_all(bind=engine)
-
-from sqlalchemy import text
+# -------- Schema Version Check --------
+# Migrations run out of band (python manage.py migrate); workers only verify the version.
+import migrations
 try:
-    with engine.begin() as conn:
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[notifications]') AND name = 'title') ALTER TABLE notifications ADD title NVARCHAR(200) NULL;"))
-        # New campus_events columns
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'image_url') ALTER TABLE campus_events ADD image_url NVARCHAR(500) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'location') ALTER TABLE campus_events ADD location NVARCHAR(300) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'organizer') ALTER TABLE campus_events ADD organizer NVARCHAR(200) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'contact_info') ALTER TABLE campus_events ADD contact_info NVARCHAR(300) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'tags') ALTER TABLE campus_events ADD tags NVARCHAR(500) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'max_participants') ALTER TABLE campus_events ADD max_participants INT NULL;"))
-        # New tasks columns
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[tasks]') AND name = 'task_code') ALTER TABLE tasks ADD task_code NVARCHAR(50) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[tasks]') AND name = 'closed_at') ALTER TABLE tasks ADD closed_at DATETIME NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[tasks]') AND name = 'is_report_shared') ALTER TABLE tasks ADD is_report_shared BIT NULL DEFAULT 0;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[tasks]') AND name = 'priority') ALTER TABLE tasks ADD priority NVARCHAR(20) NULL DEFAULT 'medium';"))
-        # New task_submissions columns for BLOB storage
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[task_submissions]') AND name = 'file_data') ALTER TABLE task_submissions ADD file_data VARBINARY(MAX) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[task_submissions]') AND name = 'file_mime') ALTER TABLE task_submissions ADD file_mime NVARCHAR(50) NULL;"))
-        # New student_performance columns
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[student_performance]') AND name = 'is_ranked') ALTER TABLE student_performance ADD is_ranked BIT NULL DEFAULT 0;"))
-        # New users columns
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[users]') AND name = 'avatar') ALTER TABLE users ADD avatar NVARCHAR(MAX) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[users]') AND name = 'roll_no') ALTER TABLE users ADD roll_no NVARCHAR(50) NULL;"))
-        # New campus_news columns
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'category') ALTER TABLE campus_news ADD category NVARCHAR(60) NULL DEFAULT 'general';"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'cover_image_url') ALTER TABLE campus_news ADD cover_image_url NVARCHAR(500) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'tags') ALTER TABLE campus_news ADD tags NVARCHAR(400) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'is_featured') ALTER TABLE campus_news ADD is_featured BIT NULL DEFAULT 0;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'source') ALTER TABLE campus_news ADD source NVARCHAR(200) NULL DEFAULT 'internal';"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'external_url') ALTER TABLE campus_news ADD external_url NVARCHAR(500) NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'read_time_mins') ALTER TABLE campus_news ADD read_time_mins INT NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'updated_at') ALTER TABLE campus_news ADD updated_at DATETIME NULL;"))
-        # New todos columns
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[todos]') AND name = 'planner_id') ALTER TABLE todos ADD planner_id INT NULL;"))
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[todos]') AND name = 'task_id') ALTER TABLE todos ADD task_id INT NULL;"))
-        # New academic_planner column
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[academic_planner]') AND name = 'is_active') ALTER TABLE academic_planner ADD is_active BIT NULL DEFAULT 1;"))
-        # New student_recognitions columns
-        conn.execute(text("IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[student_recognitions]') AND name = 'performance_score') ALTER TABLE student_recognitions ADD performance_score INT NULL;"))
+    current_version, head_version = migrations.check_at_head(engine)
+    if current_version < head_version:
+        print(f"Database schema at version {current_version}, head is {head_version}: run 'python manage.py migrate'.")
 except Exception as e:
-    print(f"Auto-migration error: {e}")
+    print(f"Schema version check error: {e}")
 
 # -------- Backfill Missing IDs --------
 from utils.id_generator import generate_unique_id
@@ -131,29 +108,14 @@ def backfill_missing_ids():
 
 
 # -------- Include Routers (ONLY PREFIX HERE) --------
-app.include_router(auth_router, prefix="/api/auth")
-app.include_router(test_router, prefix="/api/test")
-app.include_router(admin_router, prefix="/api/admin")
-app.include_router(project_router, prefix="/api/projects")
-app.include_router(task_router, prefix="/api/tasks")
-app.include_router(performance_router, prefix="/api/performance")
-app.include_router(recognition_router, prefix="/api/recognition")
-app.include_router(planner_router, prefix="/api/planner")
-app.include_router(todo_router, prefix="/api/todo")
-app.include_router(dashboard_router, prefix="/api/dashboard")
-app.include_router(group_router, prefix="/api/groups")
-app.include_router(notification_router, prefix="/api/notifications")
-app.include_router(news_router, prefix="/api/news")
-app.include_router(events_router, prefix="/api/events")
-app.include_router(faculty_router, prefix="/api/faculty")
-app.include_router(audit_router, prefix="/api/admin")
-app.include_router(academic_router, prefix="/api/academic")
-app.include_router(academic_structure_v1_router, prefix="/api/v1/academic-structure")
-app.include_router(academic_structure_v1_router, prefix="/api/v1/academic_structure")
-app.include_router(admin_v1_router, prefix="/api/v1/admin")
-app.include_router(user_router, prefix="/api/users")
-app.include_router(public_router, prefix="/api/public")
-app.include_router(analytics_router, prefix="/api")
+router_registry = RouterRegistry(app, ROUTERS, boot_timer)
+if LAZY_ROUTERS:
+    app.add_middleware(LazyRouterMiddleware, registry=router_registry)
+else:
+    router_registry.load_all()
+app.openapi = cached_openapi(app, router_registry)
+boot_timer.report("Boot imports" + (" (routers deferred)" if LAZY_ROUTERS else ""))
+
 # -------- Static Files (uploads) --------
 uploads_dir = os.path.join(os.path.dirname(__file__), "uploads")
 os.makedirs(uploads_dir, exist_ok=True)
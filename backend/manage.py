@@ -0,0 +1,79 @@
+"""
+Maintenance commands, run from the backend directory:
+
+    python manage.py migrate [--to VERSION]
+    python manage.py migration-status
+    python manage.py rebuild-atm-scores
+    python manage.py run-scheduler [--once]
+"""
+import argparse
+
+from database import SessionLocal, engine, load_models
+import migrations
+
+
+def migrate(args):
+    applied = migrations.upgrade(engine, target=args.to)
+    if applied:
+        print(f"Applied migrations: {', '.join(f'{v:04d}' for v in applied)}")
+    else:
+        print("Database already at head.")
+
+
+def migration_status(args):
+    current, head = migrations.check_at_head(engine)
+    print(f"Current version: {current:04d}, head: {head:04d}")
+    for version, name, _ in migrations.discover():
+        if version > current:
+            print(f"  pending {version:04d}_{name}")
+
+
+def rebuild_atm_scores(args):
+    load_models()
+    from services.atm_scores import rebuild_atm_scores as rebuild
+
+    db = SessionLocal()
+    try:
+        count = rebuild(db)
+        print(f"Rebuilt ATM scores for {count} students.")
+    finally:
+        db.close()
+
+
+def run_scheduler(args):
+    load_models()
+    from services.scheduler import scheduler
+
+    if args.once:
+        print(f"Ran {scheduler.tick()} due jobs.")
+        return
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ATM backend maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_cmd = commands.add_parser("migrate", help="Apply pending schema migrations")
+    migrate_cmd.add_argument("--to", type=int, default=None, help="Stop after this migration version")
+    migrate_cmd.set_defaults(func=migrate)
+
+    status_cmd = commands.add_parser("migration-status", help="Show the applied and head migration versions")
+    status_cmd.set_defaults(func=migration_status)
+
+    rebuild = commands.add_parser("rebuild-atm-scores", help="Recompute the student_atm_scores read model from scratch")
+    rebuild.set_defaults(func=rebuild_atm_scores)
+
+    scheduler_cmd = commands.add_parser("run-scheduler", help="Run deadline reminders and overdue flips in the foreground")
+    scheduler_cmd.add_argument("--once", action="store_true", help="Run the jobs already due, then exit")
+    scheduler_cmd.set_defaults(func=run_scheduler)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Creates every table declared under models/ that does not exist yet."""
+from database import Base, load_models
+
+
+def upgrade(conn):
+    load_models()
+    Base.metadata.create_all(bind=conn)
@@ -0,0 +1,54 @@
+"""
+Columns added to existing tables after they were first created (formerly run by
+main.py on every boot). Models already declare them, so fresh databases get them
+from 0001; the IF NOT EXISTS guards make this a no-op there.
+"""
+from sqlalchemy import text
+
+STATEMENTS = [
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[notifications]') AND name = 'title') ALTER TABLE notifications ADD title NVARCHAR(200) NULL;",
+    # New campus_events columns
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'image_url') ALTER TABLE campus_events ADD image_url NVARCHAR(500) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'location') ALTER TABLE campus_events ADD location NVARCHAR(300) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'organizer') ALTER TABLE campus_events ADD organizer NVARCHAR(200) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'contact_info') ALTER TABLE campus_events ADD contact_info NVARCHAR(300) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'tags') ALTER TABLE campus_events ADD tags NVARCHAR(500) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_events]') AND name = 'max_participants') ALTER TABLE campus_events ADD max_participants INT NULL;",
+    # New tasks columns
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[tasks]') AND name = 'task_code') ALTER TABLE tasks ADD task_code NVARCHAR(50) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[tasks]') AND name = 'closed_at') ALTER TABLE tasks ADD closed_at DATETIME NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[tasks]') AND name = 'is_report_shared') ALTER TABLE tasks ADD is_report_shared BIT NULL DEFAULT 0;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[tasks]') AND name = 'priority') ALTER TABLE tasks ADD priority NVARCHAR(20) NULL DEFAULT 'medium';",
+    # New task_submissions columns for BLOB storage
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[task_submissions]') AND name = 'file_data') ALTER TABLE task_submissions ADD file_data VARBINARY(MAX) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[task_submissions]') AND name = 'file_mime') ALTER TABLE task_submissions ADD file_mime NVARCHAR(50) NULL;",
+    # New student_performance columns
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[student_performance]') AND name = 'is_ranked') ALTER TABLE student_performance ADD is_ranked BIT NULL DEFAULT 0;",
+    # New users columns
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[users]') AND name = 'avatar') ALTER TABLE users ADD avatar NVARCHAR(MAX) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[users]') AND name = 'roll_no') ALTER TABLE users ADD roll_no NVARCHAR(50) NULL;",
+    # New campus_news columns
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'category') ALTER TABLE campus_news ADD category NVARCHAR(60) NULL DEFAULT 'general';",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'cover_image_url') ALTER TABLE campus_news ADD cover_image_url NVARCHAR(500) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'tags') ALTER TABLE campus_news ADD tags NVARCHAR(400) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'is_featured') ALTER TABLE campus_news ADD is_featured BIT NULL DEFAULT 0;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'source') ALTER TABLE campus_news ADD source NVARCHAR(200) NULL DEFAULT 'internal';",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'external_url') ALTER TABLE campus_news ADD external_url NVARCHAR(500) NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'read_time_mins') ALTER TABLE campus_news ADD read_time_mins INT NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[campus_news]') AND name = 'updated_at') ALTER TABLE campus_news ADD updated_at DATETIME NULL;",
+    # New todos columns
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[todos]') AND name = 'planner_id') ALTER TABLE todos ADD planner_id INT NULL;",
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[todos]') AND name = 'task_id') ALTER TABLE todos ADD task_id INT NULL;",
+    # New academic_planner column
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[academic_planner]') AND name = 'is_active') ALTER TABLE academic_planner ADD is_active BIT NULL DEFAULT 1;",
+    # New student_recognitions columns
+    "IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID(N'[student_recognitions]') AND name = 'performance_score') ALTER TABLE student_recognitions ADD performance_score INT NULL;",
+]
+
+
+def upgrade(conn):
+    if conn.dialect.name != "mssql":
+        # sys.columns is SQL Server only; other backends were created from the models
+        return
+    for statement in STATEMENTS:
+        conn.execute(text(statement))
@@ -0,0 +1,20 @@
+"""Adds code_sequences and seeds each task-code prefix with the highest number in use."""
+from sqlalchemy import select, insert
+from models.code_sequence import CodeSequence
+from models.task import Task
+
+
+def upgrade(conn):
+    CodeSequence.__table__.create(conn, checkfirst=True)
+
+    highest = {}
+    for (code,) in conn.execute(select(Task.task_code).where(Task.task_code.like("TASK\\_%", escape="\\"))):
+        prefix, _, number = code.rpartition("_")
+        if number.isdigit():
+            prefix += "_"
+            highest[prefix] = max(highest.get(prefix, 0), int(number))
+
+    existing = set(conn.execute(select(CodeSequence.prefix)).scalars())
+    rows = [{"prefix": p, "last_value": n} for p, n in highest.items() if p not in existing]
+    if rows:
+        conn.execute(insert(CodeSequence), rows)
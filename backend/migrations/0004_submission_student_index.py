@@ -0,0 +1,7 @@
+"""Index on task_submissions (student_id, task_id) for per-student submission lookups."""
+from migrations import create_missing_indexes
+from models.task_submission import TaskSubmission
+
+
+def upgrade(conn):
+    create_missing_indexes(conn, TaskSubmission, {"ix_task_submissions_student_task"})
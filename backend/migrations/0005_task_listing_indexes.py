@@ -0,0 +1,13 @@
+"""Indexes behind the paginated task listings and the student task feed."""
+from migrations import create_missing_indexes
+from models.task import Task
+
+
+def upgrade(conn):
+    create_missing_indexes(conn, Task, {
+        "ix_tasks_faculty_created",
+        "ix_tasks_created",
+        "ix_tasks_project_status",
+        "ix_tasks_student_deadline",
+        "ix_tasks_group_deadline",
+    })
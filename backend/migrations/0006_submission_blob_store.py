@@ -0,0 +1,43 @@
+"""
+Moves submission files out of task_submissions.file_data into the blob store:
+adds file_key/file_size, writes each stored file to the store, then drops file_data.
+"""
+from sqlalchemy import inspect, select, update, table, column, text, Integer, LargeBinary, String
+
+from migrations import add_missing_columns, create_missing_indexes
+from models.task_submission import TaskSubmission
+from services.blob_store import get_blob_store
+
+# Lightweight view of the old column, which the model no longer declares
+_submissions = table(
+    "task_submissions",
+    column("id", Integer),
+    column("file_data", LargeBinary),
+    column("file_key", String),
+    column("file_size", Integer),
+    column("file_mime", String),
+)
+
+
+def upgrade(conn):
+    add_missing_columns(conn, TaskSubmission, ["file_key", "file_size"])
+    create_missing_indexes(conn, TaskSubmission, {"ix_task_submissions_file_key"})
+
+    if "file_data" not in {c["name"] for c in inspect(conn).get_columns("task_submissions")}:
+        return
+
+    store = get_blob_store()
+    ids = conn.execute(
+        select(_submissions.c.id).where(_submissions.c.file_data.is_not(None), _submissions.c.file_key.is_(None))
+    ).scalars().all()
+    for submission_id in ids:
+        # One blob in memory at a time
+        data, mime_type = conn.execute(
+            select(_submissions.c.file_data, _submissions.c.file_mime).where(_submissions.c.id == submission_id)
+        ).one()
+        key, size = store.put_bytes(data, mime_type)
+        conn.execute(
+            update(_submissions).where(_submissions.c.id == submission_id).values(file_key=key, file_size=size)
+        )
+
+    conn.execute(text("ALTER TABLE task_submissions DROP COLUMN file_data"))
@@ -0,0 +1,9 @@
+"""Adds submission_uploads for resumable chunked submission uploads."""
+from database import load_models
+from models.submission_upload import SubmissionUpload
+
+
+def upgrade(conn):
+    # Foreign keys to tasks/users need those tables in the metadata
+    load_models()
+    SubmissionUpload.__table__.create(conn, checkfirst=True)
@@ -0,0 +1,27 @@
+"""Records how each submission blob is stored (codec, size at rest) for the storage report."""
+from sqlalchemy import select, update
+
+from migrations import add_missing_columns
+from models.task_submission import TaskSubmission
+from services.blob_store import get_blob_store
+
+
+def upgrade(conn):
+    add_missing_columns(conn, TaskSubmission, ["file_codec", "file_stored_size"])
+
+    submissions = TaskSubmission.__table__
+    store = get_blob_store()
+    keys = conn.execute(
+        select(submissions.c.file_key).where(
+            submissions.c.file_key.is_not(None), submissions.c.file_codec.is_(None)
+        ).distinct()
+    ).scalars().all()
+    for key in keys:
+        if not store.exists(key):
+            continue
+        codec, stored_size = store.info(key)
+        conn.execute(
+            update(submissions).where(submissions.c.file_key == key).values(
+                file_codec=codec, file_stored_size=stored_size
+            )
+        )
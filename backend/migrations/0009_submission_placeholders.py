@@ -0,0 +1,32 @@
+"""
+Unique (task_id, student_id) on task_submissions, and pending placeholders for the
+open tasks' targets (previously created on the first GET of a task's submissions).
+"""
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from database import load_models
+from migrations import create_missing_indexes
+from models.task import Task
+from models.task_submission import TaskSubmission
+from services.submission_placeholders import create_submission_placeholders, PLACEHOLDER_TASK_STATUSES
+
+
+def upgrade(conn):
+    load_models()
+    submissions = TaskSubmission.__table__
+    duplicates = conn.execute(
+        select(submissions.c.task_id, submissions.c.student_id, func.count().label("rows"))
+        .group_by(submissions.c.task_id, submissions.c.student_id)
+        .having(func.count() > 1)
+    ).all()
+    if duplicates:
+        sample = ", ".join(f"task {d.task_id}/student {d.student_id}" for d in duplicates[:10])
+        raise RuntimeError(
+            f"{len(duplicates)} (task, student) pairs have several task_submissions rows ({sample}); "
+            "merge them before applying this migration"
+        )
+    create_missing_indexes(conn, TaskSubmission, {"uq_task_submissions_task_student"})
+
+    with Session(bind=conn) as session:
+        create_submission_placeholders(session, select(Task.id).where(Task.status.in_(PLACEHOLDER_TASK_STATUSES)))
@@ -0,0 +1,28 @@
+"""
+scheduled_jobs for the deadline scheduler, tasks.is_overdue (set by it instead of
+being recomputed on read), and the jobs for every task whose deadline is still ahead.
+"""
+from datetime import datetime
+
+from sqlalchemy import select, update, case
+from sqlalchemy.orm import Session
+
+from database import load_models
+from migrations import add_missing_columns, create_missing_indexes
+from models.task import Task
+from models.todo import Todo
+from models.scheduled_job import ScheduledJob
+from services.scheduler import schedule_deadline_jobs
+
+
+def upgrade(conn):
+    load_models()
+    ScheduledJob.__table__.create(conn, checkfirst=True)
+    add_missing_columns(conn, Task, ["is_overdue"])
+    create_missing_indexes(conn, Todo, {"ix_todos_status_due_date"})
+
+    now = datetime.utcnow()
+    tasks = Task.__table__
+    conn.execute(update(tasks).values(is_overdue=case((tasks.c.deadline <= now, True), else_=False)))
+    with Session(bind=conn) as session:
+        schedule_deadline_jobs(session, select(Task.id).where(Task.deadline > now))
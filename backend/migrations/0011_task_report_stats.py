@@ -0,0 +1,9 @@
+"""Adds task_report_stats, the per-task cache of report statistics."""
+from database import load_models
+from models.task_report import TaskReportStats
+
+
+def upgrade(conn):
+    # Foreign key to tasks needs that table in the metadata
+    load_models()
+    TaskReportStats.__table__.create(conn, checkfirst=True)
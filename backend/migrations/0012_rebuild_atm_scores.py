@@ -0,0 +1,14 @@
+"""
+Rebuilds student_atm_scores: rows cached after 0009 backfilled the pending placeholders
+counted those placeholders as submissions.
+"""
+from sqlalchemy.orm import Session
+
+from database import load_models
+from services.atm_scores import rebuild_atm_scores
+
+
+def upgrade(conn):
+    load_models()
+    with Session(bind=conn) as session:
+        rebuild_atm_scores(session)
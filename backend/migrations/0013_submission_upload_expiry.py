@@ -0,0 +1,7 @@
+"""Index for the upload-session expiry sweep and the per-student open-session cap."""
+from migrations import create_missing_indexes
+from models.submission_upload import SubmissionUpload
+
+
+def upgrade(conn):
+    create_missing_indexes(conn, SubmissionUpload, {"ix_submission_uploads_status_started"})
@@ -0,0 +1,6 @@
+"""Adds released_blobs, the queue of blob keys for the deferred blob GC."""
+from models.released_blob import ReleasedBlob
+
+
+def upgrade(conn):
+    ReleasedBlob.__table__.create(conn, checkfirst=True)
@@ -0,0 +1,11 @@
+"""Adds student_atm_scores.version, the compare-and-set guard for ATM row refreshes."""
+from sqlalchemy import update
+
+from migrations import add_missing_columns
+from models.student_atm_score import StudentAtmScore
+
+
+def upgrade(conn):
+    add_missing_columns(conn, StudentAtmScore, ["version"])
+    scores = StudentAtmScore.__table__
+    conn.execute(update(scores).where(scores.c.version.is_(None)).values(version=0))
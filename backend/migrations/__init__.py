@@ -0,0 +1,100 @@
+"""
+Versioned schema migrations.
+
+Each migration is a module in this package named NNNN_description.py with an
+`upgrade(conn)` function; they run in version order, each in its own
+transaction, and the applied versions are recorded in `schema_migrations`.
+App processes only check that the database is at head; migrations run via
+
+    python manage.py migrate
+"""
+import importlib
+import os
+import re
+from datetime import datetime
+
+from sqlalchemy import Table, Column, Integer, String, DateTime, MetaData, select, func, inspect, text
+from sqlalchemy.exc import DBAPIError
+
+_MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+# Kept out of Base.metadata so create_all never touches it
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def discover():
+    """All migrations in this package as [(version, name, module_name)], in version order."""
+    found = []
+    for filename in os.listdir(os.path.dirname(os.path.abspath(__file__))):
+        match = _MIGRATION_FILE.match(filename)
+        if match:
+            found.append((int(match.group(1)), match.group(2), f"migrations.{filename[:-3]}"))
+    found.sort()
+    versions = [version for version, _, _ in found]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError("Duplicate migration version numbers in migrations/")
+    return found
+
+
+def head_version():
+    migrations = discover()
+    return migrations[-1][0] if migrations else 0
+
+
+def current_version(conn):
+    """Highest applied version, 0 when the version table does not exist yet."""
+    try:
+        return conn.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+    except DBAPIError:
+        conn.rollback()
+        return 0
+
+
+def upgrade(engine, target=None):
+    """Applies every pending migration up to `target` (default: head). Returns the versions applied."""
+    _metadata.create_all(engine)
+    applied = []
+    with engine.connect() as conn:
+        done = set(conn.execute(select(schema_migrations.c.version)).scalars())
+    for version, name, module_name in discover():
+        if version in done or (target is not None and version > target):
+            continue
+        module = importlib.import_module(module_name)
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(version=version, name=name, applied_at=datetime.utcnow()))
+        applied.append(version)
+    return applied
+
+
+def create_missing_indexes(conn, model, names):
+    """Creates the named indexes declared on `model`'s table that the database lacks."""
+    existing = {index["name"] for index in inspect(conn).get_indexes(model.__tablename__)}
+    for index in model.__table__.indexes:
+        if index.name in names and index.name not in existing:
+            index.create(conn)
+
+
+def add_missing_columns(conn, model, names):
+    """Adds the named columns declared on `model` that the database table lacks (nullable, no default)."""
+    table = model.__table__
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+    preparer = conn.dialect.identifier_preparer
+    for name in names:
+        if name not in existing:
+            column_type = table.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} ADD {preparer.quote(name)} {column_type} NULL"
+            ))
+
+
+def check_at_head(engine):
+    """One query at boot: returns (current, head) so callers can refuse or warn when behind."""
+    with engine.connect() as conn:
+        return current_version(conn), head_version()
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String
+from database import Base
+
+
+class CodeSequence(Base):
+    """Per-prefix counters for human-readable codes such as TASK_CS_001 (services/code_sequences.py)."""
+    __tablename__ = "code_sequences"
+
+    prefix = Column(String(50), primary_key=True)
+    # Last number handed out for this prefix
+    last_value = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, DateTime, Index
+from datetime import datetime
+from database import Base
+
+
+class ReleasedBlob(Base):
+    """
+    Blob keys that lost a reference (replaced or deleted submission file). The blob GC
+    (services/blob_gc.py) deletes them once they are still unreferenced after a grace period.
+    """
+    __tablename__ = "released_blobs"
+    __table_args__ = (
+        Index("ix_released_blobs_released_at", "released_at"),
+    )
+
+    key = Column(String(64), primary_key=True)
+    released_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from database import Base
+
+
+class ScheduledJob(Base):
+    """
+    Persistent queue for services/scheduler.py: deadline reminders and overdue flips,
+    one row per (task, kind). Rows outlive restarts; workers claim due rows before
+    running them so several processes never run the same job.
+    """
+    __tablename__ = "scheduled_jobs"
+    __table_args__ = (
+        Index("ix_scheduled_jobs_status_run_at", "status", "run_at"),
+        Index("ix_scheduled_jobs_task", "task_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(30), nullable=False)  # 'reminder_24h', 'reminder_1h', 'overdue'
+    # No foreign key: jobs of a deleted task are simply no-ops
+    task_id = Column(Integer, nullable=True)
+    run_at = Column(DateTime, nullable=False)
+
+    status = Column(String(20), default="pending", nullable=False)  # pending / running / done / failed
+    claimed_by = Column(String(32), nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(String(500), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
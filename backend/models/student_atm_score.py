@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Float
+from datetime import datetime
+from database import Base
+
+
+class StudentAtmScore(Base):
+    """Per-student ATM read model, kept in sync by services/atm_scores.py."""
+    __tablename__ = "student_atm_scores"
+
+    student_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    # Running counters (see services/atm_service.py: reduce_atm_counters)
+    total_assigned_past = Column(Integer, default=0, nullable=False)
+    total_submitted = Column(Integer, default=0, nullable=False)
+    total_on_time = Column(Integer, default=0, nullable=False)
+    total_graded = Column(Integer, default=0, nullable=False)
+    sum_percentages = Column(Float, default=0.0, nullable=False)
+
+    # Next deadline that moves total_assigned_past; the row is recomputed once it passes
+    valid_until = Column(DateTime, nullable=True)
+    # Bumped by every submission change and invalidation; refreshes compare-and-set on it
+    version = Column(Integer, default=0, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
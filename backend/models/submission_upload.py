@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from datetime import datetime
+from database import Base
+
+
+class SubmissionUpload(Base):
+    """
+    A resumable submission upload (initiate, numbered chunks, complete). Chunks are staged
+    in the blob store; the row keeps the plan and its lifetime. Expired sessions have
+    their parts discarded by the scheduler (services/submission_uploads.py).
+    """
+    __tablename__ = "submission_uploads"
+    __table_args__ = (
+        Index("ix_submission_uploads_task_student", "task_id", "student_id"),
+        # Expiry sweep and the per-student open-session cap
+        Index("ix_submission_uploads_status_started", "status", "started_at"),
+    )
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
+    student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    file_name = Column(String(255), nullable=True)
+    file_mime = Column(String(50), nullable=True)
+    total_size = Column(Integer, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    total_chunks = Column(Integer, nullable=False)
+
+    status = Column(String(20), default="uploading")  # 'uploading', 'completed', 'expired'
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
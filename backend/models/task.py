@@ -1,9 +1,19 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Float, Index
+from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Task listings: a faculty's tasks newest first, and project/status filters
+        Index("ix_tasks_faculty_created", "faculty_id", "created_at", "id"),
+        Index("ix_tasks_created", "created_at", "id"),
+        Index("ix_tasks_project_status", "project_id", "status", "deadline"),
+        # Student feed: direct and group assignments
+        Index("ix_tasks_student_deadline", "student_id", "deadline"),
+        Index("ix_tasks_group_deadline", "group_id", "deadline"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_code = Column(String(50), unique=True, index=True, nullable=True) # E.g. TASK_CS_001
@@ -50,3 +60,10 @@ class Task(Base):
     # Advanced Features
     file_url = Column(String(500), nullable=True) # Attachment for task description
     late_penalty = Column(Float, default=0.0) # Percentage deduction per day/total
+    # Set by the deadline sweeper (services/scheduler.py) once the deadline has passed
+    is_overdue = Column(Boolean, default=False)
+
+    # For joined loading in listings; columns above stay the source of truth
+    project = relationship("Project")
+    student = relationship("User", foreign_keys=[student_id])
+    group = relationship("ProjectGroup")
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text
+from datetime import datetime
+from database import Base
+
+
+class TaskReportStats(Base):
+    """Per-task report statistics cache, kept by services/task_reports.py (row deleted = stale)."""
+    __tablename__ = "task_report_stats"
+
+    task_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
+    stats = Column(Text, nullable=False)  # JSON
+    computed_at = Column(DateTime, default=datetime.utcnow)
@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, LargeBinary
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
 
 class TaskSubmission(Base):
     __tablename__ = "task_submissions"
+    __table_args__ = (
+        # A student's own submissions, e.g. the outer join in the /my-tasks feed
+        Index("ix_task_submissions_student_task", "student_id", "task_id"),
+        # One submission row per student per task (placeholders and submit race on it)
+        Index("uq_task_submissions_task_student", "task_id", "student_id", unique=True),
+        # Reference check before a replaced upload is removed from the blob store
+        Index("ix_task_submissions_file_key", "file_key"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
@@ -17,7 +25,10 @@ class TaskSubmission(Base):
 
     # Enhanced Submission Details
     file_url = Column(String(500), nullable=True) # Will point to new API endpoint
-    file_data = Column(LargeBinary, nullable=True)
+    file_key = Column(String(64), nullable=True) # SHA-256 key in services.blob_store
+    file_size = Column(Integer, nullable=True)
+    file_codec = Column(String(10), nullable=True) # How the blob is compressed at rest: 'none', 'zlib', 'lzma'
+    file_stored_size = Column(Integer, nullable=True)
     file_mime = Column(String(50), nullable=True)
     is_late = Column(Boolean, default=False)
     
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from datetime import datetime
 from database import Base
 
 class Todo(Base):
     __tablename__ = "todos"
+    __table_args__ = (
+        # Overdue sweep: pending todos by due date
+        Index("ix_todos_status_due_date", "status", "due_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from database import SessionLocal
+from database import get_db, engine, async_engine, POOL_SETTINGS
 from models.user import User
 from models.audit_log import AuditLog
 from models.student_recommendation import StudentRecommendation
@@ -16,6 +16,8 @@ from schemas.user_schemas import ChangeRoleRequest, UserCreateRequest, UserUpdat
 from models.academic_saas import DepartmentV1 as Department, CourseV1 as Course, Program as Program
 from utils.security import admin_required, hash_password
 from utils.id_generator import generate_unique_id
+from utils.pool_metrics import pool_status
+from utils import slow_queries
 from sqlalchemy import func, desc
 
 router = APIRouter(
@@ -24,17 +26,6 @@ router = APIRouter(
 )
 
 
-# ======================
-# DB Dependency
-# ======================
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ======================
 # ACTIVATE USER
 # ======================
@@ -258,10 +249,10 @@ def get_admin_dashboard_stats(db: Session = Depends(get_db)):
     in_progress_tasks = db.query(Task).filter(Task.status == "in_progress").count()
     pending_tasks = db.query(Task).filter(Task.status.in_(["assigned", "draft", "published"])).count()
     
-    # Delayed: deadline passed, not completed
+    # Delayed: flagged overdue by the deadline scheduler, not completed
     from datetime import datetime
     now = datetime.utcnow()
-    delayed_tasks = db.query(Task).filter(Task.deadline < now, Task.status.notin_(["completed", "graded"])).count()
+    delayed_tasks = db.query(Task).filter(Task.is_overdue == True, Task.status.notin_(["completed", "graded"])).count()
     
     task_overview = {
         "complete_pct": round((completed_tasks / total_tasks * 100) if total_tasks else 0),
@@ -276,7 +267,7 @@ def get_admin_dashboard_stats(db: Session = Depends(get_db)):
     for t in recent_tasks_query:
         faculty = db.query(User).filter(User.id == t.faculty_id).first()
         status_label = "Running" if t.status == "in_progress" else "Pending" if t.status in ["assigned", "published"] else "Complete"
-        if t.deadline < now and t.status not in ["completed", "graded"]:
+        if t.is_overdue and t.status not in ["completed", "graded"]:
             status_label = "Delayed"
             color = "amber-500"
         elif status_label == "Running":
@@ -766,3 +757,85 @@ def list_all_submissions(db: Session = Depends(get_db)):
             "grade": s.grade
         })
     return data
+
+
+# ======================
+# DB CONNECTION POOL
+# ======================
+@router.get("/db-pool")
+def db_pool_status():
+    """Pool occupancy, checkout wait and hold-time histograms for this worker process."""
+    return {
+        "sync": pool_status(engine, POOL_SETTINGS),
+        "async": pool_status(async_engine.sync_engine, POOL_SETTINGS),
+    }
+
+
+# ======================
+# SUBMISSION STORAGE
+# ======================
+@router.get("/storage")
+def submission_storage_report(db: Session = Depends(get_db)):
+    """Space used by submission files at rest, and what compression and deduplication save."""
+    # One row per distinct blob: identical uploads share storage
+    blobs = db.query(
+        TaskSubmission.file_key, TaskSubmission.file_codec,
+        func.max(TaskSubmission.file_size).label("size"),
+        func.max(TaskSubmission.file_stored_size).label("stored_size"),
+        func.count().label("references"),
+    ).filter(TaskSubmission.file_key.isnot(None)).group_by(
+        TaskSubmission.file_key, TaskSubmission.file_codec
+    ).subquery()
+
+    rows = db.query(
+        blobs.c.file_codec,
+        func.count().label("blobs"),
+        func.sum(blobs.c.references).label("files"),
+        func.sum(blobs.c.size).label("original_bytes"),
+        func.sum(blobs.c.stored_size).label("stored_bytes"),
+        func.sum(blobs.c.size * blobs.c.references).label("referenced_bytes"),
+    ).group_by(blobs.c.file_codec).all()
+
+    by_codec = []
+    for r in rows:
+        original, stored = int(r.original_bytes or 0), int(r.stored_bytes or 0)
+        by_codec.append({
+            "codec": r.file_codec or "none",
+            "files": int(r.files),
+            "blobs": r.blobs,
+            "original_bytes": original,
+            "stored_bytes": stored,
+            "compression_saved_bytes": original - stored,
+        })
+    original = sum(c["original_bytes"] for c in by_codec)
+    stored = sum(c["stored_bytes"] for c in by_codec)
+    referenced = sum(int(r.referenced_bytes or 0) for r in rows)
+    return {
+        "files": sum(c["files"] for c in by_codec),
+        "blobs": sum(c["blobs"] for c in by_codec),
+        "uploaded_bytes": referenced,
+        "stored_bytes": stored,
+        "dedup_saved_bytes": referenced - original,
+        "compression_saved_bytes": original - stored,
+        "compression_ratio": round(stored / original, 3) if original else None,
+        "by_codec": by_codec,
+    }
+
+
+# ======================
+# SLOW QUERY LOG
+# ======================
+@router.get("/slow-queries")
+def list_slow_queries(limit: int = Query(50, ge=1, le=1000), min_ms: float = Query(0, ge=0)):
+    """Slowest recorded statements of this worker (enable with SLOW_QUERY_MS)."""
+    return {
+        "enabled": slow_queries.SLOW_QUERY_MS > 0,
+        "threshold_ms": slow_queries.SLOW_QUERY_MS,
+        "capture_plans": slow_queries.SLOW_QUERY_PLANS,
+        "records": slow_queries.recent(limit, min_ms),
+    }
+
+@router.delete("/slow-queries")
+def clear_slow_queries():
+    slow_queries.clear()
+    return {"message": "Slow query log cleared"}
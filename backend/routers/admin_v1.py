@@ -12,6 +12,8 @@ from models.academic_saas import AcademicYear
 from models.certification import Certification
 from models.audit_log import AuditLog
 from models.settings import SystemSettings
+from schemas.recognition import WeightSimulationRequest
+from services.weight_simulator import WEIGHT_KEYS, load_metric_matrix, simulate_weights
 from fastapi.responses import StreamingResponse
 import io
 
@@ -86,6 +88,16 @@ def student_performance(student_id: int, academic_year_id: int | None = Query(No
         "recommended_badge": badge_recommendation
     }
 
+@router.post("/weights/simulate")
+def simulate_performance_weights(data: WeightSimulationRequest, db: Session = Depends(get_db), current_admin: dict = Depends(admin_required)):
+    """What-if: re-score every student under each candidate weight set without saving it."""
+    for candidate in data.candidates:
+        unknown = set(candidate) - set(WEIGHT_KEYS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown weight keys: {', '.join(sorted(unknown))}")
+    student_ids, names, matrix = load_metric_matrix(db)
+    return simulate_weights(student_ids, names, matrix, get_weights(db), data.candidates, data.top_movers)
+
 @router.post("/certifications/issue", status_code=status.HTTP_201_CREATED)
 def issue_certification(data: dict, db: Session = Depends(get_db), current_admin: dict = Depends(admin_required)):
     student_id = data.get("student_id")
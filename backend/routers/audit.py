@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import get_db
 from models.audit_log import AuditLog
+from models.user import User
 from utils.security import admin_required
 
 router = APIRouter(
@@ -9,13 +10,6 @@ router = APIRouter(
     tags=["Audit Logs"]
 )
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/")
 def list_audit_logs(
     action: str | None = None,
@@ -29,7 +23,6 @@ def list_audit_logs(
     logs = query.order_by(AuditLog.timestamp.desc()).limit(limit).all()
     
     # Manual serialization
-    from models.user import User
     serialized = []
     for log in logs:
         user = db.query(User).filter(User.id == log.user_id).first()
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import timedelta
-from database import SessionLocal
+from database import get_db
 from models.user import User
+from models.academic_saas import DepartmentV1 as Department, Program, CourseV1 as Course
+from models.student_recognition import StudentRecognition
+from services.atm_scores import get_student_atm
 import schemas.user_schemas as user_schemas
 from utils.security import (
     verify_password,
@@ -14,14 +17,6 @@ from utils.security import (
 
 router = APIRouter(tags=["Authentication"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/login")
 def login(data: user_schemas.LoginRequest, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == data.email).first()
@@ -94,7 +89,6 @@ def get_my_profile(
 
     dept_name = prog_name = course_name = None
     try:
-        from models.academic_structure_v1 import Department, Program, Course
         if user.department_id:
             d = db.query(Department).filter(Department.id == user.department_id).first()
             dept_name = d.name if d else None
@@ -125,9 +119,8 @@ def get_my_profile(
 
     if user.role.lower() == "student":
         try:
-            from routers.analytics import calculate_student_atm
-            from models.student_recognition import StudentRecognition
-            atm_data = calculate_student_atm(db, user.id)
+            atm_data = get_student_atm(db, user.id)
+            db.commit()  # read-only otherwise: keeps the ATM row if it was rebuilt
             profile_data["recognition_tier"] = atm_data.get("tier", "Regular")
             profile_data["final_score"] = round(atm_data.get("final_score", 0), 1)
             profile_data["tasks_completed"] = atm_data.get("tasks_completed", 0)
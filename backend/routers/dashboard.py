@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select
 
-from database import get_db
+from database import get_async_db
 from utils.security import get_current_user
 
 from models.todo import Todo
@@ -12,6 +12,9 @@ from models.project import Project
 from models.student_performance import StudentPerformance
 from models.group import GroupMember, ProjectGroup
 from models.notification import Notification
+from models.task_submission import TaskSubmission
+from models.academic_saas import DepartmentV1 as Department, CourseV1 as Course
+from services.atm_scores import get_student_atm
 from sqlalchemy import func
 from datetime import datetime, timedelta
 
@@ -24,22 +27,21 @@ router = APIRouter(tags=["Dashboard"])
 # STUDENT DASHBOARD
 # =====================================================
 @router.get("/student")
-def student_dashboard(
-    db: Session = Depends(get_db),
+async def student_dashboard(
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     if current_user["role"] != "student":
         raise HTTPException(status_code=403, detail="Access denied")
 
     student_id = current_user["user_id"]
-    student = db.query(User).get(student_id)
+    student = await db.get(User, student_id)
     
-    from models.academic_saas import DepartmentV1 as Department, CourseV1 as Course
-    dept = db.query(Department).get(student.department_id) if student.department_id else None
-    course = db.query(Course).get(student.course_id) if student.course_id else None
+    dept = await db.get(Department, student.department_id) if student.department_id else None
+    course = await db.get(Course, student.course_id) if student.course_id else None
     # Utilize Live ATM Analytical Matrix
-    from routers.analytics import calculate_student_atm
-    metrics = calculate_student_atm(db, student_id)
+    metrics = await db.run_sync(get_student_atm, student_id)
+    await db.commit()  # read-only otherwise: keeps the ATM row if it was rebuilt
     
     # Map metrics to expected UI keys
     total_assigned = metrics.get('total_assigned_past', 0)
@@ -65,31 +67,32 @@ def student_dashboard(
     now = datetime.utcnow()
     week_ahead = now + timedelta(days=7)
 
-    group_ids = [g.group_id for g in db.query(GroupMember).filter(GroupMember.student_id == student_id).all()]
+    group_ids = (await db.scalars(select(GroupMember.group_id).where(GroupMember.student_id == student_id))).all()
 
-    upcoming_individual = db.query(Task).filter(
+    upcoming_individual = (await db.scalars(select(Task).where(
         Task.student_id == student_id,
         Task.deadline >= now,
         Task.deadline <= week_ahead,
         Task.status.in_(["published", "in_progress", "returned"])
-    ).all()
-    upcoming_group = db.query(Task).filter(
+    ))).all()
+    upcoming_group = (await db.scalars(select(Task).where(
         Task.group_id.in_(group_ids) if group_ids else False,
         Task.deadline >= now,
         Task.deadline <= week_ahead,
         Task.status.in_(["published", "in_progress", "returned"])
-    ).all()
-    upcoming_global = db.query(Task).filter(
+    ))).all()
+    upcoming_global = (await db.scalars(select(Task).where(
         Task.student_id == None,
         Task.group_id == None,
         Task.deadline >= now,
         Task.deadline <= week_ahead,
         Task.status.in_(["published", "in_progress", "returned"])
-    ).all()
+    ))).all()
 
     # Filter out tasks the student has already submitted
-    from models.task_submission import TaskSubmission
-    submitted_ids = [s.task_id for s in db.query(TaskSubmission).filter(TaskSubmission.student_id == student_id).all()]
+    submitted_ids = set((await db.scalars(select(TaskSubmission.task_id).where(
+        TaskSubmission.student_id == student_id, TaskSubmission.status != "pending_submission"
+    ))).all())
     
     unique_upcoming = list({t.id: t for t in (upcoming_individual + upcoming_group + upcoming_global) if t.id not in submitted_ids}.values())
 
@@ -110,17 +113,19 @@ def student_dashboard(
         } for t in unique_upcoming
     ]
 
-    recent_feedback = db.query(TaskSubmission).filter(
+    recent_feedback = (await db.execute(select(
+        TaskSubmission.task_id, TaskSubmission.feedback, TaskSubmission.submitted_at
+    ).where(
         TaskSubmission.student_id == student_id,
         TaskSubmission.feedback.isnot(None)
-    ).order_by(desc(TaskSubmission.submitted_at)).limit(20).all()
+    ).order_by(desc(TaskSubmission.submitted_at)).limit(20))).all()
 
     # Formatted filter to bypass MSSQL Text data constraints
     recent_feedback = [sub for sub in recent_feedback if str(sub.feedback).strip() != ""][:5]
 
     recent_feedback_res = []
     for sub in recent_feedback:
-        t = db.query(Task).filter(Task.id == sub.task_id).first()
+        t = await db.get(Task, sub.task_id)
         if t:
             recent_feedback_res.append({
                 "id": t.id,
@@ -130,16 +135,16 @@ def student_dashboard(
                 "timestamp": sub.submitted_at.isoformat() if sub.submitted_at else None
             })
 
-    groups = db.query(ProjectGroup).join(GroupMember, ProjectGroup.id == GroupMember.group_id).filter(
+    groups = (await db.scalars(select(ProjectGroup).join(GroupMember, ProjectGroup.id == GroupMember.group_id).where(
         GroupMember.student_id == student_id
-    ).all()
+    ))).all()
 
     group_activity = []
     for g in groups:
-        members_count = db.query(GroupMember).filter(GroupMember.group_id == g.id).count()
-        recent_group_tasks = db.query(Task).filter(
+        members_count = await db.scalar(select(func.count(GroupMember.id)).where(GroupMember.group_id == g.id))
+        recent_group_tasks = (await db.scalars(select(Task).where(
             Task.group_id == g.id
-        ).order_by(desc(Task.submitted_at)).limit(3).all()
+        ).order_by(desc(Task.submitted_at)).limit(3))).all()
         updates = [
             {
                 "task_id": rt.id,
@@ -154,9 +159,9 @@ def student_dashboard(
             "recent_updates": updates
         })
 
-    notifications = db.query(Notification).filter(
+    notifications = (await db.scalars(select(Notification).where(
         Notification.user_id == student_id
-    ).order_by(desc(Notification.created_at)).limit(3).all()
+    ).order_by(desc(Notification.created_at)).limit(3))).all()
 
     notifications_res = [
         {
@@ -200,8 +205,8 @@ def student_dashboard(
 # FACULTY DASHBOARD
 # =====================================================
 @router.get("/faculty")
-def faculty_dashboard(
-    db: Session = Depends(get_db),
+async def faculty_dashboard(
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     if current_user["role"] != "faculty":
@@ -209,24 +214,22 @@ def faculty_dashboard(
 
     faculty_id = current_user["user_id"]
 
-    tasks = db.query(Task).filter(
+    task_ids = (await db.scalars(select(Task.id).where(
         Task.faculty_id == faculty_id
-    ).all()
+    ))).all()
 
-    task_ids = [t.id for t in tasks]
-
-    reviewed_tasks = db.query(Task).filter(
-        Task.id.in_(task_ids),
+    reviewed_tasks = await db.scalar(select(func.count(Task.id)).where(
+        Task.faculty_id == faculty_id,
         Task.status.in_(["verified", "returned"])
-    ).count()
+    ))
 
-    pending_reviews = db.query(Task).filter(
-        Task.id.in_(task_ids),
+    pending_reviews = await db.scalar(select(func.count(Task.id)).where(
+        Task.faculty_id == faculty_id,
         Task.status == "submitted"
-    ).count()
+    ))
 
     return {
-        "tasks_created": len(tasks),
+        "tasks_created": len(task_ids),
         "tasks_reviewed": reviewed_tasks,
         "pending_reviews": pending_reviews
     }
@@ -236,25 +239,25 @@ def faculty_dashboard(
 # ADMIN DASHBOARD
 # =====================================================
 @router.get("/admin")
-def admin_dashboard(
-    db: Session = Depends(get_db),
+async def admin_dashboard(
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user)
 ):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Access denied")
 
-    total_users = db.query(User).count()
+    total_users = await db.scalar(select(func.count(User.id)))
 
-    active_students = db.query(User).filter(
+    active_students = await db.scalar(select(func.count(User.id)).where(
         User.role == "student",
         User.status == "active"
-    ).count()
+    ))
 
-    total_projects = db.query(Project).count()
-    total_tasks = db.query(Task).count()
-    total_faculty = db.query(User).filter(User.role == "faculty").count()
+    total_projects = await db.scalar(select(func.count(Project.id)))
+    total_tasks = await db.scalar(select(func.count(Task.id)))
+    total_faculty = await db.scalar(select(func.count(User.id)).where(User.role == "faculty"))
 
-    performances = db.query(StudentPerformance).all()
+    performances = (await db.execute(select(StudentPerformance.grade, StudentPerformance.final_score))).all()
 
     grade_distribution = {
         "A+": 0,
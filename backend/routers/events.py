@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import get_db
 from utils.security import get_current_user, ADMIN
 from models.events import CampusEvent
 from models.audit_log import AuditLog
+from models.user import User
+from routers.notification import add_notification
 from datetime import datetime
 from typing import Optional
 import os, shutil, uuid
@@ -14,14 +16,6 @@ router = APIRouter(tags=["Campus Events"])
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads", "events")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def save_image(file: UploadFile) -> str:
     ext = os.path.splitext(file.filename)[1] if file.filename else ".jpg"
     filename = f"{uuid.uuid4().hex}{ext}"
@@ -83,8 +77,6 @@ async def create_event(
     db.add(ev); db.commit(); db.refresh(ev)
 
     # Notify all users
-    from models.user import User
-    from routers.notification import add_notification
     for u in db.query(User).all():
         add_notification(db, user_id=u.id, title="New Campus Event",
             message=f"Event scheduled: '{ev.title}' on {ev.event_date.strftime('%Y-%m-%d')}",
@@ -142,7 +134,6 @@ def approve_event(event_id: int, current_user: dict = Depends(get_current_user),
     ev = db.query(CampusEvent).filter(CampusEvent.id == event_id).first()
     if not ev: raise HTTPException(404, "Event not found")
     ev.status = "approved"; db.commit()
-    from routers.notification import add_notification
     if ev.host_student_id:
         add_notification(db, user_id=ev.host_student_id, title="Event Approved",
             message=f"Your request to host '{ev.title}' has been approved.", type="event")
@@ -187,7 +178,6 @@ def approve_end_event(event_id: int, current_user: dict = Depends(get_current_us
     ev = db.query(CampusEvent).filter(CampusEvent.id == event_id).first()
     if not ev: raise HTTPException(404, "Event not found")
     ev.status = "ended"; db.commit()
-    from routers.notification import add_notification
     if ev.host_student_id:
         add_notification(db, user_id=ev.host_student_id, title="Event End Approved",
             message=f"Your request to end '{ev.title}' has been approved.", type="event")
@@ -12,6 +12,8 @@ from models.student_performance import StudentPerformance
 from schemas.user_schemas import UserCreateRequest
 from models.audit_log import AuditLog
 from models.task_submission import TaskSubmission
+from models.todo import Todo
+from services.performance_service import calculate_system_performance
 
 router = APIRouter(tags=["Faculty"])
 
@@ -326,9 +328,6 @@ def get_student_progress(
     - existing performance record (if already evaluated)
     Available to faculty and admin.
     """
-    from models.task import Task
-    from models.todo import Todo
-    from services.performance_service import calculate_system_performance
 
     if current_user["role"] not in [FACULTY, "admin"]:
         raise HTTPException(403, "Faculty / Admin only")
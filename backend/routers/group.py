@@ -1,12 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from database import get_db
 
 from models.group import ProjectGroup, GroupMember, ContributionLog
 from models.project_faculty import ProjectFaculty
+from models.task import Task
 from schemas.group import GroupCreate, AddGroupMember, GroupEvaluationRequest
 from utils.security import get_current_user, FACULTY, ADMIN
 from routers.notification import add_notification
+from services.atm_scores import invalidate_student_atm
+from services.submission_placeholders import (
+    create_submission_placeholders, delete_stale_placeholders, PLACEHOLDER_TASK_STATUSES
+)
 
 router = APIRouter(
     tags=["Groups & Contributions"]
@@ -137,6 +143,11 @@ def add_member(
         student_id=data.student_id
     )
     db.add(member)
+    invalidate_student_atm(db, [data.student_id])  # inherits the group's tasks
+    db.flush()
+    create_submission_placeholders(db, select(Task.id).where(
+        Task.group_id == group_id, Task.status.in_(PLACEHOLDER_TASK_STATUSES)
+    ))
     db.commit()
 
     add_notification(
@@ -197,6 +208,9 @@ def remove_member(
         raise HTTPException(404, "Member not found")
         
     db.delete(member)
+    invalidate_student_atm(db, [student_id])
+    db.flush()
+    delete_stale_placeholders(db, select(Task.id).where(Task.group_id == group_id))
     db.commit()
     return {"message": "Member removed"}
 
@@ -243,6 +257,7 @@ def delete_group(
     if not group:
         raise HTTPException(404, "Group not found")
         
+    invalidate_student_atm(db, [m.student_id for m in group.members])
     db.delete(group)
     db.commit()
     return {"message": "Group deleted"}
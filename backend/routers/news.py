@@ -5,10 +5,12 @@ from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File,
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from typing import Optional
-from database import SessionLocal
+from database import get_db
 from utils.security import get_current_user, ADMIN
 from models.news import CampusNews
 from models.audit_log import AuditLog
+from models.user import User
+from routers.notification import add_notification
 
 router = APIRouter(tags=["Campus News"])
 
@@ -18,14 +20,6 @@ os.makedirs(UPLOADS_DIR, exist_ok=True)
 VALID_CATEGORIES = {"academic", "announcement", "placement", "achievement", "general"}
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def calc_read_time(content: str) -> int:
     """Estimate reading time at 200 words/min."""
     words = len((content or "").split())
@@ -132,8 +126,6 @@ async def create_news(
     # Notify all users when published
     if news.published:
         try:
-            from models.user import User
-            from routers.notification import add_notification
             for u in db.query(User).all():
                 add_notification(
                     db, user_id=u.id,
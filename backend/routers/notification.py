@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import get_db
 from utils.security import get_current_user, admin_required
 from models.notification import Notification
 from models.user import User
@@ -11,13 +11,6 @@ router = APIRouter(
     tags=["Notifications"]
 )
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("")
 def list_my_notifications(
     current_user: dict = Depends(get_current_user),
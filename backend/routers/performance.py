@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
 
-from database import SessionLocal
+from database import get_db
 from utils.security import get_current_user, FACULTY, ADMIN
 from models.student_performance import StudentPerformance
 from models.project_faculty import ProjectFaculty
@@ -23,17 +23,6 @@ router = APIRouter(
 )
 
 
-# =====================================================
-# DB Dependency
-# =====================================================
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # =====================================================
 # CREATE PERFORMANCE REPORT
 # =====================================================
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
-from database import SessionLocal
+from database import get_db
 from models.academic_planner import AcademicPlanner
 from models.project_faculty import ProjectFaculty
 from models.todo import Todo
@@ -14,16 +14,6 @@ router = APIRouter(
     tags=["Academic Planner"]
 )
 
-# =========================
-# DB Dependency
-# =========================
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # =========================
 # CREATE ACADEMIC PLANNER + AUTO TODOS
 # =========================
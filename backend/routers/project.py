@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from database import SessionLocal
+from database import get_db
 from models.project import Project
 from models.project_faculty import ProjectFaculty
 from models.user import User
@@ -14,17 +14,6 @@ router = APIRouter(
     tags=["Projects"]
 )
 
-# ======================
-# DB Dependency
-# ======================
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ======================
 # CREATE PROJECT (ADMIN)
 # ======================
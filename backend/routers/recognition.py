@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from database import SessionLocal
+from database import get_db
 from utils.security import get_current_user, ADMIN
 from models.user import User
 from models.student_recognition import StudentRecognition
+from models.task_submission import TaskSubmission
 from models.audit_log import AuditLog
 
 router = APIRouter(
@@ -12,14 +13,6 @@ router = APIRouter(
 )
 
 # DB dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -29,7 +22,8 @@ class IssueBadgeReq(BaseModel):
     badge_type: str
     performance_score: float | None = None
 
-from routers.analytics import calculate_student_atm
+from services.atm_scores import get_student_atm, get_many_student_atm
+from services.badges import is_eligible, recommend_badge
 from models.settings import SystemSettings
 
 def get_admin_weights(db: Session):
@@ -51,19 +45,19 @@ def get_cert_stats(db: Session = Depends(get_db)):
         dist[c.award_type.lower()] = dist.get(c.award_type.lower(), 0) + 1
     
     # Calculate top students - limit to students with submissions to avoid O(N) over whole DB
-    from models.task_submission import TaskSubmission
     student_ids_with_subs = db.query(TaskSubmission.student_id).distinct().limit(20).all()
     student_ids = [s[0] for s in student_ids_with_subs]
     
     top_students = []
     weights = get_admin_weights(db)
     
-    from routers.analytics import calculate_student_atm
+    atm_by_student = get_many_student_atm(db, student_ids)
+    db.commit()  # read-only otherwise: keeps the ATM rows that were rebuilt
     for sid in student_ids:
         s = db.query(User).filter(User.id == sid).first()
         if not s: continue
         
-        metrics = calculate_student_atm(db, s.id)
+        metrics = atm_by_student[s.id]
         if metrics['total_assigned_past'] > 0:
             comp_norm = (metrics["completion_score"] / 20) * 100 if metrics["completion_score"] else 0
             avg_norm = metrics["average_percentage"]
@@ -123,14 +117,12 @@ def get_student_performance(student_id: str, db: Session = Depends(get_db)):
         raise HTTPException(404, "Student not found with the provided identifier.")
     
     student_internal_id = user.id
-    metrics = calculate_student_atm(db, student_internal_id)
+    metrics = get_student_atm(db, student_internal_id)
+    db.commit()  # read-only otherwise: keeps the ATM row if it was rebuilt
     
     # Heuristics for badges
     atm = metrics["atm_score"]
-    rec = "participation"
-    if atm >= 90: rec = "gold"
-    elif atm >= 80: rec = "silver"
-    elif atm >= 70: rec = "bronze"
+    rec = recommend_badge(atm)
     
     # Check if a certification was already issued
     cert = db.query(StudentRecognition).filter(StudentRecognition.student_id == student_internal_id).order_by(StudentRecognition.id.desc()).first()
@@ -141,7 +133,7 @@ def get_student_performance(student_id: str, db: Session = Depends(get_db)):
         "name": user.name,
         "avatar": user.avatar,
         "certification_id": cert.id if cert else None,
-        "eligibility_status": "eligible" if atm >= 50 else "ineligible",
+        "eligibility_status": "eligible" if is_eligible(atm) else "ineligible",
         "completion_rate": int((metrics["completion_score"] / 20) * 100) if metrics["completion_score"] else 0,
         "avg_score": metrics["average_percentage"],
         "group_contribution": 10,
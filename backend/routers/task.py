@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select, insert, func, case, literal, and_, or_
+from sqlalchemy.orm import Session, joinedload, defer
 from pydantic import BaseModel
 from typing import Optional
-import os, shutil, uuid
+import os, shutil, uuid, io, csv, re, mimetypes
 
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads", "submissions")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -20,17 +22,34 @@ from models.user import User
 from models.group import ProjectGroup, GroupMember
 from models.task_submission import TaskSubmission
 from models.student_performance import StudentPerformance
+from models.task_comment import TaskComment
+from models.submission_upload import SubmissionUpload
+from models.notification import Notification
 
-from schemas.task import TaskCreateRequest, TaskReviewRequest, TaskUpdateRequest
-from schemas.submission import TaskSubmitRequest
+from schemas.task import TaskCreateRequest, TaskBulkCreateRequest, TaskReviewRequest, TaskUpdateRequest
+from schemas.submission import TaskSubmitRequest, UploadInitiateRequest, UploadCompleteRequest
 from schemas.task_submission_response import TaskSubmissionResponse
-from schemas.task_response import TaskResponse
 from typing import List
 
 from utils.security import get_current_user, FACULTY, STUDENT, ADMIN
 from models.audit_log import AuditLog
-from datetime import datetime
+from datetime import datetime, timedelta
 from routers.notification import add_notification
+from services.atm_scores import record_submission_change, invalidate_student_atm, invalidate_task_targets
+from services.code_sequences import allocate_code, allocate_codes, task_code_prefix
+from utils.pagination import encode_cursor, decode_cursor, etag_response
+from services.blob_store import get_blob_store
+from services.blob_gc import release_blobs
+from services.submission_placeholders import (
+    create_submission_placeholders, delete_stale_placeholders, PLACEHOLDER_TASK_STATUSES
+)
+from services.scheduler import schedule_deadline_jobs, cancel_task_jobs
+from services.task_reports import get_task_report_stats, invalidate_task_report
+from services.submission_uploads import (
+    UPLOAD_CHUNK_SIZE, MIN_UPLOAD_CHUNK_SIZE, MAX_UPLOAD_SIZE, UPLOAD_SESSION_TTL, MAX_OPEN_UPLOADS,
+    UPLOAD_LATE_GRACE, open_upload_count,
+)
+from utils.file_responses import blob_response, stream_zip
 
 router = APIRouter(
     tags=["Tasks"]
@@ -39,12 +58,7 @@ router = APIRouter(
 # =========================
 # CREATE TASK (FACULTY)
 # =========================
-@router.post("", status_code=status.HTTP_201_CREATED)
-def create_task(
-    data: TaskCreateRequest,
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
-):
+def _check_can_create_tasks(db: Session, project_id: int, current_user: dict):
     role = current_user["role"].lower()
     if role not in [FACULTY.lower(), ADMIN.lower()]:
         raise HTTPException(status_code=403, detail="Only faculty or admin can create tasks")
@@ -52,13 +66,22 @@ def create_task(
     # Verify Faculty Assignment to Project (Skip for Admin)
     if role != ADMIN.lower():
         assignment = db.query(ProjectFaculty).filter(
-            ProjectFaculty.project_id == data.project_id,
+            ProjectFaculty.project_id == project_id,
             ProjectFaculty.faculty_id == current_user["user_id"]
         ).first()
 
         if not assignment:
             raise HTTPException(status_code=403, detail="You are not assigned to this project")
 
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+def create_task(
+    data: TaskCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    _check_can_create_tasks(db, data.project_id, current_user)
+
     # Validate Targets
     if data.task_type == "individual":
         if not data.student_id:
@@ -69,58 +92,30 @@ def create_task(
             
     initial_status = "published" 
 
-    project = db.query(Project).filter(Project.id == data.project_id).first()
-    dept_code = "GEN"
-    if project and project.department_id:
-        from models.academic_saas import DepartmentV1
-        dept = db.query(DepartmentV1).filter(DepartmentV1.id == project.department_id).first()
-        if dept and getattr(dept, "code", None):
-            dept_code = str(dept.code).upper()
-            
-    prefix = f"TASK_{dept_code}_"
-    
-    last_task = db.query(Task).filter(Task.task_code.startswith(prefix)).order_by(Task.task_code.desc()).first()
-    current_max: int = 0
-    if last_task and last_task.task_code:
-        try:
-            current_max = int(last_task.task_code.replace(prefix, ""))
-        except ValueError:
-            pass
-
-    from sqlalchemy.exc import IntegrityError
-    
-    task = None
-    MAX_RETRIES = 10
-    for attempt in range(MAX_RETRIES):
-        _val: int = int(current_max)
-        task_code = f"{prefix}{_val + 1 + attempt:03d}"
-
-        task = Task(
-            task_code=task_code,
-            title=data.title,
-            description=data.description,
-            priority=data.priority,
-            deadline=data.deadline,
-            max_marks=data.max_marks,
-            task_type=data.task_type,
-            project_id=data.project_id,
-            faculty_id=current_user["user_id"],
-            student_id=data.student_id,
-            group_id=data.group_id,
-            status=initial_status,
-            file_url=data.file_url,
-            late_penalty=data.late_penalty
-        )
-        db.add(task)
-        try:
-            db.commit()
-            db.refresh(task)
-            break
-        except IntegrityError:
-            db.rollback()
-            if attempt == MAX_RETRIES - 1:
-                raise HTTPException(status_code=500, detail="Database sequence generator timeout due to high concurrency. Retry later.")
-            continue
+    task = Task(
+        task_code=allocate_code(db, task_code_prefix(db, data.project_id)),
+        title=data.title,
+        description=data.description,
+        priority=data.priority,
+        deadline=data.deadline,
+        max_marks=data.max_marks,
+        task_type=data.task_type,
+        project_id=data.project_id,
+        faculty_id=current_user["user_id"],
+        student_id=data.student_id,
+        group_id=data.group_id,
+        status=initial_status,
+        file_url=data.file_url,
+        late_penalty=data.late_penalty
+    )
+    db.add(task)
+    db.flush()
+    # New assignment moves the targets' ATM counters (now or at its deadline)
+    invalidate_task_targets(db, task)
+    create_submission_placeholders(db, [task.id])
+    schedule_deadline_jobs(db, [task.id])
+    db.commit()
+    db.refresh(task)
 
     # Notify Target (Student or Group)
     if task and task.student_id:
@@ -132,7 +127,6 @@ def create_task(
             type="task"
         )
     elif task and task.group_id:
-        from models.group import GroupMember
         members = db.query(GroupMember).filter(GroupMember.group_id == task.group_id).all()
         for m in members:
             add_notification(
@@ -145,6 +139,91 @@ def create_task(
 
     return {"message": "Mission deployed successfully", "task_id": getattr(task, "id", None)}
 
+# Upper bound on students targeted by one bulk assignment
+MAX_BULK_ASSIGN = 5000
+
+
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+def create_tasks_bulk(
+    data: TaskBulkCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Assigns the same individual task to many students at once. All task rows go in with
+    one executemany insert using a block of codes reserved in a single statement, and
+    the notifications with another, in one transaction.
+    """
+    _check_can_create_tasks(db, data.project_id, current_user)
+
+    targets = db.query(User.id).filter(User.role == STUDENT, User.status == "active")
+    if data.student_ids:
+        targets = targets.filter(User.id.in_(set(data.student_ids)))
+    else:
+        filters = [
+            column == value
+            for column, value in (
+                (User.course_id, data.course_id), (User.program_id, data.program_id),
+                (User.department_id, data.department_id), (User.batch, data.batch),
+            )
+            if value is not None
+        ]
+        if not filters:
+            raise HTTPException(400, "Give student_ids or at least one of course_id, program_id, department_id, batch")
+        targets = targets.filter(*filters)
+    student_ids = [row.id for row in targets.order_by(User.id).limit(MAX_BULK_ASSIGN + 1)]
+
+    if data.student_ids:
+        unknown = sorted(set(data.student_ids) - set(student_ids))
+        if unknown:
+            raise HTTPException(400, {"message": "Not active students", "student_ids": unknown})
+    if not student_ids:
+        raise HTTPException(400, "No students match the given targets")
+    if len(student_ids) > MAX_BULK_ASSIGN:
+        raise HTTPException(400, f"At most {MAX_BULK_ASSIGN} students per bulk assignment")
+
+    codes = allocate_codes(db, task_code_prefix(db, data.project_id), len(student_ids))
+    now = datetime.utcnow()
+    db.execute(insert(Task), [
+        {
+            "task_code": code,
+            "title": data.title,
+            "description": data.description,
+            "priority": data.priority,
+            "deadline": data.deadline,
+            "max_marks": data.max_marks,
+            "task_type": "individual",
+            "project_id": data.project_id,
+            "faculty_id": current_user["user_id"],
+            "student_id": student_id,
+            "status": "published",
+            "file_url": data.file_url,
+            "late_penalty": data.late_penalty,
+            "created_at": now,
+        }
+        for code, student_id in zip(codes, student_ids)
+    ])
+    # New assignments move the targets' ATM counters (now or at their deadline)
+    invalidate_student_atm(db, student_ids)
+    new_task_ids = select(Task.id).where(Task.task_code.in_(codes))
+    create_submission_placeholders(db, new_task_ids)
+    schedule_deadline_jobs(db, new_task_ids)
+    db.execute(insert(Notification), [
+        {
+            "user_id": student_id,
+            "title": "New Mission Deployed",
+            "message": f"A new academic mission '{data.title}' has been assigned to you.",
+            "type": "task",
+            "is_read": False,
+            "created_at": now,
+        }
+        for student_id in student_ids
+    ])
+    db.commit()
+
+    return {"message": "Mission deployed successfully", "assigned": len(student_ids), "task_codes": codes}
+
+
 @router.put("/{task_id}/publish")
 def publish_task(
     task_id: int,
@@ -164,6 +243,9 @@ def publish_task(
         
     task.status = "published"
     task.published_at = datetime.utcnow()
+    db.flush()
+    create_submission_placeholders(db, [task.id])
+    schedule_deadline_jobs(db, [task.id])
     db.commit()
     
     # Notify Students (Stub)
@@ -193,8 +275,20 @@ def update_task(
         raise HTTPException(403, "Not your task")
         
     update_data = data.dict(exclude_unset=True)
+    invalidate_task_targets(db, task)
     for key, value in update_data.items():
         setattr(task, key, value)
+    invalidate_task_targets(db, task)
+    if {"student_id", "group_id"} & update_data.keys():
+        db.flush()
+        delete_stale_placeholders(db, [task.id])
+        if task.status in PLACEHOLDER_TASK_STATUSES:
+            create_submission_placeholders(db, [task.id])
+    if {"deadline", "status"} & update_data.keys():
+        db.flush()
+        schedule_deadline_jobs(db, [task.id])
+    # Timing buckets depend on the deadline, the marks on who is targeted
+    invalidate_task_report(db, [task.id])
         
     db.commit()
     return {"message": "Task updated successfully"}
@@ -202,79 +296,79 @@ def update_task(
 # =========================
 # SUBMIT TASK (STUDENT)
 # =========================
-@router.post("/{task_id}/submit")
-def submit_task(
-    task_id: int,
-    submission_text: str = Form(...),
-    file: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
-):
-    if current_user["role"] != STUDENT:
-        raise HTTPException(403, "Student access only")
-
+def _submittable_task(db: Session, task_id: int, student_id: int):
+    """The task, if this student may submit for it (their individual task or their group's)."""
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(404, "Task not found")
-        
-    # Check Deadline
-    is_late = False
-    if datetime.utcnow() > task.deadline:
-        is_late = True
-        # Logic to reject or accept late? user said "Late indicator badge" and "Auto mark deduction"
 
     # Check Logic
     if task.task_type == "individual":
-        if task.student_id != current_user["user_id"]:
+        if task.student_id != student_id:
             raise HTTPException(403, "Not your task")
     elif task.task_type == "group":
         # Any member can submit?
         member = db.query(GroupMember).filter(
             GroupMember.group_id == task.group_id,
-            GroupMember.student_id == current_user["user_id"]
+            GroupMember.student_id == student_id
         ).first()
         if not member:
             raise HTTPException(403, "Not allowed for this group task")
+    return task
 
-    # Read file data
-    file_content = None
-    file_mime = None
-    if file:
-        file_content = file.file.read()
-        file_mime = getattr(file, "content_type", "application/pdf")
 
-    # Save Submission
+def _save_submission(db: Session, task: Task, student_id: int, submission_text: str, is_late: bool,
+                     file_key=None, file_size=None, file_mime=None):
+    """Creates or replaces the student's submission, then notifies the task's faculty."""
     submission = db.query(TaskSubmission).filter(
-        TaskSubmission.task_id == task_id,
-        TaskSubmission.student_id == current_user["user_id"]
+        TaskSubmission.task_id == task.id,
+        TaskSubmission.student_id == student_id
     ).first()
     
+    before = (submission.is_late, submission.status, submission.marks_obtained) if submission else None
+    replaced_key = None
+    file_codec, file_stored_size = get_blob_store().info(file_key) if file_key else (None, None)
     if submission:
         submission.submission_text = submission_text
-        if file_content:
-            submission.file_data = file_content
+        if file_key:
+            if submission.file_key != file_key:
+                replaced_key = submission.file_key
+            submission.file_key = file_key
+            submission.file_size = file_size
             submission.file_mime = file_mime
+            submission.file_codec = file_codec
+            submission.file_stored_size = file_stored_size
         submission.submitted_at = datetime.utcnow()
         submission.is_late = is_late
         submission.status = "submitted"
     else:
         submission = TaskSubmission(
-            task_id=task_id,
-            student_id=current_user["user_id"],
+            task_id=task.id,
+            student_id=student_id,
             submission_text=submission_text,
-            file_data=file_content,
+            file_key=file_key,
+            file_size=file_size,
             file_mime=file_mime,
+            file_codec=file_codec,
+            file_stored_size=file_stored_size,
             is_late=is_late,
             status="submitted"
         )
         db.add(submission)
 
+    record_submission_change(
+        db, task, student_id,
+        before, (submission.is_late, submission.status, submission.marks_obtained)
+    )
+    invalidate_task_report(db, [task.id])
+    # A replaced file is collected later, once nothing references it (services/blob_gc.py)
+    release_blobs(db, [replaced_key], datetime.utcnow())
     db.commit()
     db.refresh(submission)
 
     # Set new API endpoint url dynamically based on generated ID
-    if file_content:
-        submission.file_url = f"/api/tasks/{task_id}/submissions/{submission.id}/file"
+    if file_key:
+        submission.file_url = f"/api/tasks/{task.id}/submissions/{submission.id}/file"
         db.commit()
     
     # Notify Faculty
@@ -285,6 +379,182 @@ def submit_task(
         message=f"Operative has submitted evidence for mission '{task.title}'.",
         type="task"
     )
+    return submission
+
+
+@router.post("/{task_id}/submit")
+def submit_task(
+    task_id: int,
+    submission_text: str = Form(...),
+    file: Optional[UploadFile] = File(None),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    if current_user["role"] != STUDENT:
+        raise HTTPException(403, "Student access only")
+
+    task = _submittable_task(db, task_id, current_user["user_id"])
+        
+    # Check Deadline
+    is_late = False
+    if datetime.utcnow() > task.deadline:
+        is_late = True
+        # Logic to reject or accept late? user said "Late indicator badge" and "Auto mark deduction"
+
+    # Stream the upload into the blob store; the row only keeps its content key
+    file_key = None
+    file_size = None
+    file_mime = None
+    if file:
+        file_mime = getattr(file, "content_type", "application/pdf")
+        file_key, file_size = get_blob_store().put(file.file, file_mime)
+
+    _save_submission(db, task, current_user["user_id"], submission_text, is_late, file_key, file_size, file_mime)
+
+    return {"message": "Task submitted", "is_late": is_late}
+
+
+# =========================
+# RESUMABLE UPLOADS
+# =========================
+def _get_upload(db: Session, task_id: int, upload_id: str, current_user: dict):
+    if current_user["role"] != STUDENT:
+        raise HTTPException(403, "Student access only")
+    upload = db.query(SubmissionUpload).filter(
+        SubmissionUpload.id == upload_id,
+        SubmissionUpload.task_id == task_id,
+        SubmissionUpload.student_id == current_user["user_id"]
+    ).first()
+    if not upload:
+        raise HTTPException(404, "Upload not found")
+    if upload.status == "completed":
+        raise HTTPException(409, "Upload already completed")
+    if upload.status == "expired" or datetime.utcnow() - upload.started_at > UPLOAD_SESSION_TTL:
+        raise HTTPException(410, "Upload session expired, start a new upload")
+    return upload
+
+
+def _upload_state(upload: SubmissionUpload, received):
+    return {
+        "upload_id": upload.id,
+        "chunk_size": upload.chunk_size,
+        "total_chunks": upload.total_chunks,
+        "received_chunks": received,
+        "missing_chunks": sorted(set(range(upload.total_chunks)) - set(received)),
+        "started_at": upload.started_at,
+    }
+
+
+@router.post("/{task_id}/uploads", status_code=status.HTTP_201_CREATED)
+def initiate_upload(
+    task_id: int,
+    data: UploadInitiateRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Starts a resumable upload: PUT each chunk to /chunks/{index}, GET the upload to see
+    which chunks are still missing, then POST /complete. Lateness is judged by when the
+    upload completes, with UPLOAD_LATE_GRACE for the last chunks in flight. A student
+    holds at most MAX_OPEN_UPLOADS open sessions.
+    """
+    if current_user["role"] != STUDENT:
+        raise HTTPException(403, "Student access only")
+    _submittable_task(db, task_id, current_user["user_id"])
+    if data.total_size < 1 or data.total_size > MAX_UPLOAD_SIZE:
+        raise HTTPException(400, f"total_size must be between 1 and {MAX_UPLOAD_SIZE} bytes")
+    chunk_size = min(data.chunk_size or UPLOAD_CHUNK_SIZE, UPLOAD_CHUNK_SIZE)
+    if chunk_size < MIN_UPLOAD_CHUNK_SIZE and chunk_size < data.total_size:
+        raise HTTPException(400, f"chunk_size must be at least {MIN_UPLOAD_CHUNK_SIZE} bytes")
+    if open_upload_count(db, current_user["user_id"], datetime.utcnow()) >= MAX_OPEN_UPLOADS:
+        raise HTTPException(429, f"At most {MAX_OPEN_UPLOADS} uploads can be open at once; complete or let one expire")
+
+    upload = SubmissionUpload(
+        id=uuid.uuid4().hex,
+        task_id=task_id,
+        student_id=current_user["user_id"],
+        file_name=data.file_name,
+        file_mime=data.file_mime or "application/pdf",
+        total_size=data.total_size,
+        chunk_size=chunk_size,
+        total_chunks=-(-data.total_size // chunk_size),
+        status="uploading",
+        started_at=datetime.utcnow(),
+    )
+    db.add(upload)
+    db.commit()
+    return _upload_state(upload, [])
+
+
+@router.get("/{task_id}/uploads/{upload_id}")
+def get_upload_status(
+    task_id: int,
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    upload = _get_upload(db, task_id, upload_id, current_user)
+    return _upload_state(upload, get_blob_store().part_indexes(upload.id))
+
+
+@router.put("/{task_id}/uploads/{upload_id}/chunks/{index}")
+def upload_chunk(
+    task_id: int,
+    upload_id: str,
+    index: int,
+    chunk: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Stores one chunk; re-sending a chunk replaces it, so clients simply retry failures."""
+    upload = _get_upload(db, task_id, upload_id, current_user)
+    if index < 0 or index >= upload.total_chunks:
+        raise HTTPException(400, f"Chunk index must be between 0 and {upload.total_chunks - 1}")
+    expected = min(upload.chunk_size, upload.total_size - index * upload.chunk_size)
+
+    # The chunk is already spooled by the form parser; check its length before staging it
+    chunk.file.seek(0, os.SEEK_END)
+    size = chunk.file.tell()
+    chunk.file.seek(0)
+    if size != expected:
+        raise HTTPException(400, f"Chunk {index} must be {expected} bytes, got {size}")
+    get_blob_store().put_part(upload.id, index, chunk.file)
+    return {"index": index, "size": size}
+
+
+@router.post("/{task_id}/uploads/{upload_id}/complete")
+def complete_upload(
+    task_id: int,
+    upload_id: str,
+    data: UploadCompleteRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Assembles the chunks into the blob store and records the submission."""
+    upload = _get_upload(db, task_id, upload_id, current_user)
+    task = _submittable_task(db, task_id, current_user["user_id"])
+
+    store = get_blob_store()
+    received = store.part_indexes(upload.id)
+    missing = sorted(set(range(upload.total_chunks)) - set(received))
+    if missing:
+        raise HTTPException(409, {"message": "Upload incomplete", "missing_chunks": missing})
+    # Check the staged sizes before assembling, so a bad part can be re-sent instead of lost
+    invalid = [
+        index for index in range(upload.total_chunks)
+        if store.part_size(upload.id, index) != min(upload.chunk_size, upload.total_size - index * upload.chunk_size)
+    ]
+    if invalid:
+        raise HTTPException(409, {"message": "Chunks have the wrong size, re-send them", "invalid_chunks": invalid})
+
+    completed_at = datetime.utcnow()
+    file_key, file_size = store.assemble(upload.id, upload.total_chunks, upload.file_mime)
+
+    upload.status = "completed"
+    upload.completed_at = completed_at
+    is_late = completed_at > task.deadline + UPLOAD_LATE_GRACE
+    _save_submission(db, task, current_user["user_id"], data.submission_text, is_late,
+                     file_key, file_size, upload.file_mime)
 
     return {"message": "Task submitted", "is_late": is_late}
 
@@ -292,15 +562,70 @@ def submit_task(
 def get_submission_file(
     task_id: int,
     submission_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    from fastapi.responses import Response
-    
     sub = db.query(TaskSubmission).filter(TaskSubmission.id == submission_id, TaskSubmission.task_id == task_id).first()
-    if not sub or not sub.file_data:
+    store = get_blob_store()
+    if not sub or not sub.file_key or not store.exists(sub.file_key):
         raise HTTPException(404, "File not found")
-    
-    return Response(content=sub.file_data, media_type=sub.file_mime or "application/pdf")
+
+    return blob_response(request, store, sub.file_key, sub.file_mime or "application/pdf", sub.submitted_at)
+
+@router.get("/{task_id}/submissions/archive")
+def download_submissions_archive(
+    task_id: int,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """ZIP of every submission file for the task plus a manifest.csv, streamed as it is built."""
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if not task:
+        raise HTTPException(404, "Task not found")
+    if current_user["role"] != ADMIN and not (current_user["role"] == FACULTY and task.faculty_id == current_user["user_id"]):
+        raise HTTPException(403, "Not your task")
+
+    rows = db.query(
+        TaskSubmission.student_id, TaskSubmission.submitted_at, TaskSubmission.is_late,
+        TaskSubmission.marks_obtained, TaskSubmission.file_key, TaskSubmission.file_mime,
+        User.name, User.roll_no,
+    ).outerjoin(User, User.id == TaskSubmission.student_id).filter(
+        TaskSubmission.task_id == task_id
+    ).order_by(User.roll_no, TaskSubmission.student_id).all()
+
+    store = get_blob_store()
+    manifest = io.StringIO()
+    writer = csv.writer(manifest)
+    writer.writerow(["student_id", "student", "roll_no", "submitted_at", "is_late", "marks", "file"])
+    files = []
+    used_names = set()
+    for r in rows:
+        file_name = ""
+        if r.file_key and store.exists(r.file_key):
+            label = re.sub(r"[^A-Za-z0-9_-]+", "_", f"{r.roll_no or r.student_id}_{r.name or 'student'}").strip("_")
+            extension = mimetypes.guess_extension(r.file_mime or "application/pdf") or ""
+            file_name = f"submissions/{label}{extension}"
+            if file_name in used_names:
+                file_name = f"submissions/{label}_{r.student_id}{extension}"
+            used_names.add(file_name)
+            files.append((file_name, r.file_key))
+        writer.writerow([
+            r.student_id, r.name or "", r.roll_no or "",
+            r.submitted_at.isoformat() if r.submitted_at else "",
+            bool(r.is_late), "" if r.marks_obtained is None else r.marks_obtained, file_name,
+        ])
+
+    def entries():
+        yield "manifest.csv", [manifest.getvalue().encode("utf-8")], True
+        for file_name, key in files:
+            yield file_name, store.iter_chunks(key), False
+
+    archive_name = f"{task.task_code or f'task_{task.id}'}_submissions.zip"
+    return StreamingResponse(
+        stream_zip(entries()),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{archive_name}"'},
+    )
 
 # =========================
 # COMMENTS
@@ -315,8 +640,6 @@ def get_task_comments(
     current_user: dict = Depends(get_current_user)
 ):
     try:
-        from models.task_comment import TaskComment
-        from models.user import User
         # Ensure they have access
         task = db.query(Task).filter(Task.id == task_id).first()
         if not task:
@@ -349,7 +672,6 @@ def add_task_comment(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    from models.task_comment import TaskComment
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(404, "Task not found")
@@ -375,7 +697,6 @@ def add_task_comment(
         if task.student_id:
             add_notification(db, user_id=task.student_id, title="New Faculty Feedback", message=f"Faculty has commented on mission '{task.title}'", type="task")
         elif task.group_id:
-            from models.group import GroupMember
             members = db.query(GroupMember).filter(GroupMember.group_id == task.group_id).all()
             for m in members:
                 add_notification(db, user_id=m.student_id, title="Squad Intel Briefing", message=f"Faculty has added a directive to squad mission '{task.title}'", type="task")
@@ -384,7 +705,6 @@ def add_task_comment(
         add_notification(db, user_id=task.faculty_id, title="Operative Broadcast", message=f"Operative has commented on mission '{task.title}'", type="task")
         # Notify group members 
         if task.group_id:
-            from models.group import GroupMember
             others = db.query(GroupMember).filter(GroupMember.group_id == task.group_id, GroupMember.student_id != current_user["user_id"]).all()
             for o in others:
                 add_notification(db, user_id=o.student_id, title="Squad Communication", message=f"A teammate shared intel on mission '{task.title}'", type="task")
@@ -398,7 +718,6 @@ def update_task_comment(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    from models.task_comment import TaskComment
     comment = db.query(TaskComment).filter(TaskComment.id == comment_id).first()
     if not comment:
         raise HTTPException(404, "Comment not found")
@@ -416,7 +735,6 @@ def delete_task_comment(
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    from models.task_comment import TaskComment
     comment = db.query(TaskComment).filter(TaskComment.id == comment_id).first()
     if not comment:
         raise HTTPException(404, "Comment not found")
@@ -431,43 +749,203 @@ def delete_task_comment(
 # =========================
 # VIEW TASKS (FOR CURRENT USER)
 # =========================
+# Serializable listing fields; relation fields are joined in only when requested
+TASK_LIST_FIELDS = {
+    "id": lambda t: t.id,
+    "task_code": lambda t: t.task_code,
+    "title": lambda t: t.title,
+    "description": lambda t: t.description,
+    "priority": lambda t: t.priority,
+    "deadline": lambda t: t.deadline,
+    "max_marks": lambda t: t.max_marks,
+    "task_type": lambda t: t.task_type,
+    "project_id": lambda t: t.project_id,
+    "project_title": lambda t: t.project.title if t.project else "Unknown Track",
+    "faculty_id": lambda t: t.faculty_id,
+    "student_id": lambda t: t.student_id,
+    "student_name": lambda t: t.student.name if t.student else None,
+    "group_id": lambda t: t.group_id,
+    "group_name": lambda t: t.group.name if t.group else None,
+    "status": lambda t: t.status,
+    "file_url": lambda t: t.file_url,
+    "created_at": lambda t: t.created_at,
+    "published_at": lambda t: t.published_at,
+    "started_at": lambda t: t.started_at,
+    "submitted_at": lambda t: t.submitted_at,
+    "closed_at": lambda t: t.closed_at,
+    "submission_content": lambda t: t.submission_content,
+    "faculty_feedback": lambda t: t.faculty_feedback,
+    "marks": lambda t: t.marks,
+    "dynamic_status": lambda t: t.status,
+}
+# Large text columns, only loaded when the caller asks for them
+TASK_HEAVY_COLUMNS = {"description": Task.description, "submission_content": Task.submission_content,
+                      "faculty_feedback": Task.faculty_feedback}
+
+
+def task_list_params(
+    project_id: Optional[int] = Query(None),
+    status_filter: Optional[List[str]] = Query(None, alias="status"),
+    priority: Optional[List[str]] = Query(None),
+    deadline_from: Optional[datetime] = Query(None),
+    deadline_to: Optional[datetime] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (sparse listing)"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (all tasks when omitted)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+):
+    """Filters and paging shared by the task listings."""
+    selected = None
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in selected if f not in TASK_LIST_FIELDS]
+        if unknown:
+            raise HTTPException(400, f"Unknown fields: {', '.join(unknown)}")
+    return {
+        "project_id": project_id,
+        "status": status_filter,
+        "priority": priority,
+        "deadline_from": deadline_from,
+        "deadline_to": deadline_to,
+        "fields": selected,
+        "limit": limit,
+        "cursor": cursor,
+    }
+
+
+def _task_listing(db: Session, params: dict, default_fields, faculty_id: Optional[int] = None):
+    """
+    Tasks newest first (created_at, id), filtered and keyset-paginated, with project,
+    student and group joined in the same query. Returns (rows, next_cursor).
+    """
+    fields = params["fields"] or default_fields
+    after = decode_cursor(params["cursor"], datetime, int) if params["cursor"] else None
+
+    query = db.query(Task)
+    options = [defer(column) for name, column in TASK_HEAVY_COLUMNS.items() if name not in fields]
+    if "project_title" in fields:
+        options.append(joinedload(Task.project).load_only(Project.title))
+    if "student_name" in fields:
+        options.append(joinedload(Task.student).load_only(User.name))
+    if "group_name" in fields:
+        options.append(joinedload(Task.group).load_only(ProjectGroup.name))
+    query = query.options(*options)
+
+    if faculty_id is not None:
+        query = query.filter(Task.faculty_id == faculty_id)
+    if params["project_id"] is not None:
+        query = query.filter(Task.project_id == params["project_id"])
+    if params["status"]:
+        query = query.filter(Task.status.in_(params["status"]))
+    if params["priority"]:
+        query = query.filter(Task.priority.in_(params["priority"]))
+    if params["deadline_from"]:
+        query = query.filter(Task.deadline >= params["deadline_from"])
+    if params["deadline_to"]:
+        query = query.filter(Task.deadline <= params["deadline_to"])
+    if after:
+        created_at, task_id = after
+        query = query.filter(or_(Task.created_at < created_at, and_(Task.created_at == created_at, Task.id < task_id)))
+
+    query = query.order_by(Task.created_at.desc(), Task.id.desc())
+    limit = params["limit"]
+    if limit:
+        query = query.limit(limit + 1)
+    tasks = query.all()
+
+    next_cursor = None
+    if limit and len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+    rows = [{name: TASK_LIST_FIELDS[name](t) for name in fields} for t in tasks]
+    return rows, next_cursor
+
+
+MY_TASKS_STAFF_FIELDS = [
+    "id", "title", "description", "priority", "deadline", "max_marks", "task_type", "project_id",
+    "project_title", "student_id", "student_name", "group_id", "group_name", "status", "file_url",
+    "created_at", "started_at", "dynamic_status",
+]
+ADMIN_TASK_LIST_FIELDS = [
+    "id", "title", "description", "priority", "deadline", "project_id", "max_marks", "task_type",
+    "status", "file_url", "created_at", "faculty_id",
+]
+
+
+STUDENT_FEED_STATUSES = ["published", "in_progress", "submitted", "graded", "returned", "closed"]
+
+
+def _student_task_feed(db: Session, user_id: int, statuses, after, limit):
+    """
+    The student's tasks (direct, group, or submitted to) with their own submission,
+    as one outer-joined query ordered by (deadline, id). `after` is the keyset of the
+    previous page's last row. Returns up to `limit` + 1 rows so callers can tell
+    whether another page exists.
+    """
+    first_submission_id = select(func.min(TaskSubmission.id)).where(
+        TaskSubmission.task_id == Task.id,
+        TaskSubmission.student_id == user_id
+    ).correlate(Task).scalar_subquery()
+    group_ids = select(GroupMember.group_id).where(GroupMember.student_id == user_id)
+
+    # A real submission's status wins (placeholders count as none); otherwise in-progress
+    # tasks the scheduler flagged overdue read as such
+    dynamic_status = case(
+        (and_(TaskSubmission.id.isnot(None), TaskSubmission.status != "pending_submission"), TaskSubmission.status),
+        (and_(Task.status == "in_progress", Task.is_overdue == True), "overdue (in-progress)"),
+        else_=Task.status
+    ).label("dynamic_status")
+
+    query = db.query(
+        Task.id, Task.title, Task.description, Task.priority, Task.deadline, Task.max_marks,
+        Task.task_type, Task.project_id, Task.status, Task.file_url, Task.created_at, Task.is_report_shared,
+        dynamic_status,
+        TaskSubmission.marks_obtained, TaskSubmission.grade, TaskSubmission.feedback
+    ).outerjoin(
+        TaskSubmission, TaskSubmission.id == first_submission_id
+    ).filter(
+        (Task.student_id == user_id) |
+        (Task.group_id.in_(group_ids)) |
+        (TaskSubmission.id.isnot(None)),
+        Task.status.in_(STUDENT_FEED_STATUSES)
+    )
+    if statuses:
+        query = query.filter(dynamic_status.in_(statuses))
+    if after:
+        deadline, task_id = after
+        query = query.filter(or_(Task.deadline > deadline, and_(Task.deadline == deadline, Task.id > task_id)))
+    query = query.order_by(Task.deadline, Task.id)
+    if limit:
+        query = query.limit(limit + 1)
+    return query.all()
+
+
 @router.get("/my-tasks")
 def get_my_tasks(
+    request: Request,
+    params: dict = Depends(task_list_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
+    """
+    Students: their task feed ordered by deadline (status filters dynamic_status).
+    Faculty/admin: tasks they created (admin: all) newest first, with filters and
+    sparse `fields`. Both page with `limit` + `cursor` (next cursor in X-Next-Cursor).
+    """
+    limit = params["limit"]
+    after = decode_cursor(params["cursor"], datetime, int) if params["cursor"] else None
     try:
         user_id = current_user["user_id"]
         role = current_user["role"].lower()
         
         if role == STUDENT.lower():
-            # GET ACTIVE/PROGRESS TASKS (EXCLUDE PUBLISHED/DRAFT)
-            from models.task_submission import TaskSubmission
-            engaged_tasks = [s.task_id for s in db.query(TaskSubmission).filter(TaskSubmission.student_id == user_id).all()]
-            tasks = db.query(Task).filter(
-                (Task.student_id == user_id) |
-                (Task.group_id.in_(db.query(GroupMember.group_id).filter(GroupMember.student_id == user_id))) |
-                (Task.id.in_(engaged_tasks)),
-                Task.status.in_(["published", "in_progress", "submitted", "graded", "returned", "closed"])
-            ).all()
-            
-            res = []
-            now = datetime.utcnow()
-            for t in tasks:
-                status = t.status
-                # If in_progress but past deadline -> overdue (Progress still tracked)
-                if status == "in_progress" and now > t.deadline:
-                    status = "overdue (in-progress)"
-                
-                # Check if submitted
-                sub = db.query(TaskSubmission).filter(
-                    TaskSubmission.task_id == t.id,
-                    TaskSubmission.student_id == user_id
-                ).first()
-                if sub:
-                    status = sub.status 
-                    
-                t_data = {
+            rows = _student_task_feed(db, user_id, params["status"], after, limit)
+            headers = {}
+            if limit and len(rows) > limit:
+                rows = rows[:limit]
+                headers["X-Next-Cursor"] = encode_cursor(rows[-1].deadline, rows[-1].id)
+
+            res = [
+                {
                     "id": t.id,
                     "title": t.title,
                     "description": t.description,
@@ -479,50 +957,22 @@ def get_my_tasks(
                     "status": t.status,
                     "file_url": t.file_url,
                     "created_at": t.created_at,
-                    "is_report_shared": getattr(t, "is_report_shared", False),
-                    "dynamic_status": status,
-                    "marks_obtained": sub.marks_obtained if sub else None,
-                    "grade": sub.grade if sub else None,
-                    "faculty_feedback": sub.feedback if sub else None
+                    "is_report_shared": t.is_report_shared or False,
+                    "dynamic_status": t.dynamic_status,
+                    "marks_obtained": t.marks_obtained,
+                    "grade": t.grade,
+                    "faculty_feedback": t.feedback
                 }
-                res.append(t_data)
-            return res
+                for t in rows
+            ]
+            return etag_response(request, res, headers)
 
         elif role in [FACULTY.lower(), ADMIN.lower()]:
             # For FACULTY, show their tasks. For ADMIN, show all tasks.
-            query = db.query(Task)
-            if role == FACULTY.lower():
-                query = query.filter(Task.faculty_id == user_id)
-            
-            tasks = query.order_by(Task.created_at.desc()).all()
-            res = []
-            for t in tasks:
-                proj = db.query(Project).filter(Project.id == t.project_id).first()
-                std = db.query(User).filter(User.id == t.student_id).first() if t.student_id else None
-                grp = db.query(ProjectGroup).filter(ProjectGroup.id == t.group_id).first() if t.group_id else None
-                
-                t_data = {
-                    "id": t.id,
-                    "title": t.title,
-                    "description": t.description,
-                    "priority": t.priority,
-                    "deadline": t.deadline,
-                    "max_marks": t.max_marks,
-                    "task_type": t.task_type,
-                    "project_id": t.project_id,
-                    "project_title": proj.title if proj else "Unknown Track",
-                    "student_id": t.student_id,
-                    "student_name": std.name if std else None,
-                    "group_id": t.group_id,
-                    "group_name": grp.name if grp else None,
-                    "status": t.status,
-                    "file_url": t.file_url,
-                    "created_at": t.created_at,
-                    "started_at": t.started_at,  # LOG VISIBLE TO FACULTY
-                    "dynamic_status": t.status
-                }
-                res.append(t_data)
-            return res
+            rows, next_cursor = _task_listing(
+                db, params, MY_TASKS_STAFF_FIELDS, faculty_id=user_id if role == FACULTY.lower() else None
+            )
+            return etag_response(request, rows, {"X-Next-Cursor": next_cursor} if next_cursor else None)
         else:
             return []
     except Exception as e:
@@ -653,6 +1103,68 @@ def accept_task(
 # =========================
 # GRADE SUBMISSION (FACULTY)
 # =========================
+def _letter_grade(score: float):
+    if score >= 90: return "A+"
+    elif score >= 80: return "A"
+    elif score >= 70: return "B"
+    elif score >= 60: return "C"
+    elif score >= 50: return "D"
+    return "F"
+
+
+def _sync_project_performance(db: Session, project_id: int, student_ids, faculty_id: int):
+    """
+    Recomputes the StudentPerformance row of each student in the project from their graded
+    tasks: one grouped aggregate for all students, one query for their existing rows.
+    Does not commit.
+    """
+    student_ids = list(set(student_ids))
+    if not student_ids:
+        return
+    # Marks and max marks of every graded task in the project (missing/zero max_marks counts as 100)
+    totals = {
+        row.student_id: (float(row.total_marks or 0), float(row.total_max or 0))
+        for row in db.query(
+            TaskSubmission.student_id,
+            func.sum(TaskSubmission.marks_obtained).label("total_marks"),
+            func.sum(func.coalesce(func.nullif(Task.max_marks, 0), 100)).label("total_max"),
+        ).join(Task, Task.id == TaskSubmission.task_id).filter(
+            Task.project_id == project_id,
+            TaskSubmission.student_id.in_(student_ids),
+            TaskSubmission.status == "graded",
+            TaskSubmission.marks_obtained.isnot(None)
+        ).group_by(TaskSubmission.student_id)
+    }
+    existing = {
+        perf.student_id: perf
+        for perf in db.query(StudentPerformance).filter(
+            StudentPerformance.project_id == project_id,
+            StudentPerformance.student_id.in_(student_ids)
+        )
+    }
+
+    for student_id in student_ids:
+        total_marks, total_max = totals.get(student_id, (0.0, 0.0))
+        final_score = (total_marks / total_max) * 100.0 if total_max > 0.0 else 0.0
+        final_grade = _letter_grade(final_score)
+
+        perf = existing.get(student_id)
+        if not perf:
+            db.add(StudentPerformance(
+                student_id=student_id,
+                project_id=project_id,
+                faculty_id=faculty_id,
+                score=final_score,
+                final_score=final_score,
+                grade=final_grade
+            ))
+        else:
+            perf.score = final_score
+            perf.final_score = final_score
+            perf.grade = final_grade
+            perf.faculty_id = faculty_id # ensure faculty is set
+
+
 class GradeRequest(BaseModel):
     submission_id: int
     marks: int
@@ -669,91 +1181,36 @@ def grade_submission(
     if current_user["role"] != FACULTY:
         raise HTTPException(403, "Faculty only")
         
-    sub = db.query(TaskSubmission).filter(TaskSubmission.id == data.submission_id).first()
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if not task:
+        raise HTTPException(404, "Task not found")
+    # The counters use this task's max_marks, so the submission must belong to it
+    sub = db.query(TaskSubmission).filter(
+        TaskSubmission.id == data.submission_id,
+        TaskSubmission.task_id == task_id
+    ).first()
     if not sub:
-        raise HTTPException(404, "Submission not found")
+        raise HTTPException(404, "Submission not found for this task")
     
     # Update Submission
+    before = (sub.is_late, sub.status, sub.marks_obtained)
     sub.marks_obtained = data.marks
     sub.feedback = data.feedback
     sub.grade = data.grade
     sub.status = "graded"
     
+    record_submission_change(db, task, sub.student_id, before, (sub.is_late, sub.status, sub.marks_obtained))
+    invalidate_task_report(db, [task.id])
     db.commit() # Commit first to save task grade
     
     # --- PERFORMANCE SYNC ---
-    task = db.query(Task).filter(Task.id == task_id).first()
-    project_id = task.project_id
-    student_id = sub.student_id
-    faculty_id = current_user["user_id"]
-    
-    # 1. Calculate Average Score for this Student in this Project
-    # Get all submitted & graded tasks for this project
-    all_submissions = db.query(TaskSubmission).join(Task).filter(
-        Task.project_id == project_id,
-        TaskSubmission.student_id == student_id,
-        TaskSubmission.status == "graded"
-    ).all()
-    
-    marks_list = []
-    max_list = []
-    
-    for s in all_submissions:
-        # We need to find the max marks for each task. 
-        # Since we joined Task, we can access it if relationship exists, 
-        # but here we might need to query or assume eager load.
-        # Let's fetch the task for each submission to be safe or map it.
-        t = db.query(Task).filter(Task.id == s.task_id).first()
-        if t and s.marks_obtained is not None:
-            marks_list.append(float(s.marks_obtained))
-            max_list.append(float(getattr(t, "max_marks", 100) or 100))
-            
-    total_marks: float = sum(marks_list)
-    total_max: float = sum(max_list)
-            
-    # Calculate Percentage/Score
-    final_score = 0.0
-    _tmax = float(total_max)
-    _tmarks = float(total_marks)
-    if _tmax > 0.0:
-        final_score = (_tmarks / _tmax) * 100.0
-        
-    # Determine Grade
-    final_grade = "F"
-    if final_score >= 90: final_grade = "A+"
-    elif final_score >= 80: final_grade = "A"
-    elif final_score >= 70: final_grade = "B"
-    elif final_score >= 60: final_grade = "C"
-    elif final_score >= 50: final_grade = "D"
-    
-    # 2. Update StudentPerformance Table
-    perf = db.query(StudentPerformance).filter(
-        StudentPerformance.student_id == student_id,
-        StudentPerformance.project_id == project_id
-    ).first()
-    
-    if not perf:
-        perf = StudentPerformance(
-            student_id=student_id,
-            project_id=project_id,
-            faculty_id=faculty_id,
-            score=final_score,
-            final_score=final_score,
-            grade=final_grade
-        )
-        db.add(perf)
-    else:
-        perf.score = final_score
-        perf.final_score = final_score
-        perf.grade = final_grade
-        perf.faculty_id = faculty_id # ensure faculty is set
-        
+    _sync_project_performance(db, task.project_id, [sub.student_id], current_user["user_id"])
     db.commit()
 
     # Notify student
     add_notification(
         db, 
-        user_id=student_id, 
+        user_id=sub.student_id, 
         title="Mission Evaluation Complete", 
         message=f"Faculty evaluator has graded mission '{task.title}'. Grade: {data.grade}", 
         type="task"
@@ -761,17 +1218,90 @@ def grade_submission(
     
     return {"message": "Graded successfully and performance updated"}
 
+
+class BulkGradeRequest(BaseModel):
+    grades: List[GradeRequest]
+
+
+@router.post("/{task_id}/grade/bulk")
+def grade_submissions_bulk(
+    task_id: int,
+    data: BulkGradeRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Grades many submissions of one task in a single transaction: performance is recomputed
+    once per affected student and the notifications go out as one batch insert.
+    """
+    if current_user["role"] != FACULTY:
+        raise HTTPException(403, "Faculty only")
+    if not data.grades:
+        raise HTTPException(400, "No grades given")
+
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if not task:
+        raise HTTPException(404, "Task not found")
+    if task.faculty_id != current_user["user_id"]:
+        raise HTTPException(403, "Not your task")
+
+    entries = {entry.submission_id: entry for entry in data.grades}
+    if len(entries) != len(data.grades):
+        raise HTTPException(400, "Each submission can only be graded once per request")
+    submissions = db.query(TaskSubmission).filter(
+        TaskSubmission.task_id == task_id,
+        TaskSubmission.id.in_(list(entries))
+    ).all()
+    missing = sorted(set(entries) - {sub.id for sub in submissions})
+    if missing:
+        raise HTTPException(404, {"message": "Submissions not found for this task", "submission_ids": missing})
+
+    for sub in submissions:
+        entry = entries[sub.id]
+        before = (sub.is_late, sub.status, sub.marks_obtained)
+        sub.marks_obtained = entry.marks
+        sub.feedback = entry.feedback
+        sub.grade = entry.grade
+        sub.status = "graded"
+        record_submission_change(db, task, sub.student_id, before, (sub.is_late, sub.status, sub.marks_obtained))
+    invalidate_task_report(db, [task.id])
+    db.flush()
+
+    _sync_project_performance(db, task.project_id, [sub.student_id for sub in submissions], current_user["user_id"])
+    db.execute(insert(Notification), [
+        {
+            "user_id": sub.student_id,
+            "title": "Mission Evaluation Complete",
+            "message": f"Faculty evaluator has graded mission '{task.title}'. Grade: {sub.grade}",
+            "type": "task",
+            "is_read": False,
+            "created_at": datetime.utcnow(),
+        }
+        for sub in submissions
+    ])
+    db.commit()
+
+    return {"message": "Graded successfully and performance updated", "graded": len(submissions)}
+
 # =========================
 # GET SUBMISSIONS FOR TASK
 # =========================
 @router.get("/{task_id}/submissions", response_model=List[TaskSubmissionResponse])
 def get_task_submissions(
     task_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (all submissions when omitted)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
+    """
+    The task's submissions, including the pending placeholders created for every target
+    student when the task is published, ordered by id and paged with `limit` + `cursor`.
+    """
     if current_user["role"] != FACULTY:
         raise HTTPException(403, "Faculty only")
+    after = decode_cursor(cursor, int) if cursor else None
     
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
@@ -780,31 +1310,18 @@ def get_task_submissions(
     if task.faculty_id != current_user["user_id"]:
         raise HTTPException(403, "Not your task")
 
-    # Discover target student IDs dynamically based on the mission context
-    from models.group import GroupMember
-    target_ids = []
-    if task.student_id:
-        target_ids.append(task.student_id)
-    elif task.group_id:
-        g_members = db.query(GroupMember).filter(GroupMember.group_id == task.group_id).all()
-        target_ids.extend([m.student_id for m in g_members])
-
-    # Instantiate missing submissions (stubbing) for offline evaluation workflows
-    existing_submissions = db.query(TaskSubmission.student_id).filter(TaskSubmission.task_id == task_id).all()
-    existing_ids = {s.student_id for s in existing_submissions}
-
-    for sid in set(target_ids) - existing_ids:
-        db.add(TaskSubmission(
-            task_id=task_id,
-            student_id=sid,
-            submission_text="",
-            status="pending_submission",
-            is_late=False
-        ))
-    if len(set(target_ids) - existing_ids) > 0:
-        db.commit()
-
-    submissions = db.query(TaskSubmission).options(joinedload(TaskSubmission.student)).filter(TaskSubmission.task_id == task_id).all()
+    query = db.query(TaskSubmission).options(
+        joinedload(TaskSubmission.student).load_only(User.name, User.email)
+    ).filter(TaskSubmission.task_id == task_id)
+    if after:
+        query = query.filter(TaskSubmission.id > after[0])
+    query = query.order_by(TaskSubmission.id)
+    if limit:
+        query = query.limit(limit + 1)
+    submissions = query.all()
+    if limit and len(submissions) > limit:
+        submissions = submissions[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(submissions[-1].id)
     
     return [
         {
@@ -815,7 +1332,6 @@ def get_task_submissions(
             "status": s.status,
             "is_late": s.is_late or False,
             "file_url": s.file_url,
-            "submission_text": s.submission_text,
             "marks": s.marks_obtained,
             "grade": s.grade,
             "feedback": s.feedback,
@@ -849,27 +1365,42 @@ def close_task(
         task.closed_at = datetime.utcnow()
     except Exception:
         pass
-    db.commit()
-    
-    from models.group import GroupMember
-    target_ids = []
+    # Closing moves no ATM counter by itself; re-derive the targets' rows on next read
+    invalidate_task_targets(db, task)
+    invalidate_task_report(db, [task.id])
+
+    # Notify the targets (the student, or every group member) in one INSERT ... SELECT
     if task.student_id:
-        target_ids.append(task.student_id)
-    elif task.group_id:
-        g_members = db.query(GroupMember).filter(GroupMember.group_id == task.group_id).all()
-        target_ids.extend([m.student_id for m in g_members])
-        
-    for sid in set(target_ids):
-        add_notification(db, user_id=sid, title="Mission Closed", message=f"Faculty has formally closed mission '{task.title}'.", type="task")
+        target_ids = select(User.id).where(User.id == task.student_id)
+    else:
+        target_ids = select(GroupMember.student_id).where(GroupMember.group_id == task.group_id).distinct()
+    db.execute(insert(Notification).from_select(
+        ["user_id", "title", "message", "type", "is_read", "created_at"],
+        select(
+            target_ids.subquery().c[0],
+            literal("Mission Closed"),
+            literal(f"Faculty has formally closed mission '{task.title}'."),
+            literal("task"),
+            literal(False),
+            literal(datetime.utcnow()),
+        ),
+    ))
+    db.commit()
         
     return {"message": "Task closed successfully", "closed_at": getattr(task, "closed_at", None)}
 
 @router.get("/{task_id}/report")
 def get_task_report(
     task_id: int,
+    include_participants: bool = Query(True, description="Set false for the cached statistics only"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
+    """
+    Task report: `stats` (counts, marks mean/median/stddev/min/max, grade histogram,
+    late ratio, submission timing) come from the per-task cache, recomputed with SQL
+    aggregates only after the submissions change. `participants` lists every row.
+    """
     role = current_user["role"].lower()
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
@@ -885,8 +1416,6 @@ def get_task_report(
     elif role != ADMIN.lower():
         raise HTTPException(403, "Unauthorized access")
 
-    submissions = db.query(TaskSubmission).options(joinedload(TaskSubmission.student)).filter(TaskSubmission.task_id == task_id).all()
-    
     report_data = {
         "task_id": task.id,
         "title": task.title,
@@ -897,29 +1426,43 @@ def get_task_report(
         "started_at": task.started_at,
         "closed_at": getattr(task, "closed_at", None),
         "is_shared": getattr(task, "is_report_shared", False),
+        "stats": get_task_report_stats(db, task),
         "participants": []
     }
-    
-    for s in submissions:
+    if not include_participants:
+        db.commit()  # read-only otherwise: keeps the stats if they were just cached
+        return report_data
+
+    rows = db.query(
+        TaskSubmission.student_id, TaskSubmission.status, TaskSubmission.submitted_at,
+        TaskSubmission.marks_obtained, TaskSubmission.grade, User.name, User.email,
+    ).outerjoin(User, User.id == TaskSubmission.student_id).filter(
+        TaskSubmission.task_id == task_id
+    ).order_by(TaskSubmission.id).all()
+
+    now = datetime.utcnow()
+    closed_at = getattr(task, "closed_at", None)
+    for s in rows:
         time_taken_seconds = 0
-        end_time = s.submitted_at or getattr(task, "closed_at", None)
+        end_time = s.submitted_at or closed_at
         
         if task.started_at and end_time:
             time_taken_seconds = int((end_time - task.started_at).total_seconds())
         elif task.started_at and not end_time and task.status != "closed":
-            time_taken_seconds = int((datetime.utcnow() - task.started_at).total_seconds())
+            time_taken_seconds = int((now - task.started_at).total_seconds())
 
         report_data["participants"].append({
             "student_id": s.student_id,
-            "student_name": s.student.name if s.student else "Unknown",
-            "student_email": s.student.email if s.student else "N/A",
+            "student_name": s.name or "Unknown",
+            "student_email": s.email or "N/A",
             "status": s.status,
             "submitted_at": s.submitted_at,
             "marks": s.marks_obtained,
             "grade": s.grade,
             "time_taken_seconds": max(0, time_taken_seconds)
         })
-        
+
+    db.commit()  # read-only otherwise: keeps the stats if they were just cached
     return report_data
 
 @router.get("/{task_id}/my-evaluation")
@@ -986,9 +1529,15 @@ def delete_faculty_task(
         raise HTTPException(403, "Not your task")
 
     # Clear referential downstream constraints before parent deletion
-    from models.task_comment import TaskComment
+    invalidate_task_targets(db, task)
+    invalidate_student_atm(db, db.query(TaskSubmission.student_id).filter(TaskSubmission.task_id == task_id))
+    release_blobs(db, [key for (key,) in db.query(TaskSubmission.file_key).filter(
+        TaskSubmission.task_id == task_id, TaskSubmission.file_key.isnot(None)
+    ).distinct()], datetime.utcnow())
     db.query(TaskSubmission).filter(TaskSubmission.task_id == task_id).delete(synchronize_session=False)
     db.query(TaskComment).filter(TaskComment.task_id == task_id).delete(synchronize_session=False)
+    cancel_task_jobs(db, [task_id])
+    invalidate_task_report(db, [task_id])
 
     db.delete(task)
     db.commit()
@@ -1042,7 +1591,6 @@ def get_task_timeline(
         })
         
     # 4. Comments
-    from models.task_comment import TaskComment
     comments = db.query(TaskComment).filter(TaskComment.task_id == task_id).all()
     for c in comments:
         user = db.query(User).filter(User.id == c.user_id).first()
@@ -1100,11 +1648,15 @@ def get_task_timeline(
 # =========================
 # LIST ALL (FOR ADMIN DASHBOARD)
 # =========================
-@router.get("", response_model=List[TaskResponse])
+@router.get("")
 def list_tasks_admin(
+    request: Request,
+    params: dict = Depends(task_list_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
+    """All tasks newest first (TaskResponse fields unless `fields` is given), filterable and paginated."""
     if current_user["role"] != ADMIN:
         raise HTTPException(403, "Admin only")
-    return db.query(Task).order_by(Task.created_at.desc()).all()
+    rows, next_cursor = _task_listing(db, params, ADMIN_TASK_LIST_FIELDS)
+    return etag_response(request, rows, {"X-Next-Cursor": next_cursor} if next_cursor else None)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from database import SessionLocal
+from database import get_db
 from models.todo import Todo
 from schemas.todo import TodoCreateRequest
 from utils.security import get_current_user
@@ -14,28 +14,6 @@ router = APIRouter(
 )
 
 
-# ---------------- DB Dependency ----------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-# ---------------- Helper Function ----------------
-def mark_overdue_todos(db: Session, student_id: int):
-    now = datetime.utcnow()
-
-    db.query(Todo).filter(
-        Todo.student_id == student_id,
-        Todo.status == "pending",
-        Todo.due_date < now
-    ).update({"status": "overdue"})
-
-    db.commit()
-
-
 # ---------------- CREATE TODO ----------------
 @router.post("/")
 def create_todo(
@@ -69,8 +47,7 @@ def view_todos(
     if current_user["role"] != "student":
         raise HTTPException(status_code=403, detail="Only students allowed")
 
-    mark_overdue_todos(db, current_user["user_id"])
-
+    # Past-due todos are flipped to "overdue" by the deadline scheduler
     return db.query(Todo).filter(
         Todo.student_id == current_user["user_id"]
     ).all()
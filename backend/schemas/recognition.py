@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List
+
+
+class WeightSimulationRequest(BaseModel):
+    # Each candidate maps SystemSettings weight keys (e.g. "weight_avg_score") to values;
+    # keys left out keep their current setting.
+    candidates: List[Dict[str, float]] = Field(..., min_length=1, max_length=200)
+    top_movers: int = Field(10, ge=0, le=100)
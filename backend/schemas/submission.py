@@ -4,3 +4,12 @@ from typing import Optional
 class TaskSubmitRequest(BaseModel):
     submission_text: str
     file_url: Optional[str] = None
+
+class UploadInitiateRequest(BaseModel):
+    file_name: Optional[str] = None
+    file_mime: Optional[str] = None
+    total_size: int
+    chunk_size: Optional[int] = None
+
+class UploadCompleteRequest(BaseModel):
+    submission_text: str
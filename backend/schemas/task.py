@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 class TaskCreateRequest(BaseModel):
     title: str
@@ -17,6 +17,25 @@ class TaskCreateRequest(BaseModel):
     file_url: Optional[str] = None
     late_penalty: Optional[float] = 0.0
 
+class TaskBulkCreateRequest(BaseModel):
+    """One individual task per targeted student: explicit `student_ids`, or every active
+    student matching all of the given cohort filters."""
+    title: str
+    description: Optional[str] = None
+    priority: Optional[str] = "medium"
+    deadline: datetime
+    project_id: int
+    max_marks: Optional[int] = 100
+    file_url: Optional[str] = None
+    late_penalty: Optional[float] = 0.0
+
+    # Targets
+    student_ids: Optional[List[int]] = None
+    course_id: Optional[int] = None
+    program_id: Optional[int] = None
+    department_id: Optional[int] = None
+    batch: Optional[str] = None
+
 class TaskUpdateRequest(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
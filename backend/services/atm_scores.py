@@ -0,0 +1,251 @@
+from sqlalchemy import select, insert, update, bindparam
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from models.student_atm_score import StudentAtmScore
+from models.group import GroupMember
+from services.atm_service import (
+    get_utc_now,
+    PLACEHOLDER_STATUS,
+    score_atm,
+    calculate_student_atm_counters,
+    calculate_bulk_atm_counters,
+)
+
+# Above this many ids we read/rebuild the whole table instead of binding an IN list
+IN_LIST_LIMIT = 500
+
+COUNTER_FIELDS = ("total_assigned_past", "total_submitted", "total_on_time", "total_graded", "sum_percentages")
+
+
+def _now():
+    return get_utc_now().replace(tzinfo=None)
+
+
+# Columns a read needs; read with Core so refreshes never go through stale ORM state
+_ROW_COLUMNS = (StudentAtmScore.student_id, StudentAtmScore.version, StudentAtmScore.valid_until) + tuple(
+    getattr(StudentAtmScore, field) for field in COUNTER_FIELDS
+)
+
+
+def _is_stale(row, now):
+    return row.valid_until is not None and row.valid_until <= now
+
+
+def _row_counters(row):
+    return {field: getattr(row, field) or 0 for field in COUNTER_FIELDS}
+
+
+def _store_counters(db: Session, refreshed):
+    """
+    Writes recomputed counters: `refreshed` is [(student_id, version read before
+    computing, counters)], version None for a missing row. Submissions and invalidations
+    bump the version, so a refresh computed before one of them loses the
+    compare-and-set and the row stays stale for the next read. Does not commit.
+    """
+    updates = [
+        {"sid": sid, "read_version": version, **counters}
+        for sid, version, counters in refreshed if version is not None
+    ]
+    if updates:
+        scores = StudentAtmScore.__table__
+        db.execute(
+            update(scores).where(
+                scores.c.student_id == bindparam("sid"),
+                scores.c.version == bindparam("read_version"),
+            ).values({field: bindparam(field) for field in (*COUNTER_FIELDS, "valid_until")}),
+            updates,
+        )
+    inserts = [
+        {"student_id": sid, "version": 0, **counters}
+        for sid, version, counters in refreshed if version is None
+    ]
+    if inserts:
+        try:
+            with db.begin_nested():
+                db.execute(insert(StudentAtmScore), inserts)
+        except IntegrityError:
+            # Some rows were materialized concurrently; keep theirs, add the rest
+            for row in inserts:
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(StudentAtmScore), [row])
+                except IntegrityError:
+                    pass
+
+
+def refresh_student_atm(db: Session, student_id: int):
+    """
+    Recomputes one student's row from `tasks` / `task_submissions` and returns its
+    counters. Does not commit.
+    """
+    version = db.execute(
+        select(StudentAtmScore.version).where(StudentAtmScore.student_id == student_id)
+    ).first()
+    counters = calculate_student_atm_counters(db, student_id)
+    _store_counters(db, [(student_id, version[0] if version else None, counters)])
+    return counters
+
+
+def get_student_atm(db: Session, student_id: int):
+    """
+    ATM metrics for one student: a primary-key lookup unless the row is missing or
+    stale. A rebuilt row is left for the caller to commit.
+    """
+    row = db.execute(select(*_ROW_COLUMNS).where(StudentAtmScore.student_id == student_id)).first()
+    if row is None or _is_stale(row, _now()):
+        return score_atm(**refresh_student_atm(db, student_id))
+    return score_atm(**_row_counters(row))
+
+
+def get_many_student_atm(db: Session, student_ids):
+    """
+    ATM metrics for many students ({student_id: metrics}), read in one query.
+    Missing or stale rows are rebuilt together with the bulk engine and left for the
+    caller to commit.
+    """
+    now = _now()
+    student_ids = list(student_ids)
+    query = select(*_ROW_COLUMNS)
+    if len(student_ids) <= IN_LIST_LIMIT:
+        query = query.where(StudentAtmScore.student_id.in_(student_ids))
+    rows = {row.student_id: row for row in db.execute(query)}
+
+    counters_by_student = {}
+    refresh_ids = []
+    for sid in student_ids:
+        row = rows.get(sid)
+        if row is None or _is_stale(row, now):
+            refresh_ids.append(sid)
+        else:
+            counters_by_student[sid] = _row_counters(row)
+    if refresh_ids:
+        fresh = calculate_bulk_atm_counters(db, refresh_ids if len(refresh_ids) <= IN_LIST_LIMIT else None)
+        refreshed = []
+        for sid in refresh_ids:
+            counters = fresh.get(sid) or _empty_counters()
+            counters_by_student[sid] = counters
+            refreshed.append((sid, rows[sid].version if sid in rows else None, counters))
+        _store_counters(db, refreshed)
+
+    return {sid: score_atm(**counters_by_student[sid]) for sid in student_ids}
+
+
+def _empty_counters():
+    return {field: 0 for field in COUNTER_FIELDS} | {"valid_until": None}
+
+
+def _is_submission(state):
+    """Whether a (is_late, status, marks_obtained) row state counts as a submission."""
+    return state is not None and state[1] != PLACEHOLDER_STATUS
+
+
+def _contribution(state, max_marks):
+    """Counter contribution of one submission row given as (is_late, status, marks_obtained)."""
+    if not _is_submission(state):
+        return {"total_submitted": 0, "total_on_time": 0, "total_graded": 0, "sum_percentages": 0}
+    is_late, status, marks_obtained = state
+    graded = marks_obtained is not None and status == "graded"
+    max_marks = max_marks or 100
+    return {
+        "total_submitted": 1,
+        "total_on_time": 0 if is_late else 1,
+        "total_graded": 1 if graded else 0,
+        "sum_percentages": marks_obtained / max_marks if graded and max_marks > 0 else 0,
+    }
+
+
+def record_submission_change(db: Session, task, student_id: int, before, after):
+    """
+    Applies one `task_submissions` row change to the student's counters.
+
+    `before` / `after` are (is_late, status, marks_obtained) tuples, or None when the
+    row did not exist; placeholder rows count like a missing row. Does not commit: the
+    caller's commit persists the counters together with the submission.
+    """
+    now = _now()
+    old = _contribution(before, task.max_marks)
+    new = _contribution(after, task.max_marks)
+    deltas = {
+        getattr(StudentAtmScore, field): getattr(StudentAtmScore, field) + (new[field] - old[field])
+        for field in ("total_submitted", "total_on_time", "total_graded", "sum_percentages")
+        if new[field] != old[field]
+    }
+
+    if not _is_submission(before) and _is_submission(after):
+        # A first submission makes the task count even before its deadline; assigned
+        # tasks whose deadline already passed are counted already (row is not stale).
+        assigned = task.student_id == student_id or (
+            task.group_id is not None and db.query(GroupMember.id).filter(
+                GroupMember.group_id == task.group_id,
+                GroupMember.student_id == student_id
+            ).first() is not None
+        )
+        if not (assigned and task.deadline < now):
+            deltas[StudentAtmScore.total_assigned_past] = StudentAtmScore.total_assigned_past + 1
+
+    if not deltas:
+        return
+    # Patch in SQL so concurrent writers don't lose increments. Missing or stale rows
+    # are not patched but marked, so a refresh computed before this change cannot
+    # store its counters over it; the next read rebuilds them from the committed data.
+    patched = db.query(StudentAtmScore).filter(
+        StudentAtmScore.student_id == student_id,
+        (StudentAtmScore.valid_until == None) | (StudentAtmScore.valid_until > now)
+    ).update({**deltas, StudentAtmScore.version: StudentAtmScore.version + 1}, synchronize_session=False)
+    if not patched:
+        _mark_stale(db, student_id, now)
+
+
+def _mark_stale(db: Session, student_id: int, now):
+    """Makes one student's row stale and bumps its version, inserting it if missing."""
+    for attempt in range(2):
+        if invalidate_student_atm(db, [student_id], now):
+            return
+        try:
+            with db.begin_nested():
+                db.execute(insert(StudentAtmScore).values(
+                    student_id=student_id, version=1, valid_until=now,
+                    **{field: 0 for field in COUNTER_FIELDS},
+                ))
+            return
+        except IntegrityError:
+            # A refresh inserted it meanwhile, possibly without this change: mark that row
+            if attempt:
+                raise
+
+
+def invalidate_student_atm(db: Session, student_ids=None, now=None):
+    """
+    Marks rows stale so the next read recomputes them, and bumps their version so a
+    refresh already in flight does not store over them. `student_ids` may be a list
+    or a subquery of student ids; None invalidates every row. Does not commit.
+    Returns the number of rows marked.
+    """
+    query = db.query(StudentAtmScore)
+    if student_ids is not None:
+        query = query.filter(StudentAtmScore.student_id.in_(student_ids))
+    return query.update(
+        {StudentAtmScore.valid_until: now or _now(), StudentAtmScore.version: StudentAtmScore.version + 1},
+        synchronize_session=False
+    )
+
+
+def invalidate_task_targets(db: Session, task):
+    """Invalidates the rows of the students a task is assigned to (student or group)."""
+    if task.student_id:
+        invalidate_student_atm(db, [task.student_id])
+    elif task.group_id:
+        invalidate_student_atm(
+            db, db.query(GroupMember.student_id).filter(GroupMember.group_id == task.group_id)
+        )
+
+
+def rebuild_atm_scores(db: Session):
+    """Recomputes the whole read model from scratch. Returns the number of rows written."""
+    counters_by_student = calculate_bulk_atm_counters(db)
+    db.query(StudentAtmScore).delete(synchronize_session=False)
+    db.bulk_insert_mappings(StudentAtmScore, [
+        {"student_id": sid, **counters} for sid, counters in counters_by_student.items()
+    ])
+    db.commit()
+    return len(counters_by_student)
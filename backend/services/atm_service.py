@@ -0,0 +1,228 @@
+from sqlalchemy.orm import Session
+from models.task import Task
+from models.task_submission import TaskSubmission
+from models.group import GroupMember
+from datetime import datetime, timezone
+
+
+# Status of the rows created for every target when a task is published; not a submission
+PLACEHOLDER_STATUS = "pending_submission"
+
+
+def get_utc_now():
+    return datetime.now(timezone.utc)
+
+
+def empty_atm_metrics():
+    return {
+        "atm_score": 0,
+        "quality_score": 0,
+        "timeliness_score": 0,
+        "completion_score": 0,
+        "total_assigned_past": 0,
+        "total_submitted": 0,
+        "total_graded": 0,
+        "average_percentage": 0
+    }
+
+
+def score_atm(total_assigned_past: int, total_submitted: int, total_on_time: int,
+              total_graded: int, sum_percentages: float, **_):
+    """
+    Turns the raw ATM counters into the 100-point ATM (Academic Task Metric) Score.
+    - 60% Task Quality (marks_obtained / max_marks)
+    - 20% Timeliness (submitted before deadline)
+    - 20% Completion Drive (submitted / total assigned past deadline)
+    """
+    if total_assigned_past == 0:
+        # No applicable tasks to evaluate yet
+        return empty_atm_metrics()
+
+    # Calculate Completion Drive (20 points max)
+    completion_ratio = min(total_submitted / total_assigned_past, 1.0)
+    completion_score = completion_ratio * 20
+
+    # Calculate Timeliness (20 points max)
+    # Based on the ratio of ON-TIME submissions vs TOTAL SUBMITTED
+    timeliness_ratio = 1.0
+    if total_submitted > 0:
+        timeliness_ratio = total_on_time / total_submitted
+    timeliness_score = timeliness_ratio * 20
+
+    # Calculate Quality (60 points max)
+    quality_ratio = 0
+    average_percentage = 0
+    if total_graded > 0:
+        quality_ratio = sum_percentages / total_graded
+        average_percentage = quality_ratio * 100
+
+    quality_score = quality_ratio * 60
+
+    # Final ATM Score
+    atm_score = round(quality_score + timeliness_score + completion_score, 1)
+
+    return {
+        "atm_score": atm_score,
+        "quality_score": round(quality_score, 1),
+        "timeliness_score": round(timeliness_score, 1),
+        "completion_score": round(completion_score, 1),
+        "total_assigned_past": total_assigned_past,
+        "total_submitted": total_submitted,
+        "total_graded": total_graded,
+        "average_percentage": round(average_percentage, 1)
+    }
+
+
+def reduce_atm_counters(tasks: dict, assigned_task_ids: set, submissions: list, now: datetime):
+    """
+    Reduces one student's tasks and submissions to the raw ATM counters.
+
+    `tasks` maps task_id -> (deadline, max_marks) and must contain every task in
+    `assigned_task_ids` plus every task the student submitted to (when it still exists).
+    `submissions` is the student's submissions ordered by id, as
+    (task_id, is_late, status, marks_obtained) tuples; placeholders are ignored.
+
+    `valid_until` is the earliest future deadline of an unsubmitted task, i.e. the
+    moment `total_assigned_past` would change without any write happening.
+    """
+    submissions = [sub for sub in submissions if sub[2] != PLACEHOLDER_STATUS]
+    submitted_task_ids = {sub[0] for sub in submissions}
+
+    # Tasks they submitted count as assigned (global tasks without explicit student/group linkage)
+    candidate_ids = assigned_task_ids | {tid for tid in submitted_task_ids if tid in tasks}
+
+    # We only penalize them for completion/timeliness if the deadline has passed OR they already submitted it.
+    total_assigned_past = 0
+    valid_until = None
+    for tid in candidate_ids:
+        deadline = tasks[tid][0]
+        if deadline < now or tid in submitted_task_ids:
+            total_assigned_past += 1
+        elif valid_until is None or deadline < valid_until:
+            valid_until = deadline
+
+    total_submitted = len(submissions)
+    total_on_time = sum(1 for sub in submissions if not sub[1])
+
+    total_graded = 0
+    sum_percentages = 0
+    for task_id, _is_late, status, marks_obtained in submissions:
+        if marks_obtained is None or status != 'graded':
+            continue
+        total_graded += 1
+        task = tasks.get(task_id)
+        max_marks = task[1] if task and task[1] else 100
+        if max_marks > 0:
+            sum_percentages += marks_obtained / max_marks
+
+    return {
+        "total_assigned_past": total_assigned_past,
+        "total_submitted": total_submitted,
+        "total_on_time": total_on_time,
+        "total_graded": total_graded,
+        "sum_percentages": sum_percentages,
+        "valid_until": valid_until
+    }
+
+
+def calculate_student_atm_counters(db: Session, student_id: int):
+    """Raw ATM counters for a single student, see `reduce_atm_counters`."""
+    now = get_utc_now().replace(tzinfo=None)
+
+    # All tasks assigned directly to the student
+    assigned_tasks = db.query(Task.id, Task.deadline, Task.max_marks).filter(Task.student_id == student_id).all()
+
+    # Gather Submissions early to discover tasks the student engaged in, e.g., global tasks
+    submissions = db.query(
+        TaskSubmission.task_id,
+        TaskSubmission.is_late,
+        TaskSubmission.status,
+        TaskSubmission.marks_obtained
+    ).filter(TaskSubmission.student_id == student_id).order_by(TaskSubmission.id).all()
+    submitted_task_ids = {sub.task_id for sub in submissions}
+
+    # Also fetch tasks assigned to any group the student is part of
+    group_ids = db.query(GroupMember.group_id).filter(GroupMember.student_id == student_id)
+    assigned_tasks.extend(
+        db.query(Task.id, Task.deadline, Task.max_marks).filter(Task.group_id.in_(group_ids)).all()
+    )
+    assigned_task_ids = {t.id for t in assigned_tasks}
+
+    # Add tasks they submitted (which might be global tasks without explicit student/group linkage)
+    missing_sub_task_ids = [tid for tid in submitted_task_ids if tid not in assigned_task_ids]
+    if missing_sub_task_ids:
+        assigned_tasks.extend(
+            db.query(Task.id, Task.deadline, Task.max_marks).filter(Task.id.in_(missing_sub_task_ids)).all()
+        )
+
+    tasks = {t.id: (t.deadline, t.max_marks) for t in assigned_tasks}
+    return reduce_atm_counters(tasks, assigned_task_ids, [tuple(sub) for sub in submissions], now)
+
+
+def calculate_bulk_atm_counters(db: Session, student_ids=None):
+    """
+    Set-based counterpart of `calculate_student_atm_counters`.
+
+    Loads tasks, group memberships and submissions with three bulk queries (no BLOB
+    columns) and reduces them per student in Python, instead of 4-5 queries per
+    student. Returns {student_id: counters} for `student_ids` (or every student with
+    any task linkage when omitted).
+    """
+    now = get_utc_now().replace(tzinfo=None)
+
+    tasks = {}
+    direct_tasks = {}
+    group_tasks = {}
+    for task_id, student_id, group_id, deadline, max_marks in db.query(
+        Task.id, Task.student_id, Task.group_id, Task.deadline, Task.max_marks
+    ):
+        tasks[task_id] = (deadline, max_marks)
+        if student_id is not None:
+            direct_tasks.setdefault(student_id, set()).add(task_id)
+        if group_id is not None:
+            group_tasks.setdefault(group_id, set()).add(task_id)
+
+    member_query = db.query(GroupMember.student_id, GroupMember.group_id)
+    sub_query = db.query(
+        TaskSubmission.student_id,
+        TaskSubmission.task_id,
+        TaskSubmission.is_late,
+        TaskSubmission.status,
+        TaskSubmission.marks_obtained
+    )
+    if student_ids is not None:
+        student_ids = list(student_ids)
+        member_query = member_query.filter(GroupMember.student_id.in_(student_ids))
+        sub_query = sub_query.filter(TaskSubmission.student_id.in_(student_ids))
+
+    assigned = {}
+    for student_id, sid_task_ids in direct_tasks.items():
+        assigned.setdefault(student_id, set()).update(sid_task_ids)
+    for student_id, group_id in member_query:
+        assigned.setdefault(student_id, set()).update(group_tasks.get(group_id, ()))
+
+    submissions = {}
+    for student_id, task_id, is_late, status, marks_obtained in sub_query.order_by(TaskSubmission.id):
+        submissions.setdefault(student_id, []).append((task_id, is_late, status, marks_obtained))
+
+    if student_ids is None:
+        student_ids = set(assigned) | set(submissions)
+
+    results = {}
+    for student_id in student_ids:
+        counters = reduce_atm_counters(
+            tasks, assigned.get(student_id, set()), submissions.get(student_id, []), now
+        )
+        results[student_id] = counters
+    return results
+
+
+def calculate_bulk_atm(db: Session, student_ids=None):
+    """
+    Returns {student_id: metrics} for a whole cohort; output matches
+    `calculate_student_atm` exactly.
+    """
+    return {
+        student_id: score_atm(**counters)
+        for student_id, counters in calculate_bulk_atm_counters(db, student_ids).items()
+    }
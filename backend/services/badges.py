@@ -0,0 +1,21 @@
+"""
+Recognition badge rules: who is eligible and which badge a performance score earns.
+Shared by routers/recognition.py, which awards them, and the weight simulator.
+"""
+
+# Lowest score that is eligible for recognition at all
+ELIGIBILITY_THRESHOLD = 50
+
+# (badge, lowest score), best first; eligible scores below all of them earn "participation"
+BADGE_THRESHOLDS = (("gold", 90), ("silver", 80), ("bronze", 70))
+
+
+def is_eligible(score) -> bool:
+    return score >= ELIGIBILITY_THRESHOLD
+
+
+def recommend_badge(score) -> str:
+    for badge, lowest in BADGE_THRESHOLDS:
+        if score >= lowest:
+            return badge
+    return "participation"
@@ -0,0 +1,62 @@
+"""
+Deferred garbage collection for the content-addressed blob store.
+
+Deleting a blob as soon as its last row goes away races with uploads: a concurrent
+put of the same content dedups onto the existing key and its row commits after the
+reference check. So releases are only recorded (`release_blobs`) and the scheduler
+collects them later (`collect_released_blobs`). A blob is deleted only if, after
+BLOB_GC_GRACE, no row references it and it was not touched by a deduplicating put
+in that window (see `BlobStore.delete_if_idle`).
+"""
+import os
+from datetime import timedelta
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.released_blob import ReleasedBlob
+from models.task_submission import TaskSubmission
+from services.blob_store import get_blob_store
+
+BLOB_GC_GRACE = timedelta(minutes=int(os.getenv("BLOB_GC_GRACE_MINUTES", "60")))
+GC_BATCH_SIZE = 500
+
+
+def release_blobs(db: Session, keys, now):
+    """Queues blob keys whose reference went away for collection. Does not commit."""
+    keys = {key for key in keys if key}
+    if not keys:
+        return
+    queued = {key for (key,) in db.query(ReleasedBlob.key).filter(ReleasedBlob.key.in_(keys))}
+    for key in keys - queued:
+        try:
+            with db.begin_nested():
+                db.add(ReleasedBlob(key=key, released_at=now))
+        except IntegrityError:
+            # Released concurrently; one queue entry is enough
+            pass
+
+
+def collect_released_blobs(db: Session, now):
+    """
+    Deletes up to GC_BATCH_SIZE released blobs past the grace period that nothing
+    references any more. Commits; returns the number of blobs deleted.
+    """
+    keys = [key for (key,) in db.query(ReleasedBlob.key).filter(
+        ReleasedBlob.released_at <= now - BLOB_GC_GRACE
+    ).order_by(ReleasedBlob.released_at).limit(GC_BATCH_SIZE)]
+    if not keys:
+        return 0
+    referenced = {key for (key,) in db.query(TaskSubmission.file_key).filter(
+        TaskSubmission.file_key.in_(keys)
+    ).distinct()}
+
+    store = get_blob_store()
+    deleted = 0
+    for key in keys:
+        if key not in referenced and store.delete_if_idle(key, BLOB_GC_GRACE.total_seconds()):
+            deleted += 1
+    # Referenced or recently touched blobs are live again; a later release re-queues them
+    db.query(ReleasedBlob).filter(ReleasedBlob.key.in_(keys)).delete(synchronize_session=False)
+    db.commit()
+    return deleted
@@ -0,0 +1,473 @@
+"""
+Content-addressed storage for uploaded files.
+
+Blobs are keyed by the SHA-256 of their content, so identical uploads are stored
+once and rows only keep the key. The backend is chosen with BLOB_STORE (only
+"local" ships today; register others in BLOB_STORES) and the local store lives in
+BLOB_STORE_DIR, outside the publicly served uploads/ directory.
+
+Blobs are compressed at rest when their MIME type is worth it (lzma for text,
+zlib for uncompressed document formats, nothing for images, archives and
+Office Open XML, which are compressed already); readers always get the
+original bytes, decompressed as they are streamed. Compressed blobs are cut into
+independently compressed FRAME_SIZE frames with an offset index, so a Range read
+decodes only the frames it overlaps. BLOB_COMPRESSION=0 disables compression.
+"""
+import hashlib
+import io
+import lzma
+import os
+import shutil
+import tempfile
+import time
+import zlib
+
+BLOB_STORE = os.getenv("BLOB_STORE", "local")
+BLOB_STORE_DIR = os.getenv(
+    "BLOB_STORE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "storage", "blobs")
+)
+BLOB_COMPRESSION = os.getenv("BLOB_COMPRESSION", "1").lower() in ("1", "true", "yes")
+CHUNK_SIZE = 1024 * 1024
+# Original bytes per independently compressed frame: the most a seek has to decode
+FRAME_SIZE = 1024 * 1024
+
+# Codec per MIME type; anything not listed is stored as is
+LZMA_TYPES = {
+    "application/json", "application/xml", "application/javascript", "application/x-ipynb+json",
+    "application/x-tex", "application/x-sh", "application/sql",
+}
+ZLIB_TYPES = {
+    "application/pdf", "application/msword", "application/rtf", "application/vnd.ms-excel",
+    "application/vnd.ms-powerpoint", "application/postscript", "image/bmp", "image/tiff", "image/svg+xml",
+}
+
+
+def codec_for(mime_type):
+    """'lzma', 'zlib' or 'none' for a MIME type such as 'text/plain; charset=utf-8'."""
+    if not BLOB_COMPRESSION or not mime_type:
+        return "none"
+    mime_type = mime_type.split(";")[0].strip().lower()
+    if mime_type.startswith("text/") or mime_type in LZMA_TYPES:
+        return "lzma"
+    if mime_type in ZLIB_TYPES:
+        return "zlib"
+    return "none"
+
+
+def _compressor(codec):
+    if codec == "zlib":
+        return zlib.compressobj(6)
+    return lzma.LZMACompressor(preset=6)
+
+
+def _decompressor(codec):
+    if codec == "zlib":
+        return zlib.decompressobj()
+    return lzma.LZMADecompressor()
+
+
+class _FramedReader:
+    """
+    Read-only, seekable file object over a framed compressed blob. `offsets` are the
+    stored start of each frame and `end` where the last one stops; only the current
+    frame is held decoded.
+    """
+
+    def __init__(self, raw, codec, size, frame_size, offsets, end):
+        self.raw = raw
+        self.codec = codec
+        self.size = size
+        self.frame_size = frame_size
+        self.offsets = offsets
+        self.end = end
+        self._frame_index = -1
+        self._frame = b""
+        self._position = 0
+
+    def _load(self, index):
+        start = self.offsets[index]
+        stop = self.offsets[index + 1] if index + 1 < len(self.offsets) else self.end
+        self.raw.seek(start)
+        self._frame = _decompressor(self.codec).decompress(self.raw.read(stop - start), self.frame_size)
+        self._frame_index = index
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.size - self._position
+        size = min(size, self.size - self._position)
+        parts = []
+        while size > 0:
+            index, within = divmod(self._position, self.frame_size)
+            if index != self._frame_index:
+                self._load(index)
+            part = self._frame[within:within + size]
+            if not part:
+                break
+            parts.append(part)
+            self._position += len(part)
+            size -= len(part)
+        return b"".join(parts)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._position = max(0, min(offset, self.size))
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _PartsReader:
+    """File-like view of an upload's staged parts read back to back."""
+
+    def __init__(self, store, upload_id, count):
+        self.store = store
+        self.upload_id = upload_id
+        self.count = count
+        self.index = 0
+        self.current = None
+
+    def read(self, size=-1):
+        while self.index < self.count:
+            if self.current is None:
+                self.current = self.store.open_part(self.upload_id, self.index)
+            chunk = self.current.read(size)
+            if chunk:
+                return chunk
+            self.current.close()
+            self.current = None
+            self.index += 1
+        return b""
+
+
+class BlobStore:
+    """Interface for blob backends. Keys are lowercase hex SHA-256 digests."""
+
+    def put(self, stream, mime_type=None):
+        """
+        Stores everything read from the file-like `stream`, compressed as `codec_for(mime_type)`
+        says; returns (key, size) where size is the original length.
+        """
+        raise NotImplementedError
+
+    def put_bytes(self, data: bytes, mime_type=None):
+        return self.put(io.BytesIO(data), mime_type)
+
+    def info(self, key: str):
+        """(codec, stored_size) of a blob as kept at rest."""
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    def open(self, key: str):
+        """Binary file object positioned at the start of the blob."""
+        raise NotImplementedError
+
+    def iter_chunks(self, key: str, chunk_size: int = CHUNK_SIZE):
+        with self.open(key) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def iter_range(self, key: str, start: int, length: int, chunk_size: int = CHUNK_SIZE):
+        """Yields `length` bytes from offset `start`, reading only that span."""
+        with self.open(key) as f:
+            f.seek(start)
+            while length > 0:
+                chunk = f.read(min(chunk_size, length))
+                if not chunk:
+                    break
+                length -= len(chunk)
+                yield chunk
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def delete_if_idle(self, key: str, idle_seconds: float) -> bool:
+        """
+        Deletes a blob unless a put wrote or deduplicated onto it within `idle_seconds`;
+        returns whether it was deleted. Used by the deferred GC (services/blob_gc.py).
+        """
+        raise NotImplementedError
+
+    # Resumable uploads: numbered parts are staged per upload id, then assembled into one blob
+
+    def put_part(self, upload_id: str, index: int, stream) -> int:
+        """Stages part `index` of an upload (replacing any earlier attempt); returns its size."""
+        raise NotImplementedError
+
+    def part_indexes(self, upload_id: str):
+        raise NotImplementedError
+
+    def open_part(self, upload_id: str, index: int):
+        raise NotImplementedError
+
+    def part_size(self, upload_id: str, index: int) -> int:
+        raise NotImplementedError
+
+    def discard_parts(self, upload_id: str):
+        raise NotImplementedError
+
+    def assemble(self, upload_id: str, count: int, mime_type=None):
+        """Stores parts 0..count-1 concatenated as one blob and discards them; returns (key, size)."""
+        parts = _PartsReader(self, upload_id, count)
+        try:
+            result = self.put(parts, mime_type)
+        finally:
+            if parts.current is not None:
+                parts.current.close()
+        self.discard_parts(upload_id)
+        return result
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Blobs as files under root/ab/cd/<key>, written to a temp file and renamed into place.
+    Compressed blobs are <key>.z: a header (magic, codec, original size, frame size,
+    index offset), the frames, then the index of frame offsets.
+    """
+    MAGIC = b"ATMF"
+    CODEC_MARKERS = {"zlib": b"Z", "lzma": b"X"}
+    HEADER = len(MAGIC) + 1 + 8 + 4 + 8
+
+    def __init__(self, root: str):
+        self.root = root
+        self._tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self._tmp_dir, exist_ok=True)
+
+    def path(self, key: str):
+        if len(key) != 64 or any(c not in "0123456789abcdef" for c in key):
+            raise ValueError(f"Invalid blob key: {key!r}")
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def _read_header(self, f):
+        """(codec, size, frame_size, index_offset) of a compressed blob."""
+        header = f.read(self.HEADER)
+        if len(header) != self.HEADER or not header.startswith(self.MAGIC):
+            raise ValueError(f"Corrupt compressed blob {f.name}")
+        codec = {marker: name for name, marker in self.CODEC_MARKERS.items()}[header[4:5]]
+        return (
+            codec,
+            int.from_bytes(header[5:13], "big"),
+            int.from_bytes(header[13:17], "big"),
+            int.from_bytes(header[17:25], "big"),
+        )
+
+    def _reader(self, f):
+        """Decompressing reader over an open compressed blob `f`."""
+        codec, size, frame_size, index_offset = self._read_header(f)
+        f.seek(index_offset)
+        index = f.read(8 * -(-size // frame_size))
+        offsets = [int.from_bytes(index[i:i + 8], "big") for i in range(0, len(index), 8)]
+        return _FramedReader(f, codec, size, frame_size, offsets, index_offset)
+
+    def _write(self, stream, out, codec):
+        """Copies `stream` to `out` (framed and compressed unless codec is 'none'); returns (key, size)."""
+        digest = hashlib.sha256()
+        size = 0
+        if codec == "none":
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+            return digest.hexdigest(), size
+
+        out.write(self.MAGIC + self.CODEC_MARKERS[codec] + bytes(8) + FRAME_SIZE.to_bytes(4, "big") + bytes(8))
+        offsets = []
+        pending = b""
+
+        def write_frame(frame):
+            offsets.append(out.tell())
+            compressor = _compressor(codec)
+            out.write(compressor.compress(frame) + compressor.flush())
+
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+            pending += chunk
+            while len(pending) >= FRAME_SIZE:
+                write_frame(pending[:FRAME_SIZE])
+                pending = pending[FRAME_SIZE:]
+        if pending:
+            write_frame(pending)
+        index_offset = out.tell()
+        out.write(b"".join(offset.to_bytes(8, "big") for offset in offsets))
+        out.seek(len(self.MAGIC) + 1)
+        out.write(size.to_bytes(8, "big"))
+        out.seek(len(self.MAGIC) + 1 + 8 + 4)
+        out.write(index_offset.to_bytes(8, "big"))
+        return digest.hexdigest(), size
+
+    def put(self, stream, mime_type=None):
+        codec = codec_for(mime_type)
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp_dir)
+        try:
+            with os.fdopen(fd, "w+b") as out:
+                key, size = self._write(stream, out, codec)
+                if codec != "none" and out.seek(0, io.SEEK_END) >= size:
+                    # Did not shrink: keep the original bytes instead
+                    out.seek(0)
+                    fd_raw, raw_path = tempfile.mkstemp(dir=self._tmp_dir)
+                    with os.fdopen(fd_raw, "wb") as raw_out:
+                        self._write(self._reader(out), raw_out, "none")
+                    os.replace(raw_path, tmp_path)
+                    codec = "none"
+            if self._touch(key):
+                # Same content already stored; the fresh mtime keeps the GC off it
+                os.remove(tmp_path)
+            else:
+                path = self.path(key) + (".z" if codec != "none" else "")
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+            return key, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def exists(self, key: str) -> bool:
+        path = self.path(key)
+        return os.path.exists(path) or os.path.exists(path + ".z")
+
+    def _touch(self, key: str) -> bool:
+        """Refreshes the blob's mtime; False when it is not stored (or was just collected)."""
+        touched = False
+        for path in (self.path(key), self.path(key) + ".z"):
+            try:
+                os.utime(path)
+                touched = True
+            except FileNotFoundError:
+                pass
+        return touched
+
+    def info(self, key: str):
+        path = self.path(key)
+        if os.path.exists(path + ".z"):
+            with open(path + ".z", "rb") as f:
+                codec = self._read_header(f)[0]
+            return codec, os.path.getsize(path + ".z")
+        return "none", os.path.getsize(path)
+
+    def size(self, key: str) -> int:
+        path = self.path(key)
+        if os.path.exists(path + ".z"):
+            with open(path + ".z", "rb") as f:
+                return self._read_header(f)[1]
+        return os.path.getsize(path)
+
+    def open(self, key: str):
+        path = self.path(key)
+        if os.path.exists(path + ".z"):
+            f = open(path + ".z", "rb")
+            try:
+                return self._reader(f)
+            except BaseException:
+                f.close()
+                raise
+        return open(path, "rb")
+
+    def delete(self, key: str):
+        for path in (self.path(key), self.path(key) + ".z"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def delete_if_idle(self, key: str, idle_seconds: float) -> bool:
+        deleted = False
+        for path in (self.path(key), self.path(key) + ".z"):
+            # Move it aside first: a put that touches the blob before the rename leaves a
+            # fresh mtime (so it is restored), one after the rename finds it missing and
+            # stores its own copy
+            trash = path + ".gc"
+            try:
+                os.replace(path, trash)
+            except FileNotFoundError:
+                continue
+            if time.time() - os.stat(trash).st_mtime < idle_seconds:
+                os.replace(trash, path)
+                return False
+            os.remove(trash)
+            deleted = True
+        return deleted
+
+    def _parts_dir(self, upload_id: str):
+        if not upload_id.isalnum():
+            raise ValueError(f"Invalid upload id: {upload_id!r}")
+        return os.path.join(self.root, "parts", upload_id)
+
+    def put_part(self, upload_id: str, index: int, stream) -> int:
+        parts_dir = self._parts_dir(upload_id)
+        os.makedirs(parts_dir, exist_ok=True)
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=parts_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    size += len(chunk)
+            # A retried part replaces the earlier attempt atomically
+            os.replace(tmp_path, os.path.join(parts_dir, f"{index:06d}.part"))
+            return size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def part_indexes(self, upload_id: str):
+        parts_dir = self._parts_dir(upload_id)
+        if not os.path.isdir(parts_dir):
+            return []
+        return sorted(int(name[:-5]) for name in os.listdir(parts_dir) if name.endswith(".part"))
+
+    def open_part(self, upload_id: str, index: int):
+        return open(os.path.join(self._parts_dir(upload_id), f"{index:06d}.part"), "rb")
+
+    def part_size(self, upload_id: str, index: int) -> int:
+        return os.path.getsize(os.path.join(self._parts_dir(upload_id), f"{index:06d}.part"))
+
+    def discard_parts(self, upload_id: str):
+        shutil.rmtree(self._parts_dir(upload_id), ignore_errors=True)
+
+
+BLOB_STORES = {
+    "local": lambda: LocalBlobStore(BLOB_STORE_DIR),
+}
+
+_store = None
+
+
+def get_blob_store() -> BlobStore:
+    global _store
+    if _store is None:
+        if BLOB_STORE not in BLOB_STORES:
+            raise RuntimeError(f"Unknown BLOB_STORE {BLOB_STORE!r}; expected one of {', '.join(BLOB_STORES)}")
+        _store = BLOB_STORES[BLOB_STORE]()
+    return _store
@@ -0,0 +1,50 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from models.code_sequence import CodeSequence
+from models.project import Project
+from models.academic_saas import DepartmentV1
+
+
+def task_code_prefix(db: Session, project_id: int):
+    """TASK_<department code>_ for the project's department, TASK_GEN_ without one."""
+    dept_code = db.query(DepartmentV1.code).join(Project, Project.department_id == DepartmentV1.id).filter(
+        Project.id == project_id
+    ).scalar()
+    return f"TASK_{str(dept_code).upper() if dept_code else 'GEN'}_"
+
+
+def format_code(prefix: str, value: int):
+    return f"{prefix}{value:03d}"
+
+
+def allocate_codes(db: Session, prefix: str, count: int = 1):
+    """
+    Reserves `count` consecutive numbers for `prefix` and returns the codes.
+
+    One UPDATE ... RETURNING (OUTPUT on SQL Server) bumps the counter atomically, so
+    concurrent callers never see the same numbers. The row stays locked until the
+    caller's transaction ends; a rollback leaves a gap, never a duplicate.
+    """
+    if count < 1:
+        return []
+    bump = (
+        update(CodeSequence)
+        .where(CodeSequence.prefix == prefix)
+        .values(last_value=CodeSequence.last_value + count)
+        .returning(CodeSequence.last_value)
+    )
+    last = db.execute(bump).scalar()
+    if last is None:
+        # First code for this prefix; a concurrent first insert loses and bumps instead
+        try:
+            with db.begin_nested():
+                db.add(CodeSequence(prefix=prefix, last_value=count))
+            last = count
+        except IntegrityError:
+            last = db.execute(bump).scalar()
+    return [format_code(prefix, value) for value in range(last - count + 1, last + 1)]
+
+
+def allocate_code(db: Session, prefix: str):
+    return allocate_codes(db, prefix, 1)[0]
@@ -0,0 +1,265 @@
+"""
+Deadline scheduler: reminders before task deadlines and overdue flips when they pass.
+
+Jobs live in `scheduled_jobs` so they survive restarts. Each worker runs one
+`DeadlineScheduler` thread that reloads the jobs due within the next poll window
+into a heap ordered by run_at, sleeps until the earliest one, then claims and
+runs every due job in batches: one UPDATE per batch of overdue tasks and one
+INSERT ... SELECT per batch of reminders. Claims are conditional UPDATEs, so
+several workers (or `python manage.py run-scheduler`) can run side by side.
+"""
+import heapq
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, insert, update, exists, literal, case, and_
+from sqlalchemy.orm import Session, aliased
+
+from database import SessionLocal
+from models.task import Task
+from models.todo import Todo
+from models.task_submission import TaskSubmission
+from models.notification import Notification
+from models.scheduled_job import ScheduledJob
+from services.submission_uploads import expire_stale_uploads
+from services.blob_gc import collect_released_blobs
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "1").lower() in ("1", "true", "yes")
+SCHEDULER_POLL_SECONDS = float(os.getenv("SCHEDULER_POLL_SECONDS", "60"))
+
+REMINDERS = {
+    "reminder_24h": (timedelta(hours=24), "24 hours"),
+    "reminder_1h": (timedelta(hours=1), "1 hour"),
+}
+# Only tasks still open for submission get reminders
+REMINDER_TASK_STATUSES = ["published", "in_progress"]
+BATCH_SIZE = 500
+MAX_ATTEMPTS = 3
+# A claim older than this belongs to a worker that died mid-run
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def schedule_deadline_jobs(db: Session, task_ids):
+    """
+    Replaces the pending jobs of `task_ids` (list or subquery) with reminders and an
+    overdue flip at their current deadlines, and recomputes is_overdue from those
+    deadlines. Call after creating a task or changing its deadline or status.
+    Does not commit.
+    """
+    now = datetime.utcnow()
+    cancel_task_jobs(db, task_ids)
+    db.query(Task).filter(Task.id.in_(task_ids)).update(
+        {Task.is_overdue: case((Task.deadline <= now, True), else_=False)}, synchronize_session=False
+    )
+
+    rows = []
+    for task_id, deadline, status in db.query(Task.id, Task.deadline, Task.status).filter(Task.id.in_(task_ids)):
+        if status in REMINDER_TASK_STATUSES:
+            for kind, (before, _) in REMINDERS.items():
+                if deadline - before > now:
+                    rows.append({"kind": kind, "task_id": task_id, "run_at": deadline - before})
+        if deadline > now:
+            rows.append({"kind": "overdue", "task_id": task_id, "run_at": deadline})
+    if rows:
+        db.execute(insert(ScheduledJob), [
+            {**row, "status": "pending", "attempts": 0, "created_at": now} for row in rows
+        ])
+    return len(rows)
+
+
+def cancel_task_jobs(db: Session, task_ids):
+    """Drops the pending jobs of `task_ids`. Does not commit."""
+    db.query(ScheduledJob).filter(
+        ScheduledJob.task_id.in_(task_ids), ScheduledJob.status == "pending"
+    ).delete(synchronize_session=False)
+
+
+# ---------------- Job handlers: one statement per batch ----------------
+
+def _flip_overdue(db: Session, task_ids, now):
+    db.query(Task).filter(
+        Task.id.in_(task_ids), Task.deadline <= now, Task.is_overdue == False
+    ).update({Task.is_overdue: True}, synchronize_session=False)
+
+
+def _send_reminders(label):
+    def send(db: Session, task_ids, now):
+        # Targets still on their placeholder, unless someone (e.g. a group member) already submitted
+        submitted = aliased(TaskSubmission)
+        db.execute(insert(Notification).from_select(
+            ["user_id", "title", "message", "type", "is_read", "created_at"],
+            select(
+                TaskSubmission.student_id,
+                literal("Mission Deadline Approaching"),
+                literal("Mission '") + Task.title + literal(f"' is due in {label}."),
+                literal("task"),
+                literal(False),
+                literal(now),
+            ).join(Task, Task.id == TaskSubmission.task_id).where(
+                TaskSubmission.task_id.in_(task_ids),
+                TaskSubmission.status == "pending_submission",
+                Task.status.in_(REMINDER_TASK_STATUSES),
+                Task.deadline > now,
+                ~exists().where(and_(
+                    submitted.task_id == TaskSubmission.task_id,
+                    submitted.status != "pending_submission",
+                )),
+            ),
+        ))
+    return send
+
+
+HANDLERS = {
+    "overdue": _flip_overdue,
+    **{kind: _send_reminders(label) for kind, (_, label) in REMINDERS.items()},
+}
+
+
+def sweep_overdue_todos(db: Session, now):
+    """Pending todos past their due date become 'overdue' in one UPDATE. Does not commit."""
+    return db.query(Todo).filter(
+        Todo.status == "pending", Todo.due_date < now
+    ).update({Todo.status: "overdue"}, synchronize_session=False)
+
+
+def run_due_jobs(db: Session, now=None, job_ids=None):
+    """
+    Claims up to BATCH_SIZE due jobs (optionally only `job_ids`) and runs them, one
+    handler call per kind. A failing kind is retried later, up to MAX_ATTEMPTS.
+    Returns the number of jobs claimed.
+    """
+    now = now or datetime.utcnow()
+    candidates = select(ScheduledJob.id).where(ScheduledJob.status == "pending", ScheduledJob.run_at <= now)
+    if job_ids is not None:
+        candidates = candidates.where(ScheduledJob.id.in_(job_ids))
+    ids = db.execute(candidates.order_by(ScheduledJob.run_at).limit(BATCH_SIZE)).scalars().all()
+    if not ids:
+        return 0
+
+    token = uuid.uuid4().hex
+    db.execute(update(ScheduledJob).where(ScheduledJob.id.in_(ids), ScheduledJob.status == "pending").values(
+        status="running", claimed_by=token, claimed_at=now, attempts=ScheduledJob.attempts + 1
+    ))
+    db.commit()
+    claimed = db.query(ScheduledJob.id, ScheduledJob.kind, ScheduledJob.task_id, ScheduledJob.attempts).filter(
+        ScheduledJob.claimed_by == token, ScheduledJob.status == "running"
+    ).all()
+
+    by_kind = defaultdict(list)
+    for job in claimed:
+        by_kind[job.kind].append(job)
+    for kind, jobs in by_kind.items():
+        job_ids_of_kind = [job.id for job in jobs]
+        try:
+            handler = HANDLERS.get(kind)
+            if handler is None:
+                raise ValueError(f"Unknown job kind {kind!r}")
+            handler(db, [job.task_id for job in jobs], now)
+            db.execute(update(ScheduledJob).where(ScheduledJob.id.in_(job_ids_of_kind)).values(
+                status="done", finished_at=datetime.utcnow()
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            error = f"{type(e).__name__}: {e}"[:500]
+            retry = [job.id for job in jobs if job.attempts < MAX_ATTEMPTS]
+            failed = [job.id for job in jobs if job.attempts >= MAX_ATTEMPTS]
+            if retry:
+                db.execute(update(ScheduledJob).where(ScheduledJob.id.in_(retry)).values(
+                    status="pending", claimed_by=None, last_error=error,
+                    run_at=datetime.utcnow() + timedelta(seconds=SCHEDULER_POLL_SECONDS),
+                ))
+            if failed:
+                db.execute(update(ScheduledJob).where(ScheduledJob.id.in_(failed)).values(
+                    status="failed", last_error=error, finished_at=datetime.utcnow()
+                ))
+            db.commit()
+            print(f"[scheduler] {kind} jobs failed: {error}")
+    return len(claimed)
+
+
+class DeadlineScheduler:
+    """Background thread running `scheduled_jobs` near their run_at (see module docstring)."""
+
+    def __init__(self, session_factory=SessionLocal, poll_seconds=SCHEDULER_POLL_SECONDS):
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self._heap = []
+        self._queued = set()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self.run_forever, name="deadline-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _refresh(self, db: Session, now):
+        """
+        Recovers stale claims, sweeps todos, discards expired upload sessions, collects
+        released blobs, and queues the jobs due before the next refresh.
+        """
+        db.execute(update(ScheduledJob).where(
+            ScheduledJob.status == "running", ScheduledJob.claimed_at < now - CLAIM_TIMEOUT
+        ).values(status="pending", claimed_by=None))
+        sweep_overdue_todos(db, now)
+        db.commit()
+        expire_stale_uploads(db, now)
+        collect_released_blobs(db, now)
+
+        horizon = now + timedelta(seconds=self.poll_seconds)
+        for job_id, run_at in db.query(ScheduledJob.id, ScheduledJob.run_at).filter(
+            ScheduledJob.status == "pending", ScheduledJob.run_at <= horizon
+        ).order_by(ScheduledJob.run_at):
+            if job_id not in self._queued:
+                self._queued.add(job_id)
+                heapq.heappush(self._heap, (run_at, job_id))
+
+    def tick(self, refresh=True):
+        """Optionally refreshes the heap, then runs every queued job already due; returns the number run."""
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            if refresh:
+                self._refresh(db, now)
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                _, job_id = heapq.heappop(self._heap)
+                self._queued.discard(job_id)
+                due.append(job_id)
+            ran = 0
+            for start in range(0, len(due), BATCH_SIZE):
+                ran += run_due_jobs(db, now, due[start:start + BATCH_SIZE])
+            return ran
+
+    def run_forever(self):
+        next_refresh = 0.0
+        while not self._stopping:
+            refresh = time.monotonic() >= next_refresh
+            try:
+                self.tick(refresh)
+            except Exception as e:
+                print(f"[scheduler] tick failed: {type(e).__name__}: {e}")
+            if refresh:
+                next_refresh = time.monotonic() + self.poll_seconds
+            # Sleep until the earliest queued job or the next refresh, whichever comes first
+            wait = max(next_refresh - time.monotonic(), 0)
+            if self._heap:
+                wait = min(wait, max((self._heap[0][0] - datetime.utcnow()).total_seconds(), 0))
+            self._wake.wait(wait)
+            self._wake.clear()
+
+
+scheduler = DeadlineScheduler()
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+from sqlalchemy import select, insert, delete, exists, literal, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.task import Task
+from models.group import GroupMember
+from models.task_submission import TaskSubmission
+from services.atm_scores import invalidate_student_atm
+from services.task_reports import invalidate_task_report
+
+# Tasks whose targets get a pending submission row to grade offline
+PLACEHOLDER_TASK_STATUSES = ["published", "in_progress"]
+
+
+def _targets(task_ids):
+    """(task_id, student_id) of every target: the task's student, or its group's members."""
+    return union_all(
+        select(Task.id.label("task_id"), Task.student_id.label("student_id")).where(
+            Task.id.in_(task_ids), Task.student_id.isnot(None)
+        ),
+        select(Task.id.label("task_id"), GroupMember.student_id.label("student_id")).join(
+            GroupMember, GroupMember.group_id == Task.group_id
+        ).where(Task.id.in_(task_ids), Task.student_id.is_(None)),
+    ).subquery()
+
+
+def _missing_targets(task_ids):
+    """(task_id, student_id) for every target of the tasks that has no submission row yet."""
+    targets = _targets(task_ids)
+    return select(targets.c.task_id, targets.c.student_id).distinct().where(
+        ~exists().where(
+            TaskSubmission.task_id == targets.c.task_id,
+            TaskSubmission.student_id == targets.c.student_id,
+        )
+    ).subquery()
+
+
+def create_submission_placeholders(db: Session, task_ids):
+    """
+    Adds a "pending_submission" row for each target student (task student or group
+    members) of `task_ids` that has none, as one INSERT ... SELECT. `task_ids` may be a
+    list or a subquery. The unique (task_id, student_id) index makes a concurrent run
+    fail instead of duplicating rows; it is retried once. Does not commit.
+    Returns the number of rows inserted.
+    """
+    for attempt in range(2):
+        missing = _missing_targets(task_ids)
+        placeholders = insert(TaskSubmission).from_select(
+            ["task_id", "student_id", "submission_text", "status", "is_late", "submitted_at"],
+            select(
+                missing.c.task_id, missing.c.student_id, literal(""), literal("pending_submission"),
+                literal(False), literal(datetime.utcnow()),
+            ),
+        )
+        try:
+            with db.begin_nested():
+                inserted = db.execute(placeholders).rowcount
+            break
+        except IntegrityError:
+            if attempt:
+                raise
+    if inserted:
+        invalidate_task_report(db, task_ids)
+        invalidate_student_atm(db, select(TaskSubmission.student_id).where(
+            TaskSubmission.task_id.in_(task_ids), TaskSubmission.status == "pending_submission"
+        ))
+    return inserted
+
+
+def delete_stale_placeholders(db: Session, task_ids):
+    """
+    Deletes the "pending_submission" rows of `task_ids` (list or subquery) whose student
+    is no longer a target, e.g. after the task moved to someone else or a member left
+    the group, so they stop getting reminders and counting in reports. Does not commit.
+    Returns the number of rows deleted.
+    """
+    targets = _targets(task_ids)
+    stale = db.execute(select(TaskSubmission.id, TaskSubmission.student_id).where(
+        TaskSubmission.task_id.in_(task_ids),
+        TaskSubmission.status == "pending_submission",
+        ~exists().where(
+            targets.c.task_id == TaskSubmission.task_id,
+            targets.c.student_id == TaskSubmission.student_id,
+        ),
+    )).all()
+    if not stale:
+        return 0
+    db.execute(delete(TaskSubmission).where(TaskSubmission.id.in_([row.id for row in stale])))
+    invalidate_task_report(db, task_ids)
+    invalidate_student_atm(db, list({row.student_id for row in stale}))
+    return len(stale)
@@ -0,0 +1,56 @@
+"""
+Settings and housekeeping for resumable submission uploads (routers/task.py).
+
+Sessions expire UPLOAD_SESSION_TTL after they start; the deadline scheduler calls
+`expire_stale_uploads` on every poll to discard the staged parts of expired or
+abandoned sessions.
+"""
+import os
+from datetime import timedelta
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from models.submission_upload import SubmissionUpload
+from services.blob_store import get_blob_store
+
+# Server chunk size cap, smallest chunk accepted, largest file, session lifetime
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(5 * 1024 * 1024)))
+MIN_UPLOAD_CHUNK_SIZE = 256 * 1024
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", str(500 * 1024 * 1024)))
+UPLOAD_SESSION_TTL = timedelta(hours=int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24")))
+# Open sessions a student may hold at once, across all tasks
+MAX_OPEN_UPLOADS = int(os.getenv("MAX_OPEN_UPLOADS", "5"))
+# An upload completed this long after the deadline is still on time (the last chunks in flight)
+UPLOAD_LATE_GRACE = timedelta(minutes=int(os.getenv("UPLOAD_LATE_GRACE_MINUTES", "5")))
+EXPIRE_BATCH_SIZE = 200
+
+
+def open_upload_count(db: Session, student_id: int, now):
+    return db.query(SubmissionUpload.id).filter(
+        SubmissionUpload.student_id == student_id,
+        SubmissionUpload.status == "uploading",
+        SubmissionUpload.started_at > now - UPLOAD_SESSION_TTL,
+    ).count()
+
+
+def expire_stale_uploads(db: Session, now):
+    """
+    Marks up to EXPIRE_BATCH_SIZE sessions past their TTL 'expired' and discards their
+    staged parts. Commits; returns the number of sessions expired.
+    """
+    ids = [upload_id for (upload_id,) in db.query(SubmissionUpload.id).filter(
+        SubmissionUpload.status == "uploading",
+        SubmissionUpload.started_at <= now - UPLOAD_SESSION_TTL,
+    ).limit(EXPIRE_BATCH_SIZE)]
+    if not ids:
+        return 0
+    # Flip the rows first so a concurrent request can no longer complete them
+    db.execute(update(SubmissionUpload).where(
+        SubmissionUpload.id.in_(ids), SubmissionUpload.status == "uploading"
+    ).values(status="expired"))
+    db.commit()
+    store = get_blob_store()
+    for upload_id in ids:
+        store.discard_parts(upload_id)
+    return len(ids)
@@ -0,0 +1,118 @@
+"""
+Statistics for a task's report, computed with SQL aggregates and window functions
+over task_submissions and cached in task_report_stats until the task's submissions
+change (submit, grade, close, new placeholders), so repeated reads are one lookup.
+"""
+import json
+import math
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, insert, func, case, cast, Float, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.task import Task
+from models.task_submission import TaskSubmission
+from models.task_report import TaskReportStats
+
+# Submission timing buckets relative to the deadline, earliest first
+TIMING_BUCKETS = [
+    ("more_than_7d_early", timedelta(days=7)),
+    ("1d_to_7d_early", timedelta(days=1)),
+    ("1h_to_24h_early", timedelta(hours=1)),
+    ("last_hour", timedelta(0)),
+]
+
+
+def _marks_stats(db: Session, task_id: int):
+    submissions = TaskSubmission.__table__
+    marks = cast(submissions.c.marks_obtained, Float)
+    graded = and_(submissions.c.task_id == task_id, submissions.c.marks_obtained.isnot(None))
+    count, mean, mean_square, low, high = db.execute(
+        select(func.count(), func.avg(marks), func.avg(marks * marks), func.min(marks), func.max(marks)).where(graded)
+    ).one()
+
+    # Median: the middle one or two marks by rank
+    ranked = select(
+        marks.label("marks"),
+        func.row_number().over(order_by=submissions.c.marks_obtained).label("rank"),
+        func.count().over().label("total"),
+    ).where(graded).subquery()
+    median = db.execute(select(func.avg(ranked.c.marks)).where(
+        ranked.c.rank.in_([(ranked.c.total + 1) // 2, (ranked.c.total + 2) // 2])
+    )).scalar()
+
+    return {
+        "count": count,
+        "mean": round(mean, 2) if mean is not None else None,
+        "median": median,
+        # Population standard deviation from E[x^2] - E[x]^2
+        "stddev": round(math.sqrt(max(mean_square - mean * mean, 0)), 2) if mean is not None else None,
+        "min": low,
+        "max": high,
+    }
+
+
+def compute_task_report_stats(db: Session, task: Task):
+    """Report statistics for one task in a fixed number of queries, whatever the cohort size."""
+    submissions = TaskSubmission.__table__
+    of_task = submissions.c.task_id == task.id
+    submitted = submissions.c.status != "pending_submission"
+
+    participants, submitted_count, late_count = db.execute(select(
+        func.count(),
+        func.coalesce(func.sum(case((submitted, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((and_(submitted, submissions.c.is_late == True), 1), else_=0)), 0),
+    ).where(of_task)).one()
+
+    grade_histogram = dict(db.execute(
+        select(submissions.c.grade, func.count()).where(of_task, submissions.c.grade.isnot(None))
+        .group_by(submissions.c.grade)
+    ).all())
+
+    timing = {}
+    if task.deadline is not None:
+        bucket = case(
+            *[(submissions.c.submitted_at < task.deadline - before, name) for name, before in TIMING_BUCKETS],
+            else_="late",
+        ).label("bucket")
+        timing = dict(db.execute(
+            select(bucket, func.count()).where(of_task, submitted, submissions.c.submitted_at.isnot(None))
+            .group_by(bucket)
+        ).all())
+
+    return {
+        "participants": participants,
+        "submitted": submitted_count,
+        "pending": participants - submitted_count,
+        "late": late_count,
+        "late_ratio": round(late_count / submitted_count, 4) if submitted_count else 0.0,
+        "marks": _marks_stats(db, task.id),
+        "grade_histogram": grade_histogram,
+        "submission_timing": {name: timing.get(name, 0) for name, _ in TIMING_BUCKETS + [("late", None)]},
+        "computed_at": datetime.utcnow().isoformat(),
+    }
+
+
+def get_task_report_stats(db: Session, task: Task):
+    """
+    Cached report statistics for a task: a primary-key lookup unless invalidated since.
+    Freshly computed stats are added in a savepoint and left for the caller to commit.
+    """
+    cached = db.execute(select(TaskReportStats.stats).where(TaskReportStats.task_id == task.id)).scalar()
+    if cached is not None:
+        return json.loads(cached)
+
+    stats = compute_task_report_stats(db, task)
+    try:
+        with db.begin_nested():
+            db.execute(insert(TaskReportStats).values(task_id=task.id, stats=json.dumps(stats)))
+    except IntegrityError:
+        # Another request cached the same task first; our stats are just as fresh
+        pass
+    return stats
+
+
+def invalidate_task_report(db: Session, task_ids):
+    """Drops the cached stats of `task_ids` (list or subquery). Does not commit."""
+    db.query(TaskReportStats).filter(TaskReportStats.task_id.in_(task_ids)).delete(synchronize_session=False)
@@ -0,0 +1,180 @@
+import numpy as np
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from models.user import User
+from models.group import ContributionLog
+from models.event_participation import EventParticipation
+from models.student_atm_score import StudentAtmScore
+from services.atm_scores import COUNTER_FIELDS, IN_LIST_LIMIT
+from services.atm_service import get_utc_now, calculate_bulk_atm_counters
+from services.badges import ELIGIBILITY_THRESHOLD, BADGE_THRESHOLDS
+
+# Column order of the metric matrix and of every weight vector
+WEIGHT_KEYS = (
+    "weight_task_completion",
+    "weight_avg_score",
+    "weight_group_contribution",
+    "weight_event_participation",
+)
+
+# Attended events that count as full (100%) event participation; more are capped
+EVENT_TARGET = 5
+
+# Badge tier of a weighted score under the recognition rules (services/badges.py),
+# lowest first: tier i covers scores from BADGE_EDGES[i - 1] up to BADGE_EDGES[i]
+BADGE_TIERS = ("ineligible", "participation", *(badge for badge, _ in reversed(BADGE_THRESHOLDS)))
+BADGE_EDGES = np.array([ELIGIBILITY_THRESHOLD, *(lowest for _, lowest in reversed(BADGE_THRESHOLDS))], dtype=np.float64)
+
+
+def _atm_counter_arrays(db: Session):
+    """
+    (student_ids, names, counters) for every student, counters being one array per
+    COUNTER_FIELDS entry. Read with one Core query over student_atm_scores; missing or
+    stale rows are recomputed in memory (nothing is written).
+    """
+    rows = db.execute(
+        select(User.id, User.name, StudentAtmScore.valid_until, *(getattr(StudentAtmScore, f) for f in COUNTER_FIELDS))
+        .outerjoin(StudentAtmScore, StudentAtmScore.student_id == User.id)
+        .where(User.role == "student").order_by(User.id)
+    ).all()
+    student_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    names = [row[1] for row in rows]
+    counters = np.array([row[3:] for row in rows], dtype=np.float64).reshape(len(rows), len(COUNTER_FIELDS))
+
+    now = get_utc_now().replace(tzinfo=None)
+    refresh = [
+        index for index, row in enumerate(rows)
+        if row[3] is None or (row[2] is not None and row[2] <= now)
+    ]
+    if refresh:
+        refresh_ids = [rows[index][0] for index in refresh]
+        fresh = calculate_bulk_atm_counters(db, refresh_ids if len(refresh_ids) <= IN_LIST_LIMIT else None)
+        for index, sid in zip(refresh, refresh_ids):
+            counters[index] = [fresh[sid][f] if sid in fresh else 0 for f in COUNTER_FIELDS]
+    return student_ids, names, {f: counters[:, column] for column, f in enumerate(COUNTER_FIELDS)}
+
+
+def load_metric_matrix(db: Session):
+    """
+    Loads every student's metric vector once.
+    Returns (student_ids, names, matrix) where matrix is (n_students, len(WEIGHT_KEYS)):
+    completion %, average score %, mean group contribution score, and attended events
+    as a % of EVENT_TARGET, so the event weight is applied to the same 0-100 scale.
+    Completion and average are derived from the ATM counters as services/atm_service.py
+    `score_atm` does, for all students at once.
+    """
+    student_ids, names, c = _atm_counter_arrays(db)
+    group = dict(db.execute(
+        select(ContributionLog.student_id, func.avg(ContributionLog.contribution_score))
+        .group_by(ContributionLog.student_id)
+    ).all())
+    events = dict(db.execute(
+        select(EventParticipation.student_id, func.count(EventParticipation.id))
+        .where(EventParticipation.participation_status == "attended")
+        .group_by(EventParticipation.student_id)
+    ).all())
+
+    assigned = c["total_assigned_past"] > 0
+    graded = assigned & (c["total_graded"] > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        completion_score = np.round(np.minimum(c["total_submitted"] / c["total_assigned_past"], 1.0) * 20, 1)
+        average = np.round(c["sum_percentages"] / c["total_graded"] * 100, 1)
+
+    matrix = np.zeros((len(student_ids), len(WEIGHT_KEYS)), dtype=np.float64)
+    matrix[:, 0] = np.where(assigned, completion_score / 20 * 100, 0)
+    matrix[:, 1] = np.where(graded, average, 0)
+    ids = student_ids.tolist()
+    matrix[:, 2] = [float(group.get(sid) or 0) for sid in ids]
+    matrix[:, 3] = np.minimum([events.get(sid, 0) for sid in ids], EVENT_TARGET) / EVENT_TARGET * 100
+    return student_ids, names, matrix
+
+
+def _ranks(scores: np.ndarray):
+    """1-based rank of every row, per column (highest score = rank 1, ties by student order)."""
+    order = np.argsort(-scores, axis=0, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, scores.shape[0] + 1)[:, None], axis=0)
+    return ranks
+
+
+def simulate_weights(student_ids, names, matrix, baseline: dict, candidates: list, top_movers: int = 10):
+    """
+    Re-scores the whole cohort under the baseline and every candidate weight set in a
+    single matrix product, then compares ranks and badge eligibility against the baseline.
+    """
+    weights = np.array(
+        [[float(baseline[k]) for k in WEIGHT_KEYS]] +
+        [[float(c.get(k, baseline[k])) for k in WEIGHT_KEYS] for c in candidates],
+        dtype=np.float64
+    )
+    scores = matrix @ weights.T                      # (n_students, 1 + n_candidates)
+    ranks = _ranks(scores)
+    tiers = np.searchsorted(BADGE_EDGES, scores, side="right")
+
+    shifts = ranks[:, :1] - ranks[:, 1:]             # positive = moved up
+    tier_delta = tiers[:, 1:] - tiers[:, :1]
+    eligible = tiers > 0
+
+    results = []
+    for c in range(len(candidates)):
+        col = c + 1
+        shift = shifts[:, c]
+        abs_shift = np.abs(shift)
+        movers = []
+        if top_movers and len(student_ids):
+            k = min(top_movers, len(student_ids))
+            movers = np.argpartition(-abs_shift, k - 1)[:k]
+            movers = movers[np.argsort(-abs_shift[movers], kind="stable")]
+        changed = tier_delta[:, c] != 0
+        # Among students whose badge changed, each gains its candidate tier and loses its baseline one
+        gained = np.bincount(tiers[changed, col], minlength=len(BADGE_TIERS))
+        lost = np.bincount(tiers[changed, 0], minlength=len(BADGE_TIERS))
+        # Encode (baseline tier, candidate tier) pairs as one int to count them in one pass
+        pair_counts = np.bincount(
+            tiers[changed, 0] * len(BADGE_TIERS) + tiers[changed, col],
+            minlength=len(BADGE_TIERS) ** 2
+        )
+        transitions = {
+            f"{BADGE_TIERS[code // len(BADGE_TIERS)]}->{BADGE_TIERS[code % len(BADGE_TIERS)]}": int(pair_counts[code])
+            for code in np.nonzero(pair_counts)[0]
+        }
+        results.append({
+            "weights": dict(zip(WEIGHT_KEYS, weights[col].tolist())),
+            "mean_score": round(float(scores[:, col].mean()), 2) if len(student_ids) else 0,
+            "students_moved": int(np.count_nonzero(shift)),
+            "mean_abs_rank_shift": round(float(abs_shift.mean()), 2) if len(student_ids) else 0,
+            "max_rank_shift": int(abs_shift.max()) if len(student_ids) else 0,
+            "newly_eligible": int(np.count_nonzero(eligible[:, col] & ~eligible[:, 0])),
+            "no_longer_eligible": int(np.count_nonzero(~eligible[:, col] & eligible[:, 0])),
+            "badge_changes": int(np.count_nonzero(changed)),
+            "badge_upgrades": int(np.count_nonzero(tier_delta[:, c] > 0)),
+            "badge_downgrades": int(np.count_nonzero(tier_delta[:, c] < 0)),
+            "badges": {
+                badge: {"gained": int(gained[tier]), "lost": int(lost[tier])}
+                for tier, badge in enumerate(BADGE_TIERS) if tier
+            },
+            "badge_transitions": transitions,
+            "top_movers": [
+                {
+                    "student_id": int(student_ids[i]),
+                    "name": names[i],
+                    "baseline_rank": int(ranks[i, 0]),
+                    "rank": int(ranks[i, col]),
+                    "rank_shift": int(shift[i]),
+                    "baseline_score": round(float(scores[i, 0]), 2),
+                    "score": round(float(scores[i, col]), 2),
+                    "baseline_badge": BADGE_TIERS[tiers[i, 0]],
+                    "badge": BADGE_TIERS[tiers[i, col]],
+                }
+                for i in movers
+            ],
+        })
+
+    return {
+        "students": len(student_ids),
+        "baseline_weights": dict(zip(WEIGHT_KEYS, weights[0].tolist())),
+        "baseline_badge_distribution": {
+            tier: int(n) for tier, n in zip(BADGE_TIERS, np.bincount(tiers[:, 0], minlength=len(BADGE_TIERS)))
+        },
+        "candidates": results,
+    }
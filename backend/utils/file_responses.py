@@ -0,0 +1,130 @@
+import re
+import zipfile
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from services.blob_store import BlobStore
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _http_date(value: datetime):
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def _not_modified_since(header: str, last_modified: datetime):
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def _parse_range(header: str, size: int):
+    """
+    (start, end) inclusive for a single `bytes=` range, None to serve the whole file
+    (malformed or multi-range requests); raises 416 when the range is unsatisfiable.
+    """
+    match = _RANGE.match(header.replace(" ", ""))
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise HTTPException(416, "Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise HTTPException(416, "Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def blob_response(request: Request, store: BlobStore, key: str, media_type: str, last_modified: datetime | None = None):
+    """
+    Streams a content-addressed blob with conditional and partial GET support.
+
+    The key is the content hash, so it doubles as a strong ETag: If-None-Match (or
+    If-Modified-Since) answers 304, and Range/If-Range returns 206 with only the
+    requested bytes read from the store.
+    """
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": "private, no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = _http_date(last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        if if_none_match.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+    elif last_modified and request.headers.get("if-modified-since"):
+        if _not_modified_since(request.headers["if-modified-since"], last_modified):
+            return Response(status_code=304, headers=headers)
+
+    size = store.size(key)
+    byte_range = None
+    if request.headers.get("range"):
+        if_range = request.headers.get("if-range")
+        if not if_range or if_range.strip() in (etag, headers.get("Last-Modified")):
+            byte_range = _parse_range(request.headers["range"], size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(store.iter_chunks(key), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        store.iter_range(key, start, end - start + 1), status_code=206, media_type=media_type, headers=headers
+    )
+
+
+class _ChunkBuffer:
+    """Write-only, unseekable sink for ZipFile; `drain` hands back what was written so far."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries):
+    """
+    Yields a ZIP archive built on the fly from `entries`, an iterable of
+    (name, chunks, compress): each member is written chunk by chunk and flushed
+    to the client, so memory stays at one chunk regardless of archive size.
+    Because the sink cannot seek, sizes and CRCs go in data descriptors.
+    """
+    sink = _ChunkBuffer()
+    with zipfile.ZipFile(sink, mode="w") as archive:
+        for name, chunks, compress in entries:
+            info = zipfile.ZipInfo(name, date_time=datetime.utcnow().timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            with archive.open(info, mode="w", force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            yield sink.drain()
+    yield sink.drain()
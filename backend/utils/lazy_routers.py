@@ -0,0 +1,136 @@
+import hashlib
+import importlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from fastapi.openapi.utils import get_openapi
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ImportTimer:
+    """Collects per-module import times for the boot report."""
+
+    def __init__(self):
+        self.timings = []
+
+    def import_module(self, module_name):
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        self.timings.append((module_name, (time.perf_counter() - start) * 1000))
+        return module
+
+    def report(self, title):
+        total = sum(ms for _, ms in self.timings)
+        lines = [f"{title}: {total:.1f} ms"]
+        for module_name, ms in sorted(self.timings, key=lambda t: t[1], reverse=True):
+            lines.append(f"  {ms:8.1f} ms  {module_name}")
+        print("\n".join(lines))
+
+
+class RouterRegistry:
+    """
+    Routers to mount, as (module_name, prefix, match_prefix) entries in mount order.
+    `match_prefix` is the URL prefix the router actually serves (mount prefix plus the
+    router's own prefix); in lazy mode the module is imported and mounted on the first
+    request under it.
+    """
+
+    def __init__(self, app, entries, timer: ImportTimer):
+        self.app = app
+        self.pending = list(entries)
+        self.timer = timer
+        self._lock = threading.Lock()
+
+    def _mount(self, entry):
+        module_name, prefix, _ = entry
+        router = self.timer.import_module(module_name).router
+        self.app.include_router(router, prefix=prefix)
+
+    def load_all(self):
+        with self._lock:
+            for entry in self.pending:
+                self._mount(entry)
+            self.pending = []
+
+    def load_for_path(self, path):
+        if not any(_under(path, entry[2]) for entry in self.pending):
+            return
+        with self._lock:
+            due = [entry for entry in self.pending if _under(path, entry[2])]
+            for entry in due:
+                start = time.perf_counter()
+                self._mount(entry)
+                print(f"Lazy-loaded {entry[0]} for {entry[2]} in {(time.perf_counter() - start) * 1000:.1f} ms")
+            self.pending = [entry for entry in self.pending if entry not in due]
+
+
+def _under(path, prefix):
+    return path == prefix or path.startswith(prefix.rstrip("/") + "/")
+
+
+class LazyRouterMiddleware:
+    """Mounts the routers serving a request's path before the request is routed."""
+
+    def __init__(self, app, registry: RouterRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket") and self.registry.pending:
+            self.registry.load_for_path(scope["path"])
+        await self.app(scope, receive, send)
+
+
+def _source_fingerprint():
+    """Hash of every backend source file's path, size and mtime; changes whenever the API can."""
+    digest = hashlib.sha1()
+    for folder in ("routers", "schemas", "models"):
+        folder_path = os.path.join(BACKEND_DIR, folder)
+        for filename in sorted(os.listdir(folder_path)):
+            if filename.endswith(".py"):
+                stat = os.stat(os.path.join(folder_path, filename))
+                digest.update(f"{folder}/{filename}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def cached_openapi(app, registry: RouterRegistry):
+    """
+    Replacement for `app.openapi`: mounts every router, then builds the schema once
+    per source revision and shares it between workers through a temp-dir cache file.
+    """
+
+    def openapi():
+        if app.openapi_schema:
+            return app.openapi_schema
+        cache_path = os.path.join(
+            tempfile.gettempdir(), f"atm_openapi_{app.version}_{_source_fingerprint()}.json"
+        )
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                app.openapi_schema = json.load(f)
+            return app.openapi_schema
+        except (OSError, ValueError):
+            pass
+
+        registry.load_all()
+        app.openapi_schema = get_openapi(
+            title=app.title,
+            version=app.version,
+            openapi_version=app.openapi_version,
+            description=app.description,
+            routes=app.routes,
+        )
+        try:
+            tmp_path = f"{cache_path}.{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(app.openapi_schema, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"OpenAPI cache write error: {e}")
+        return app.openapi_schema
+
+    return openapi
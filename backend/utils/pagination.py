@@ -0,0 +1,41 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def encode_cursor(*values):
+    """Opaque keyset cursor for the last row of a page, e.g. (deadline, id)."""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types):
+    """Inverse of `encode_cursor`; `types` converts each value back (datetime, int, ...)."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if len(values) != len(types):
+            raise ValueError("cursor length")
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for t, v in zip(types, values)
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def etag_response(request: Request, payload, headers: dict | None = None):
+    """
+    JSON response for `payload` with a content ETag; answers 304 Not Modified when the
+    client's If-None-Match already matches.
+    """
+    content = jsonable_encoder(payload)
+    body = json.dumps(content, separators=(",", ":"), sort_keys=True, default=str)
+    etag = f'W/"{hashlib.sha1(body.encode()).hexdigest()}"'
+    headers = {**(headers or {}), "ETag": etag}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,118 @@
+import threading
+import time
+
+from sqlalchemy import exc, event
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# Upper bounds (ms) of the wait and hold histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolMetrics:
+    """Thread-safe counters for one engine's pool: checkout waits, timeouts and checkout hold time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.wait_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.hold_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.total_hold_ms = 0.0
+        self.max_hold_ms = 0.0
+
+    @staticmethod
+    def _bucket(ms):
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                return i
+        return len(LATENCY_BUCKETS_MS)
+
+    def observe_wait(self, ms, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_counts[self._bucket(ms)] += 1
+            self.total_wait_ms += ms
+            self.max_wait_ms = max(self.max_wait_ms, ms)
+
+    def observe_hold(self, ms):
+        with self._lock:
+            self.hold_counts[self._bucket(ms)] += 1
+            self.total_hold_ms += ms
+            self.max_hold_ms = max(self.max_hold_ms, ms)
+
+    @staticmethod
+    def _histogram(counts):
+        labels = [f"le_{bound}ms" for bound in LATENCY_BUCKETS_MS] + [f"gt_{LATENCY_BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, counts))
+
+    def snapshot(self):
+        with self._lock:
+            returned = sum(self.hold_counts)
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / (self.checkouts + self.timeouts), 3) if self.checkouts + self.timeouts else 0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "wait_histogram": self._histogram(self.wait_counts),
+                "avg_hold_ms": round(self.total_hold_ms / returned, 3) if returned else 0,
+                "max_hold_ms": round(self.max_hold_ms, 3),
+                "hold_histogram": self._histogram(self.hold_counts),
+            }
+
+
+class _TimedPoolMixin:
+    """Times how long callers wait in the pool queue for a connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.metrics.observe_wait((time.perf_counter() - start) * 1000)
+        return conn
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    metrics = PoolMetrics()
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    metrics = PoolMetrics()
+
+
+def track_hold_time(engine):
+    """Records how long each connection stays checked out of `engine`'s pool."""
+    metrics = engine.pool.metrics
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        started = record.info.pop("checked_out_at", None)
+        if started is not None:
+            metrics.observe_hold((time.perf_counter() - started) * 1000)
+
+
+def pool_status(engine, settings: dict):
+    """Live state of `engine`'s pool plus its metrics, as reported by /api/admin/db-pool."""
+    pool = engine.pool
+    return {
+        "settings": settings,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # Negative while the pool has not opened `size` connections yet
+        "overflow": pool.overflow(),
+        **pool.metrics.snapshot(),
+    }
@@ -0,0 +1,101 @@
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# A statement shape repeated more than this many times in one request is reported as N+1
+REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "10"))
+# QUERY_DEBUG=1 prints a summary line for every request that touched the database
+QUERY_DEBUG = os.getenv("QUERY_DEBUG", "0").lower() in ("1", "true", "yes")
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+# Stats of the request being served, set by database.DbSessionMiddleware
+_request_stats: ContextVar["QueryStats | None"] = ContextVar("request_stats", default=None)
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape: literals and IN-list lengths removed, whitespace collapsed."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Query count, DB time and statement shapes seen during one request."""
+
+    def __init__(self, method=None, path=None):
+        self.method = method
+        self.path = path
+        self.queries = 0
+        self.db_time_ms = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, elapsed_ms):
+        self.queries += 1
+        self.db_time_ms += elapsed_ms
+        self.shapes[fingerprint(statement)] += 1
+
+    def repeated(self, threshold=REPEAT_THRESHOLD):
+        """[(shape, count)] of statement shapes issued more than `threshold` times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    def headers(self):
+        top_repeat = self.shapes.most_common(1)[0][1] if self.shapes else 0
+        return [
+            (b"x-query-count", str(self.queries).encode()),
+            (b"x-db-time-ms", f"{self.db_time_ms:.1f}".encode()),
+            (b"x-query-max-repeat", str(top_repeat).encode()),
+        ]
+
+    def report(self, method, route):
+        for shape, n in self.repeated():
+            print(f"[N+1] {method} {route}: {n}x {shape[:300]}")
+        if QUERY_DEBUG and self.queries:
+            print(f"[queries] {method} {route}: {self.queries} queries, {self.db_time_ms:.1f} ms, "
+                  f"{len(self.shapes)} distinct")
+
+
+def start_request(method=None, path=None):
+    stats = QueryStats(method, path)
+    return stats, _request_stats.set(stats)
+
+
+def end_request(token):
+    _request_stats.reset(token)
+
+
+def get_request_stats():
+    """QueryStats of the current request, or None outside a request."""
+    return _request_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(statement, (time.perf_counter() - started) * 1000)
+
+
+def _handle_error(context):
+    # after_cursor_execute does not fire for failed statements
+    if context.connection is not None and context.connection.info.get("query_started_at"):
+        context.connection.info["query_started_at"].pop()
+
+
+def instrument(engine):
+    """Hooks `engine` (a sync Engine) into the per-request query stats."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,179 @@
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from sqlalchemy import event
+
+from utils.query_stats import get_request_stats
+
+# Opt-in: statements slower than SLOW_QUERY_MS are recorded; unset or 0 disables the recorder
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+SLOW_QUERY_BUFFER = int(os.getenv("SLOW_QUERY_BUFFER", "200"))
+# SLOW_QUERY_PLANS=1 also captures the estimated plan (SQL Server, SQLite, PostgreSQL)
+SLOW_QUERY_PLANS = os.getenv("SLOW_QUERY_PLANS", "0").lower() in ("1", "true", "yes")
+
+_ROUTERS_DIR = os.sep + "routers" + os.sep
+
+_records = deque(maxlen=SLOW_QUERY_BUFFER)
+_lock = threading.Lock()
+
+# Plans are captured off the request path by one worker thread (see _plan_worker)
+_plan_queue = queue.Queue(maxsize=100)
+_plan_thread = None
+
+
+def _redact(value):
+    """Bind parameters keep only their type (and length for strings/bytes)."""
+    if value is None:
+        return None
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__} len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def _redact_parameters(parameters, executemany):
+    if executemany:
+        return {"rows": len(parameters)}
+    if isinstance(parameters, dict):
+        return {key: _redact(value) for key, value in parameters.items()}
+    return [_redact(value) for value in parameters or ()]
+
+
+def _router_frame():
+    """Innermost stack frame inside routers/*, as "routers/x.py:123 in handler"."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if _ROUTERS_DIR in filename:
+            return f"routers/{os.path.basename(filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _plan_connection(engine):
+    """
+    A raw DBAPI connection opened straight from the dialect, outside the engine's pool,
+    so capturing plans never waits on (or takes) a connection the requests need.
+    """
+    cargs, cparams = engine.dialect.create_connect_args(engine.url)
+    return engine.dialect.connect(*cargs, **cparams)
+
+
+def _capture_plan(raw, dialect, statement, parameters):
+    """Estimated plan of `statement` on `raw`, without running the statement."""
+    cursor = raw.cursor()
+    try:
+        if dialect == "mssql":
+            cursor.execute("SET SHOWPLAN_XML ON")
+            try:
+                cursor.execute(statement, parameters)
+                row = cursor.fetchone()
+            finally:
+                cursor.execute("SET SHOWPLAN_XML OFF")
+            return row[0] if row else None
+        if dialect == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+        if dialect == "postgresql":
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            return cursor.fetchone()[0]
+        return None
+    finally:
+        cursor.close()
+
+
+def _plan_worker():
+    """Fills in the plan of queued records, one dedicated connection per engine."""
+    connections = {}
+    while True:
+        engine, record, statement, parameters = _plan_queue.get()
+        try:
+            raw = connections.get(engine)
+            if raw is None:
+                raw = connections[engine] = _plan_connection(engine)
+            plan = _capture_plan(raw, engine.dialect.name, statement, parameters)
+        except Exception as e:
+            plan = f"plan capture failed: {e}"
+            # Reconnect next time in case the connection itself broke
+            stale = connections.pop(engine, None)
+            if stale is not None:
+                try:
+                    stale.close()
+                except Exception:
+                    pass
+        with _lock:
+            record["plan"] = plan
+
+
+def _queue_plan(conn, record, statement, parameters):
+    """Queues plan capture for `record`; returns the placeholder stored until it is done."""
+    global _plan_thread
+    dialect = conn.dialect.name
+    if conn.dialect.is_async:
+        return None
+    if dialect != "mssql" and not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    with _lock:
+        if _plan_thread is None:
+            _plan_thread = threading.Thread(target=_plan_worker, name="slow-query-plans", daemon=True)
+            _plan_thread.start()
+    try:
+        _plan_queue.put_nowait((conn.engine, record, statement, parameters))
+    except queue.Full:
+        return "skipped: plan queue full"
+    return "pending"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["slow_query_started_at"].pop()) * 1000
+    if elapsed_ms < SLOW_QUERY_MS:
+        return
+    stats = get_request_stats()
+    record = {
+        "recorded_at": datetime.utcnow().isoformat(),
+        "duration_ms": round(elapsed_ms, 2),
+        "statement": statement,
+        "parameters": _redact_parameters(parameters, executemany),
+        "route": f"{stats.method} {stats.path}" if stats is not None else None,
+        "caller": _router_frame(),
+        "plan": None,
+    }
+    if SLOW_QUERY_PLANS and not executemany:
+        record["plan"] = _queue_plan(conn, record, statement, parameters)
+    with _lock:
+        _records.append(record)
+
+
+def _handle_error(context):
+    if context.connection is not None and context.connection.info.get("slow_query_started_at"):
+        context.connection.info["slow_query_started_at"].pop()
+
+
+def instrument(engine):
+    """Hooks `engine` (a sync Engine) into the slow-query recorder when SLOW_QUERY_MS is set."""
+    if SLOW_QUERY_MS <= 0:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def recent(limit=None, min_ms=0.0):
+    """Recorded slow statements, slowest first."""
+    with _lock:
+        records = [r for r in _records if r["duration_ms"] >= min_ms]
+    records.sort(key=lambda r: r["duration_ms"], reverse=True)
+    return records[:limit] if limit else records
+
+
+def clear():
+    with _lock:
+        _records.clear()